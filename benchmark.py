@@ -0,0 +1,351 @@
+"""Benchmarks for the game engine.
+
+Micro benchmarks time the engine's hot paths one call at a time: building cards and decks, resolving effects and triggers, finding targets, checking plays, attacking and destroying. A macro benchmark times full headless games. Each benchmark is repeated, and reported as its mean operations per second with their standard deviation across repeats. Results can be saved as JSON and compared with an earlier run. Effects and triggers are resolved with the keyword arguments the engine would give them, and a benchmark raising an error fails, rather than its error being timed; the script then exits with an error.
+
+Usage:
+		python benchmark.py --json results.json
+		python benchmark.py --filter resolveAll --repeats 10 --compare results.json
+		python benchmark.py --memory --games 200 --turns 6 --search-seconds 5
+"""
+import argparse, gc, itertools, json, platform, random, statistics, sys, time, tracemalloc
+
+import shadowverse
+from shadowverse import ACTION_TYPES, CARD_STATES, TRIGGER_TYPES, TURN_PHASES, Deck, Gameplay, Player, RandomAgent
+from mcts import MCTSAgent, Node
+from simulate import playGame
+
+"""The shadows spent by Necromancy in the benchmarks' triggers, as by the Necromancy of the Shadow deck's removal spells.
+"""
+NECROMANCY_SHADOWS = 8
+
+"""The MCTS playouts a second wanted for playtesting. The agent doesn't reach it yet, and the benchmark says so.
+"""
+PLAYOUT_TARGET = 2000
+
+
+def buildGame(seed, turns):
+	"""Builds a headless game between two random agents and plays it for a number of turns, leaving it mid-game.
+
+	Args:
+			seed (Integer): the seed of the game
+			turns (Integer): the number of turns to play
+
+	Returns:
+			Gameplay: the game.
+	"""
+	playerA = Player("A", shadowverse.player1CardList, RandomAgent(random.Random(seed ^ 1)))
+	playerB = Player("B", shadowverse.player2CardList, RandomAgent(random.Random(seed ^ 2)))
+	game = Gameplay([playerA, playerB], headless=True, seed=seed)
+	game.setupGame()
+	while game.turnNum < turns and game.stepTurn():
+		pass
+	return game
+
+def findGame(test, maxSeeds=1000, maxTurns=30):
+	"""Finds a state for a benchmark to start from: plays seeded random games step by step until one passes a test. Seeds are tried in order, so the same state is found on every run.
+
+	Args:
+			test (Function): takes a game in its main phase and returns whether it's a state we want
+			maxSeeds (Integer, optional): the number of games tried. Defaults to 1000.
+			maxTurns (Integer, optional): the turn after which a game is given up on. Defaults to 30.
+
+	Returns:
+			Gameplay: the first state passing the test.
+	"""
+	for seed in range(maxSeeds):
+		game = buildGame(seed, 0)
+		while game.turnNum < maxTurns and game.isPlaying:
+			if game.phase is TURN_PHASES.main and test(game):
+				return game
+			game.step()
+	raise RuntimeError("No game reached a state for the benchmark.")
+
+def canAttackMonster(game):
+	"""Checks whether the active player can attack an enemy monster.
+
+	Args:
+			game (Gameplay): the game
+
+	Returns:
+			Boolean: whether an attack on a monster is legal.
+	"""
+	return any(action.actionType is ACTION_TYPES.attackMonster for action in game.context.logic.getLegalActions(game.activePlayer))
+
+def getEffects(game):
+	"""Gets the effects on the cards in both players' hands and on both boards, in an order kept by clones.
+
+	Args:
+			game (Gameplay): the game
+
+	Returns:
+			List(Effect): the effects.
+	"""
+	cards = [card for player in game.players for card in player.hand.getCards() + player.board.getCards()]
+	return [effect for card in cards for store in (card.activeFace.effects, card.effects) for effects in store.values() for effect in effects]
+
+def getTriggerKwargs(game, trigger, card=None):
+	"""Gets the keyword arguments the engine pops a trigger with, so effects listening for it see what they would in a game: the shadows spent by a Necromancy, or the targets chosen for a card.
+
+	Args:
+			game (Gameplay): the game
+			trigger (TRIGGER_TYPES): the trigger
+			card (Card, optional): the card the trigger pops on, for card triggers. Defaults to None.
+
+	Returns:
+			Dictionary: the keyword arguments, or None if there's nothing the card could be played on, so the trigger can't pop.
+	"""
+	if trigger is TRIGGER_TYPES.onFriendlyNecromancy or trigger is TRIGGER_TYPES.onEnemyNecromancy:
+		return {"shadows": NECROMANCY_SHADOWS}
+	if trigger is TRIGGER_TYPES.onTargetsChosen:
+		actionType = ACTION_TYPES.playAccelerate if card.isOfType("Monster") else ACTION_TYPES.playCard
+		targets = game.context.logic.getPlayTargets(card.owner, card, actionType)
+		return {"targets": targets[:1]} if targets else None
+	return {}
+
+def getResolvableEffects(game):
+	"""Gets the effects of getEffects which could go off in the game as it stands, along with the keyword arguments they'd be resolved with. Effects waiting on targets nothing could be played on are left out.
+
+	Args:
+			game (Gameplay): the game
+
+	Returns:
+			List(Tuple(Effect, Dictionary)): each effect and its keyword arguments.
+	"""
+	resolvable = []
+	for effect in getEffects(game):
+		kwargs = getTriggerKwargs(game, effect.trigger, effect.card)
+		if kwargs is not None:
+			resolvable.append((effect, kwargs))
+	return resolvable
+
+def canResolveTargetedEffect(game):
+	"""Checks whether an effect on a card in hand or on the board could go off on targets, so resolving effects is timed on targeted ones too.
+
+	Args:
+			game (Gameplay): the game
+
+	Returns:
+			Boolean: whether such an effect has targets to be resolved with.
+	"""
+	return any("targets" in kwargs for effect, kwargs in getResolvableEffects(game))
+
+def timeOperation(operation, setup=None, number=1000, repeats=5):
+	"""Times an operation. Each repeat calls it a number of times, with the garbage collector off. Without a setup, the operation is given the index of the call and the whole loop is timed; with one, the setup is given the index and its result is handed to the operation, and only the operation is timed.
+
+	Args:
+			operation (Function): the operation, taking the index of the call or the result of the setup
+			setup (Function, optional): builds what a call works on, such as a fresh clone of a game, outside of the timing. Defaults to None.
+			number (Integer, optional): the number of calls per repeat. Defaults to 1000.
+			repeats (Integer, optional): the number of repeats. Defaults to 5.
+
+	Returns:
+			Dictionary: the operations per second of each repeat, and their mean, standard deviation, minimum and maximum.
+	"""
+	rates = []
+	for repeat in range(repeats):
+		gcEnabled = gc.isenabled()
+		gc.disable()
+		try:
+			if setup is None:
+				start = time.perf_counter()
+				for i in range(number):
+					operation(i)
+				elapsed = time.perf_counter() - start
+			else :
+				elapsed = 0.0
+				for i in range(number):
+					state = setup(i)
+					start = time.perf_counter()
+					operation(state)
+					elapsed += time.perf_counter() - start
+		finally:
+			if gcEnabled:
+				gc.enable()
+		rates.append(number / elapsed)
+	return {
+		"number": number,
+		"repeats": repeats,
+		"opsPerSecond": statistics.mean(rates),
+		"stdev": statistics.stdev(rates) if len(rates) > 1 else 0.0,
+		"min": min(rates),
+		"max": max(rates),
+		"rates": rates
+	}
+
+def getBenchmarks():
+	"""Builds every benchmark, along with the states they start from. Operations changing the game work on a fresh clone each call.
+
+	Returns:
+			List(Tuple(String, Function, Function or None, Integer)): the name, operation, setup and number of calls per repeat of each benchmark.
+	"""
+	benchmarks = []
+	deckList = shadowverse.player1CardList
+
+	def newPlayer(i):
+		game = Gameplay([Player("A", deckList, RandomAgent()), Player("B", deckList, RandomAgent())], headless=True, seed=i)
+		return game.players[0]
+
+	builder = newPlayer(0)
+	cardNames = itertools.cycle(deckList)
+	benchmarks.append(("CardBuilder.buildCard", lambda i: builder.context.cardbuilder.buildCard(next(cardNames), builder, CARD_STATES.inDeck), None, 2000))
+	benchmarks.append(("Deck.__init__", lambda player: Deck(deckList, player), newPlayer, 200))
+
+	game = findGame(lambda state: canAttackMonster(state) and canResolveTargetedEffect(state))
+	player = game.activePlayer
+	logic = game.context.logic
+
+	numEffects = len(getResolvableEffects(game))
+	benchmarks.append(("Effect.resolve", lambda resolvable: resolvable[0].resolve(**resolvable[1]), lambda i: getResolvableEffects(game.clone())[i % numEffects], 200))
+
+	for trigger in TRIGGER_TYPES:
+		if trigger.name.startswith("onFriendly") or trigger.name.startswith("onEnemy"):
+			kwargs = getTriggerKwargs(game, trigger)
+			benchmarks.append(("Player.resolveAll." + trigger.name, lambda state, trigger=trigger, kwargs=kwargs: state.activePlayer.resolveAll(trigger, **kwargs), lambda i: game.clone(), 100))
+
+	built = [card for card in logic.cards if card is not None]
+	specs = [shadowverse.ATTACK_TARGETS] + [card.definition.targets for card in built if card.definition.targets]
+	specCycle = itertools.cycle(specs)
+	benchmarks.append(("Logic.getValidTargets", lambda i: logic.getValidTargets(player, next(specCycle)), None, 5000))
+
+	cardCycle = itertools.cycle([card for card in built if logic.getOwner(card.cardNum) is player])
+	benchmarks.append(("Logic.canPlayCard", lambda i: logic.canPlayCard(player, next(cardCycle)), None, 5000))
+
+	attack = next(action for action in logic.getLegalActions(player) if action.actionType is ACTION_TYPES.attackMonster)
+	attacker = attack.card.cardNum
+	target = attack.target.cardNum
+
+	def attackCard(state):
+		stateLogic = state.context.logic
+		state.activePlayer.attackCard(stateLogic.getCard(attacker), stateLogic.getCard(target))
+
+	benchmarks.append(("Player.attackCard", attackCard, lambda i: game.clone(), 200))
+
+	def mulligan(state):
+		statePlayer = state.activePlayer
+		card = statePlayer.hand.getCards()[0]
+		statePlayer.hand.removeCard(card)
+		statePlayer.deck.addCard(card)
+		statePlayer.deck.shuffle()
+		statePlayer.draw()
+
+	benchmarks.append(("Deck.mulligan", mulligan, lambda i: game.clone(), 200))
+	benchmarks.append(("Player.tutor", lambda state: state.activePlayer.tutor(type="Monster"), lambda i: game.clone(), 200))
+	benchmarks.append(("MonsterCard.destroy", lambda state: state.context.logic.getCard(target).destroy(), lambda i: game.clone(), 200))
+
+	benchmarks.append(("games", lambda i: playGame(deckList, deckList, i), None, 20))
+	return benchmarks
+
+def runBenchmarks(repeats=5, nameFilter=None, scale=1.0):
+	"""Runs the benchmarks, printing each result as it's measured. A benchmark whose operation raises an error fails, rather than having the error timed; its result holds the error instead, and the rest still run.
+
+	Args:
+			repeats (Integer, optional): the number of repeats of each benchmark. Defaults to 5.
+			nameFilter (String, optional): only run benchmarks whose name contains this. Defaults to running all of them.
+			scale (Float, optional): multiplies the number of calls per repeat of every benchmark. Defaults to 1.
+
+	Returns:
+			Dictionary: the results of each benchmark, keyed by its name.
+	"""
+	shadowverse.setDebugStates(False)
+	results = {}
+	for name, operation, setup, number in getBenchmarks():
+		if nameFilter and nameFilter not in name:
+			continue
+		try:
+			result = timeOperation(operation, setup, max(1, int(number * scale)), repeats)
+		except Exception as error:
+			results[name] = {"error": repr(error)}
+			print("{:<48} FAILED: {!r}".format(name, error))
+			continue
+		results[name] = result
+		print("{:<48} {:>14,.1f} ops/s  ± {:>5.1%}".format(name, result["opsPerSecond"], result["stdev"] / result["opsPerSecond"]))
+	return results
+
+def compareResults(results, baseline):
+	"""Prints how each benchmark compares to an earlier run.
+
+	Args:
+			results (Dictionary): the results of this run, keyed by benchmark name
+			baseline (Dictionary): the output of the earlier run, as saved by this script
+	"""
+	print("{:<48} {:>14} {:>14} {:>8}".format("benchmark", "before", "after", "change"))
+	for name, result in results.items():
+		before = baseline["benchmarks"].get(name)
+		if before is None or "error" in before or "error" in result:
+			continue
+		print("{:<48} {:>14,.1f} {:>14,.1f} {:>+8.1%}".format(name, before["opsPerSecond"], result["opsPerSecond"], result["opsPerSecond"] / before["opsPerSecond"] - 1))
+
+def measureGameMemory(numGames=200, turns=6):
+	"""Measures the memory held by live, mid-game states, by building many of them and keeping them alive.
+
+	Args:
+			numGames (Integer, optional): the number of games kept alive. Defaults to 200.
+			turns (Integer, optional): the number of turns played in each game. Defaults to 6.
+
+	Returns:
+			Dictionary: the number of games and the bytes held per game.
+	"""
+	shadowverse.setDebugStates(False)
+	buildGame(0, turns)
+	gc.collect()
+	tracemalloc.start()
+	start = tracemalloc.take_snapshot()
+	games = [buildGame(seed, turns) for seed in range(numGames)]
+	gc.collect()
+	end = tracemalloc.take_snapshot()
+	tracemalloc.stop()
+	held = sum(stat.size_diff for stat in end.compare_to(start, "filename"))
+	del games
+	return {"games": numGames, "turns": turns, "bytesPerGame": held / numGames}
+
+def measurePlayouts(seconds=5.0, turns=6, seed=0):
+	"""Measures how many MCTS playouts a second are run from a mid-game state of the Shadow deck.
+
+	Args:
+			seconds (Float, optional): how long to search for. Defaults to 5.
+			turns (Integer, optional): the number of turns played before searching. Defaults to 6.
+			seed (Integer, optional): the seed of the game and the search. Defaults to 0.
+
+	Returns:
+			Dictionary: the number of playouts, the time taken, the playouts per second and whether they reach PLAYOUT_TARGET.
+	"""
+	shadowverse.setDebugStates(False)
+	game = buildGame(seed, turns)
+	game.step()
+	agent = MCTSAgent(random.Random(seed), timeLimit=seconds)
+	start = time.perf_counter()
+	agent.search(game, Node())
+	elapsed = time.perf_counter() - start
+	playoutsPerSecond = agent.playouts / elapsed
+	return {"playouts": agent.playouts, "seconds": elapsed, "playoutsPerSecond": playoutsPerSecond, "meetsTarget": playoutsPerSecond >= PLAYOUT_TARGET}
+
+def main(argv=None):
+	parser = argparse.ArgumentParser(description="Benchmarks the game engine.")
+	parser.add_argument("--repeats", type=int, default=5, help="number of repeats of each benchmark")
+	parser.add_argument("--scale", type=float, default=1.0, help="multiplies the number of calls per repeat of every benchmark")
+	parser.add_argument("--filter", help="only run benchmarks whose name contains this")
+	parser.add_argument("--json", help="write the results to this JSON file")
+	parser.add_argument("--compare", help="compare the results with an earlier run's JSON file")
+	parser.add_argument("--memory", action="store_true", help="also measure the memory of live games and the MCTS playout rate")
+	parser.add_argument("--games", type=int, default=200, help="number of games kept alive by the memory benchmark")
+	parser.add_argument("--turns", type=int, default=6, help="number of turns played in each game of the memory benchmark")
+	parser.add_argument("--search-seconds", type=float, default=5.0, help="number of seconds the MCTS playout benchmark searches for")
+	args = parser.parse_args(argv)
+
+	output = {"python": platform.python_version(), "benchmarks": runBenchmarks(args.repeats, args.filter, args.scale)}
+	if args.memory:
+		memory = output["memory"] = measureGameMemory(args.games, args.turns)
+		print("Memory: {:,.0f} bytes per live game ({} games at turn {}).".format(memory["bytesPerGame"], memory["games"], memory["turns"]))
+		playouts = output["playouts"] = measurePlayouts(args.search_seconds, args.turns)
+		print("MCTS: {:,.0f} playouts per second ({} playouts in {:.1f} seconds), {} the target of {:,}.".format(playouts["playoutsPerSecond"], playouts["playouts"], playouts["seconds"], "meeting" if playouts["meetsTarget"] else "short of", PLAYOUT_TARGET))
+	if args.compare:
+		with open(args.compare) as f:
+			compareResults(output["benchmarks"], json.load(f))
+	if args.json:
+		with open(args.json, "w") as f:
+			json.dump(output, f, indent="\t")
+	if any("error" in result for result in output["benchmarks"].values()):
+		return 1
+
+if __name__ == "__main__":
+	sys.exit(main())
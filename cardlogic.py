@@ -1,11 +1,7 @@
 import random
 import enum
-import json
-import os
 
-THIS_FOLDER = os.path.dirname(os.path.abspath(__file__))
-with open(os.path.join(THIS_FOLDER, 'cardlibrary.json')) as cardlibrary:
-  library = json.load(cardlibrary)
+from shadowverse import library
 
 # ENUMS
 class ATTACK_STATES(enum.Enum):
@@ -44,7 +40,7 @@ class CardBuilder:
 		x = 0
 
 	def buildCard(self, cardName, owner):
-		cardObj = library[0][cardName]
+		cardObj = library[cardName]
 		card = None
 		if cardObj["Type"] == "Monster":
 			front = CardFace(cardObj["Front"]["Attack"], cardObj["Front"]["Defense"], [])
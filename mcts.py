@@ -0,0 +1,270 @@
+"""Monte Carlo Tree Search agent.
+
+Searches by cloning the game and playing it forward through the engine's own rules: legal actions come from Logic.getLegalActions, and actions are carried out by Gameplay.step. The search sees the whole state, hidden cards included, which is what automated playtesting wants.
+"""
+import math, random, time
+
+from shadowverse import Agent, Player, RandomAgent, TURN_PHASES
+
+
+def getActionKey(game, action):
+	"""Gets a key identifying an action independently of the game object it was made in, so actions can be matched between a game and its clones.
+
+	Args:
+			game (Gameplay): the game the action belongs to
+			action (Action): the action
+
+	Returns:
+			Tuple: the action type, the number of the card used and the target, as a card number or a player index.
+	"""
+	target = action.target
+	if isinstance(target, Player):
+		target = ("player", game.players.index(target))
+	elif target is not None:
+		target = target.cardNum
+	return (action.actionType, action.card.cardNum if action.card else None, target)
+
+def getBoardValue(player):
+	"""Gets a rough value of a player's board: the total stats of their monsters.
+
+	Args:
+			player (Player): the player
+
+	Returns:
+			Integer: the total attack and defense of the monsters on the board.
+	"""
+	return sum(card.attack + card.defense for card in player.board.getCards() if card.isOfType("Monster"))
+
+def evaluate(game, playerIndex):
+	"""Scores a game for a player: 1 for a win, 0 for a loss, and a comparison of health and board for a game still being played.
+
+	Args:
+			game (Gameplay): the game
+			playerIndex (Integer): the index of the player scored for
+
+	Returns:
+			Float: the score, between 0 and 1.
+	"""
+	player = game.players[playerIndex]
+	if not game.isPlaying:
+		if game.winner is None:
+			return 0.5
+		return 1.0 if game.winner is player else 0.0
+	enemy = game.getOtherPlayer(player)
+	advantage = (player.health - enemy.health) + 0.5 * (getBoardValue(player) - getBoardValue(enemy))
+	return min(1.0, max(0.0, 0.5 + advantage / (2.0 * player.maxHealth)))
+
+class Node:
+	"""A node of the search tree. Nodes are reached by action keys rather than states, so the same node stands for every state reached by the same actions. With transpositions on, actions reaching a state already in the tree share its node, so the tree becomes a graph.
+	"""
+	__slots__ = ("player", "visits", "value", "children")
+
+	def __init__(self, player=None):
+		"""Initializing function.
+
+		Args:
+				player (Integer, optional): the index of the player whose action leads to this node. Defaults to None, for the root.
+		"""
+		self.player = player
+		self.visits = 0
+		self.value = 0.0
+		self.children = {}
+
+	def getScore(self, parentVisits, exploration):
+		"""Gets the UCT score of this node.
+
+		Args:
+				parentVisits (Integer): the number of visits to the parent node
+				exploration (Float): the exploration constant
+
+		Returns:
+				Float: the average value of the node plus its exploration bonus.
+		"""
+		return self.value / self.visits + exploration * math.sqrt(math.log(parentVisits) / self.visits)
+
+class MCTSAgent(Agent):
+	"""An agent picking actions with UCT. Each iteration clones the game, walks down the tree by the actions in it, expands one new action, plays a random rollout for a number of turns and backs the result up the tree. Many orders of the same actions within a turn reach the same state; a transposition table keyed by the game's state hash lets them share a node rather than each being searched separately.
+
+	From the benchmark's mid-game state it runs about 500 playouts a second, well short of the few thousand a second wanted for playtesting. Each iteration spends most of its time cloning the whole game and replaying its path down the tree through the engine, and neither gets much cheaper without the engine's state being copied or undone more cheaply.
+	"""
+
+	def __init__(self, rng=None, iterations=100, timeLimit=None, rolloutTurns=1, exploration=1.4, reuseTree=True, transpositions=True):
+		"""Initializing function.
+
+		Args:
+				rng (random.Random, optional): the random number generator the search draws from. Defaults to a new, unseeded one.
+				iterations (Integer, optional): the number of iterations per decision. Defaults to 100. Ignored if timeLimit is given.
+				timeLimit (Float, optional): the number of seconds to search per decision. Defaults to None.
+				rolloutTurns (Integer, optional): the number of turns a rollout plays before the game is scored. None plays to the end. Defaults to 1.
+				exploration (Float, optional): the UCT exploration constant. Defaults to 1.4.
+				reuseTree (Boolean, optional): whether to keep the subtree of the chosen action for the next decision in the same turn. Defaults to True.
+				transpositions (Boolean, optional): whether actions reaching the same state share a node. Defaults to True.
+		"""
+		self.rng = rng if rng else random.Random()
+		self.iterations = iterations
+		self.timeLimit = timeLimit
+		self.rolloutTurns = rolloutTurns
+		self.exploration = exploration
+		self.reuseTree = reuseTree
+		self.transpositions = transpositions
+		self.table = {}
+		self.rolloutAgent = RandomAgent(self.rng)
+		self.root = None
+		self.rootGame = None
+		self.rootTurn = None
+		self.playouts = 0
+
+	def chooseAction(self, game, player, actions):
+		"""Searches from the current state and picks the most visited action.
+
+		Args:
+				game (Gameplay): the game being played
+				player (Player): the player acting
+				actions (List(Action)): the legal actions
+
+		Returns:
+				Action: the action picked
+		"""
+		if len(actions) == 1:
+			return actions[0]
+		root = self.getRoot(game)
+		self.search(game, root)
+
+		keys = [getActionKey(game, action) for action in actions]
+		visited = [(root.children[key].visits, i) for i, key in enumerate(keys) if key in root.children]
+		choice = max(visited)[1] if visited else 0
+		self.root = root.children.get(keys[choice])
+		return actions[choice]
+
+	def chooseTargets(self, game, player, targets, numTargets):
+		"""Picks random targets. Targets chosen through actions are searched; this is only asked for targets an effect picks on its own.
+
+		Args:
+				game (Gameplay): the game being played
+				player (Player): the player choosing
+				targets (List(Player or Card)): the valid targets
+				numTargets (Integer): the number of targets to pick
+
+		Returns:
+				List(Player or Card): the targets picked
+		"""
+		return self.rng.sample(targets, numTargets)
+
+	def getRoot(self, game):
+		"""Gets the root of the search: the subtree kept from the last decision if it's still in the same game and turn, or a new node, with a new transposition table.
+
+		Args:
+				game (Gameplay): the game being played
+
+		Returns:
+				Node: the root
+		"""
+		if not (self.reuseTree and self.root is not None and self.rootGame is game and self.rootTurn == game.turnNum):
+			self.root = Node()
+			self.table = {}
+		self.rootGame = game
+		self.rootTurn = game.turnNum
+		return self.root
+
+	def search(self, game, root):
+		"""Runs the search budget from a given state.
+
+		Args:
+				game (Gameplay): the state searched from
+				root (Node): the root of the tree
+		"""
+		if self.timeLimit is not None:
+			deadline = time.perf_counter() + self.timeLimit
+			while time.perf_counter() < deadline:
+				self.iterate(game, root)
+		else :
+			for i in range(self.iterations):
+				self.iterate(game, root)
+
+	def iterate(self, game, root):
+		"""Runs a single iteration: selection, expansion, rollout and backpropagation. The clone's random number generator is reseeded from the search's, so shuffles and tutors vary between iterations rather than all drawing what the game would.
+
+		Args:
+				game (Gameplay): the state searched from
+				root (Node): the root of the tree
+		"""
+		state = game.clone()
+		state.context.rng.seed(self.rng.getrandbits(64))
+		for statePlayer in state.players:
+			statePlayer.agent = self.rolloutAgent
+		logic = state.context.logic
+
+		node = root
+		path = [root]
+		while self.advance(state):
+			mover = state.players.index(state.activePlayer)
+			actions = logic.getLegalActions(state.activePlayer)
+			untried = [action for action in actions if getActionKey(state, action) not in node.children]
+			if untried:
+				action = self.rng.choice(untried)
+				key = getActionKey(state, action)
+				state.step(action)
+				child = self.getNode(state, mover)
+				node.children[key] = child
+				path.append(child)
+				break
+			best = None
+			bestScore = None
+			for action in actions:
+				child = node.children[getActionKey(state, action)]
+				score = child.getScore(node.visits, self.exploration)
+				if bestScore is None or score > bestScore:
+					best, bestScore = (action, child), score
+			state.step(best[0])
+			node = best[1]
+			path.append(node)
+
+		self.rollout(state)
+		self.playouts += 1
+		reward = evaluate(state, 0)
+		for pathNode in path:
+			pathNode.visits += 1
+			if pathNode.player is not None:
+				pathNode.value += reward if pathNode.player == 0 else 1.0 - reward
+
+	def getNode(self, state, mover):
+		"""Gets the node for a state just reached: the node already standing for it if transpositions are on and it's been reached before, or a new one.
+
+		Args:
+				state (Gameplay): the state reached
+				mover (Integer): the index of the player whose action reached it
+
+		Returns:
+				Node: the node
+		"""
+		if not self.transpositions:
+			return Node(mover)
+		stateHash = state.getStateHash()
+		node = self.table.get(stateHash)
+		if node is None:
+			node = self.table[stateHash] = Node(mover)
+		return node
+
+	def advance(self, state):
+		"""Steps a state through turn starts and ends until a player has to pick an action.
+
+		Args:
+				state (Gameplay): the state
+
+		Returns:
+				Boolean: whether the state reached a decision, rather than the end of the game.
+		"""
+		while state.isPlaying and state.phase is not TURN_PHASES.main:
+			state.step()
+		return state.isPlaying
+
+	def rollout(self, state):
+		"""Plays a state forward with random actions, for rolloutTurns turns or to the end of the game. Nothing looks the rollout up in the tree, so it stops tracking the state's version and hash.
+
+		Args:
+				state (Gameplay): the state
+		"""
+		state.context.stopTracking()
+		lastTurn = None if self.rolloutTurns is None else state.turnNum + self.rolloutTurns
+		while state.isPlaying and (lastTurn is None or state.turnNum < lastTurn):
+			state.step()
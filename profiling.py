@@ -0,0 +1,214 @@
+"""Opt-in profiling counters for triggers and effects.
+
+While the profiler is enabled, the engine counts every trigger it resolves, per call site and trigger type, and every effect it visits, per effect of each card: the number of calls, their cumulative and longest wall time, and how many of the effects visited actually fired. When it's off, each call site costs a single attribute check. Times are inclusive, so a trigger's time covers the effects it resolved.
+
+Usage:
+		profiler.enable()
+		...
+		print(profiler.format())
+		profiler.save("profile.json")
+"""
+import json
+
+
+class ProfileCounter:
+	"""The counts of a single trigger at a call site, or of a single effect.
+	"""
+	__slots__ = ("key", "calls", "fired", "seconds", "maxSeconds")
+
+	def __init__(self, key):
+		"""Initializing function. Starts with nothing counted.
+
+		Args:
+				key (Tuple(String)): what's counted: the call site and trigger name of a trigger, or the card, trigger and effect of an effect
+		"""
+		self.key = key
+		self.calls = 0
+		self.fired = 0
+		self.seconds = 0.0
+		self.maxSeconds = 0.0
+
+	def add(self, seconds, fired=False):
+		"""Counts a call.
+
+		Args:
+				seconds (Float): the wall time of the call
+				fired (Boolean, optional): whether an effect visited actually fired. Defaults to False.
+		"""
+		self.calls += 1
+		self.seconds += seconds
+		if seconds > self.maxSeconds:
+			self.maxSeconds = seconds
+		if fired:
+			self.fired += 1
+
+	def combine(self, calls, fired, seconds, maxSeconds):
+		"""Adds counts made elsewhere, such as in another process.
+
+		Args:
+				calls (Integer): the number of calls
+				fired (Integer): the number of them which fired
+				seconds (Float): their cumulative wall time
+				maxSeconds (Float): their longest wall time
+		"""
+		self.calls += calls
+		self.fired += fired
+		self.seconds += seconds
+		self.maxSeconds = max(self.maxSeconds, maxSeconds)
+
+def groupCounters(counters):
+	"""Sums counters sharing a key, such as the same effect counted in several processes.
+
+	Args:
+			counters (Iterable(ProfileCounter)): the counters
+
+	Returns:
+			List(ProfileCounter): one counter per key, the slowest first.
+	"""
+	grouped = {}
+	for counter in counters:
+		total = grouped.get(counter.key)
+		if total is None:
+			total = grouped[counter.key] = ProfileCounter(counter.key)
+		total.combine(counter.calls, counter.fired, counter.seconds, counter.maxSeconds)
+	return sorted(grouped.values(), key=lambda counter: counter.seconds, reverse=True)
+
+class Profiler:
+	"""Counts triggers and effects while enabled. Trigger counters are keyed by call site and trigger type, and effect counters by effect definition, so counting costs a dictionary lookup; both are given readable keys once read.
+	"""
+
+	def __init__(self):
+		"""Initializes the profiler, off and with nothing counted.
+		"""
+		self.enabled = False
+		self.reset()
+
+	def enable(self, enabled=True):
+		"""Turns counting on or off. Counts made so far are kept.
+
+		Args:
+				enabled (Boolean, optional): whether to count. Defaults to True.
+		"""
+		self.enabled = enabled
+
+	def reset(self):
+		"""Drops every count made so far.
+		"""
+		self.triggers = {}
+		self.effects = {}
+
+	def recordTrigger(self, site, trigger, seconds):
+		"""Counts a trigger resolved at a call site.
+
+		Args:
+				site (String): the call site, such as "Card.triggerPop"
+				trigger (TRIGGER_TYPES): the trigger
+				seconds (Float): the wall time of the call
+		"""
+		counter = self.triggers.get((site, trigger))
+		if counter is None:
+			counter = self.triggers[(site, trigger)] = ProfileCounter((site, trigger.name))
+		counter.add(seconds)
+
+	def recordEffect(self, effect, seconds, fired):
+		"""Counts an effect visited.
+
+		Args:
+				effect (Effect): the effect
+				seconds (Float): the wall time of its resolution
+				fired (Boolean): whether it actually went off, rather than being spent, failing its test or fizzling
+		"""
+		counter = self.effects.get(effect.definition)
+		if counter is None:
+			counter = self.effects[effect.definition] = ProfileCounter((effect.card.name, effect.trigger.name, str(effect.effect)))
+		counter.add(seconds, fired)
+
+	def getTriggers(self):
+		"""Gets the trigger counts, the slowest first.
+
+		Returns:
+				List(ProfileCounter): one counter per call site and trigger.
+		"""
+		return groupCounters(self.triggers.values())
+
+	def getEffects(self):
+		"""Gets the effect counts, the slowest first.
+
+		Returns:
+				List(ProfileCounter): one counter per effect of each card.
+		"""
+		return groupCounters(self.effects.values())
+
+	def getTriggerEffects(self):
+		"""Gets the effects visited and fired on each trigger, along with their time.
+
+		Returns:
+				List(ProfileCounter): one counter per trigger, keyed by its name, the slowest first.
+		"""
+		byTrigger = []
+		for counter in self.getEffects():
+			total = ProfileCounter((counter.key[1],))
+			total.combine(counter.calls, counter.fired, counter.seconds, counter.maxSeconds)
+			byTrigger.append(total)
+		return groupCounters(byTrigger)
+
+	def toDict(self):
+		"""Gets the counts as a dictionary, ready to be written as JSON or merged into another profiler.
+
+		Returns:
+				Dictionary: the trigger counts and the effect counts.
+		"""
+		return {
+			"triggers": [{"site": counter.key[0], "trigger": counter.key[1], "calls": counter.calls, "seconds": counter.seconds, "maxSeconds": counter.maxSeconds} for counter in self.getTriggers()],
+			"effects": [{"card": counter.key[0], "trigger": counter.key[1], "effect": counter.key[2], "visited": counter.calls, "fired": counter.fired, "seconds": counter.seconds, "maxSeconds": counter.maxSeconds} for counter in self.getEffects()]
+		}
+
+	def merge(self, data):
+		"""Adds counts made by another profiler, such as one in a worker process.
+
+		Args:
+				data (Dictionary): the other profiler's counts, as given by toDict
+		"""
+		for entry in data["triggers"]:
+			key = (entry["site"], entry["trigger"])
+			counter = self.triggers.setdefault(key, ProfileCounter(key))
+			counter.combine(entry["calls"], 0, entry["seconds"], entry["maxSeconds"])
+		for entry in data["effects"]:
+			key = (entry["card"], entry["trigger"], entry["effect"])
+			counter = self.effects.setdefault(key, ProfileCounter(key))
+			counter.combine(entry["visited"], entry["fired"], entry["seconds"], entry["maxSeconds"])
+
+	def format(self, limit=20):
+		"""Formats the counts as tables for people to read: the slowest triggers, the effects visited and fired per trigger, and the slowest effects.
+
+		Args:
+				limit (Integer, optional): the number of rows of the trigger and effect tables. Defaults to 20.
+
+		Returns:
+				String: the tables.
+		"""
+		lines = ["{:<24} {:<32} {:>10} {:>12} {:>10} {:>10}".format("site", "trigger", "calls", "total ms", "mean us", "max us")]
+		for counter in self.getTriggers()[:limit]:
+			lines.append("{:<24} {:<32} {:>10} {:>12.2f} {:>10.2f} {:>10.2f}".format(counter.key[0], counter.key[1], counter.calls, counter.seconds * 1e3, counter.seconds / counter.calls * 1e6, counter.maxSeconds * 1e6))
+		lines.append("")
+		lines.append("{:<32} {:>10} {:>10} {:>12}".format("trigger", "visited", "fired", "total ms"))
+		for counter in self.getTriggerEffects():
+			lines.append("{:<32} {:>10} {:>10} {:>12.2f}".format(counter.key[0], counter.calls, counter.fired, counter.seconds * 1e3))
+		lines.append("")
+		lines.append("{:<28} {:<28} {:>10} {:>10} {:>12} {:>10}  {}".format("card", "trigger", "visited", "fired", "total ms", "max us", "effect"))
+		for counter in self.getEffects()[:limit]:
+			lines.append("{:<28} {:<28} {:>10} {:>10} {:>12.2f} {:>10.2f}  {}".format(counter.key[0], counter.key[1], counter.calls, counter.fired, counter.seconds * 1e3, counter.maxSeconds * 1e6, counter.key[2][:80]))
+		return "\n".join(lines)
+
+	def save(self, path):
+		"""Writes the counts to a JSON file.
+
+		Args:
+				path (String): the path of the file
+		"""
+		with open(path, "w") as f:
+			json.dump(self.toDict(), f, indent="\t")
+
+"""The profiler every match reports to. Off until enabled.
+"""
+profiler = Profiler()
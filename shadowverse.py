@@ -1,12 +1,21 @@
+import ast
+import bisect
 import random
 import enum
-import importlib
+import hashlib
+import importlib.util
 import json
+import marshal
+import time
+import types
 import os
 
+from profiling import profiler
+from tracing import TRACE_CATEGORIES, console, tracer
+
 THIS_FOLDER = os.path.dirname(os.path.abspath(__file__))
-with open(os.path.join(THIS_FOLDER, 'cardlibrary.json')) as cardlibrary:
-	library = json.load(cardlibrary)
+LIBRARY_PATH = os.path.join(THIS_FOLDER, 'cardlibrary.json')
+LIBRARY_CACHE_PATH = os.path.join(THIS_FOLDER, 'cardlibrary.cache')
 
 # ENUMS
 class CARD_TYPES(enum.Enum):
@@ -16,27 +25,18 @@ class CARD_TYPES(enum.Enum):
 	spell = 1
 	amulet = 2
 
-class DEBUG_STATES(enum.IntEnum):
-	"""Debug states to be toggled on and off for output to the console.
-	"""
-	basics = 0
-	triggers = 1
-	playability = 2
-	effects = 3
-	targets = 4
-	resources = 5
-	expandedInfo = 6
-	kwargs = 7
-	playerInput = 8
-	errors = 9
-	interactions = 10
-
-"""A list of booleans describing what level of debug data is output to the console. By default "basics" is enabled.
+"""The debug states output to the console are the trace categories taken by the console sink. Other sinks, such as a ring buffer, are left alone.
 """
-ACTIVE_DEBUG_STATES = [ False for state in DEBUG_STATES ]
-ACTIVE_DEBUG_STATES[DEBUG_STATES.basics] = True
-ACTIVE_DEBUG_STATES[DEBUG_STATES.errors] = True
-ACTIVE_DEBUG_STATES[DEBUG_STATES.interactions] = True
+DEBUG_STATES = TRACE_CATEGORIES
+
+def setDebugStates(enabled, states=DEBUG_STATES):
+	"""Turns the given debug states on or off for the console. By default, all of them.
+
+	Args:
+			enabled (Boolean): whether the states should output to the console
+			states (List(DEBUG_STATES), optional): the states to change. Defaults to every state.
+	"""
+	tracer.setCategories(console, enabled, states)
 
 class ATTACK_STATES(enum.Enum):
 	"""The different attack states a monster card can be in. Usually "sickness" on play, and "storm" thereafter. Changes to "attacked" after attacking once. "Rush" can attack enemy creatures but not the enemy player, while "Storm" can do both.
@@ -56,6 +56,10 @@ class CARD_STATES(enum.IntEnum):
 	destroyed = 4
 	banished = 5
 
+"""The card states in which a card's effects listen for triggers broadcast to its owner.
+"""
+LISTENING_STATES = frozenset([CARD_STATES.inDeck, CARD_STATES.held, CARD_STATES.played, CARD_STATES.evolved])
+
 class CARD_LOCATIONS(enum.Enum):
 	"""The different places a card can be.
 	"""
@@ -65,6 +69,48 @@ class CARD_LOCATIONS(enum.Enum):
 	inFriendlyGraveyard = 3
 	inFriendlyDeck = 4
 
+class CARD_ZONES(enum.Enum):
+	"""The zones a card can be in. The Logic tracks which one each card is in.
+	"""
+	deck = 0
+	hand = 1
+	board = 2
+	graveyard = 3
+	banished = 4
+
+"""The zones cards go to when they're set to a state. The deck, hand and board are tracked by their containers instead.
+"""
+STATE_ZONES = {CARD_STATES.destroyed: CARD_ZONES.graveyard, CARD_STATES.banished: CARD_ZONES.banished}
+
+"""The zone each target Location looks in, and whether it's the friendly player's zone rather than the enemy's.
+"""
+LOCATION_ZONES = {
+	"inFriendlyHand": (True, CARD_ZONES.hand),
+	"onFriendlyBoard": (True, CARD_ZONES.board),
+	"onEnemyBoard": (False, CARD_ZONES.board),
+	"inFriendlyGraveyard": (True, CARD_ZONES.graveyard),
+	"inFriendlyDeck": (True, CARD_ZONES.deck)
+}
+
+class ACTION_TYPES(enum.Enum):
+	"""The different actions a player can take during their turn.
+	"""
+	playCard = 0
+	playAccelerate = 1
+	playEnhance = 2
+	attackLeader = 3
+	attackMonster = 4
+	evolve = 5
+	endTurn = 6
+
+class TURN_PHASES(enum.Enum):
+	"""The phases the game steps through. Each turn goes from its start, through the main phase where actions are taken, to its end.
+	"""
+	turnStart = 0
+	main = 1
+	turnEnd = 2
+	gameOver = 3
+
 class EFFECT_REGISTRY_TIMES(enum.Enum):
 	"""A list of times we register effects on given cards.
 	"""
@@ -126,1118 +172,3303 @@ TRIGGER_TYPES = enum.IntEnum("TRIGGER_TYPES",
 	["on" + i for i in cardTriggers]
 )
 
- # GAME OBJECTS
+# EFFECT COMPILATION
+class CardLibraryError(Exception):
+	"""Raised when an entry in the card library can't be turned into something the engine can run.
+	"""
 
-class Logic:
-	"""A logic class to ponder game logic and possible moves. Holds card numbers for quick referencing.
+class EffectCompiler:
+	"""Compiles the "Effect" and "Test" strings of the card library into code objects once, so resolving an effect never has to reparse its source.
 	"""
-	def __init__(self):
-		"""Initialize and set card number to 0.
+
+	def __init__(self, library=None):
+		"""Initializes the compiler and compiles every effect and test string in the given library, if any.
+
+		Args:
+				library (Object, optional): the card library, keyed by card name. Defaults to None.
 		"""
-		self.cardNumCounter = 0
-		self.cards = []
+		self.effectCode = {}
+		self.testCode = {}
+		if library is not None:
+			self.compileLibrary(library)
 
+	def compileLibrary(self, library):
+		"""Compiles every effect and test string in a library.
 
-	def getCard(self, cardNum):
-		"""Get a card from a given index number.
+		Args:
+				library (Object): the card library, keyed by card name
+		"""
+		for cardName in library:
+			self.compileEntry(cardName, library[cardName])
+
+	def load(self, effectCode, testCode):
+		"""Takes code objects compiled earlier, such as those read from the library cache, so their strings aren't compiled again.
 
 		Args:
-				cardNum (Integer): index number of the card
+				effectCode (Dictionary): compiled effects, keyed by their source strings
+				testCode (Dictionary): compiled tests, keyed by their source strings
+		"""
+		self.effectCode.update(effectCode)
+		self.testCode.update(testCode)
 
-		Returns:
-				Card: card at that index
+	def compileEntry(self, cardName, cardObj):
+		"""Compiles every effect and test string found in a library entry: on its faces, its Accelerate and Enhance objects, and its target specs.
+
+		Args:
+				cardName (String): the library key of the entry, used in error messages
+				cardObj (Object): the library entry
 		"""
-		return self.cards[cardNum]
+		for section in ["Base", "Evolve", "Accelerate", "Enhance"]:
+			if section not in cardObj or not isinstance(cardObj[section], dict):
+				continue
+			for i, effect in enumerate(cardObj[section].get("Effects", [])):
+				self.compileEffectObj(effect, "{0}.{1}.Effects[{2}]".format(cardName, section, i))
+			for i, target in enumerate(cardObj[section].get("Targets", [])):
+				if "Test" in target:
+					self.compileTest(target["Test"], "{0}.{1}.Targets[{2}].Test".format(cardName, section, i))
 
-	def getOwner(self, cardNum):
-		"""Get the owner of a given card index.
+	def compileEffectObj(self, effectObj, path):
+		"""Compiles a single effect object, recursing into effects which register further effects.
 
 		Args:
-				cardNum (Integer): index number of the card
+				effectObj (Object): the effect object
+				path (String): where the effect lives in the library, used in error messages
+		"""
+		if "Test" in effectObj and effectObj["Test"] is not None:
+			self.compileTest(effectObj["Test"], path + ".Test")
+		if isinstance(effectObj["Effect"], dict):
+			self.compileEffectObj(effectObj["Effect"], path + ".Effect")
+		else :
+			self.compileEffect(effectObj["Effect"], path + ".Effect")
+
+	def compileEffect(self, source, path="<runtime>"):
+		"""Compiles an effect string as statements, or returns the cached code object.
+
+		Args:
+				source (String): the effect string
+				path (String, optional): where the string lives in the library, used in error messages. Defaults to "<runtime>".
 
 		Returns:
-				Player: the owner of that card index
+				CodeType: the compiled effect
 		"""
-		if cardNum in game.players[0].cardNumbers:
-			return game.players[0]
-		return game.players[1]
+		code = self.effectCode.get(source)
+		if code is None:
+			code = self.compileSource(source, path, "exec")
+			self.effectCode[source] = code
+		return code
 
-	def canPlayCard(self, player, card):
-		"""Find whether a given player can play a given card.
+	def compileTest(self, source, path="<runtime>"):
+		"""Compiles a test string as an expression, or returns the cached code object.
 
 		Args:
-				player (Player): the player
-				card (Card): the card
+				source (String): the test string
+				path (String, optional): where the string lives in the library, used in error messages. Defaults to "<runtime>".
 
 		Returns:
-				Boolean: whether the given player can play the given card.
+				CodeType: the compiled test
 		"""
-		if ACTIVE_DEBUG_STATES[DEBUG_STATES.playability]: print("Can we play {0}?".format(card.name))
-		if card.cost > player.energy:
-			if card.isOfType("Monster") and card.accelerate:
-				if card.accelerate["Cost"] > player.energy:
-					if ACTIVE_DEBUG_STATES[DEBUG_STATES.playability]: print("No. It costs too much, even with Accelerate.")
-					return False
-			else :
-				if ACTIVE_DEBUG_STATES[DEBUG_STATES.playability]: print("No. It costs too much.")
-				return False
+		code = self.testCode.get(source)
+		if code is None:
+			code = self.compileSource(source, path, "eval")
+			self.testCode[source] = code
+		return code
 
-		if card.isOfType("Monster"):
-			if not player.board.hasSpace() and not card.accelerate:
-				if ACTIVE_DEBUG_STATES[DEBUG_STATES.playability]: print("No. No space on the board.")
-				return False
-			elif card.accelerate:
-				if "Targets" in card.accelerate and len(self.getValidTargets(player, card.accelerate["Targets"])) < 1:
-					if ACTIVE_DEBUG_STATES[DEBUG_STATES.playability]: print("No. No valid targets.")
-					return False
-		elif card.isOfType("Amulet"):
-			if not player.board.hasSpace():
-				if ACTIVE_DEBUG_STATES[DEBUG_STATES.playability]: print("No. No space on the board.")
-				return False
-		elif card.isOfType("Spell"):
-			if card.targets and len(self.getValidTargets(player, card.targets)) < 1:
-				if ACTIVE_DEBUG_STATES[DEBUG_STATES.playability]: print("No. No valid targets.")
-				return False
+	def compileSource(self, source, path, mode):
+		"""Compiles a source string, turning syntax errors into a CardLibraryError naming the offending entry. Criteria written out in the source are frozen by a CriteriaFreezer first.
 
-		if ACTIVE_DEBUG_STATES[DEBUG_STATES.playability]: print("Yes!")
-		return True
+		Args:
+				source (String): the source string
+				path (String): where the string lives in the library
+				mode (String): "exec" for effects, "eval" for tests
 
-	def canAttackWithCard(self, player, card):
-		"""Find whether a given player can attack with a given card. Automatically returns false if the card is not a MonsterCard.
+		Returns:
+				CodeType: the compiled source
+		"""
+		if not isinstance(source, str):
+			raise CardLibraryError("{0} should be a string, not {1}.".format(path, type(source).__name__))
+		try:
+			tree = CriteriaFreezer().visit(ast.parse(source, path, mode))
+			return compile(ast.fix_missing_locations(tree), path, mode)
+		except SyntaxError as error:
+			raise CardLibraryError("{0} doesn't compile: {1!r} ({2}).".format(path, source, error.msg)) from error
+
+"""The Logic methods taking criteria specs as their first argument.
+"""
+CRITERIA_METHODS = frozenset(["getCardsMatching", "getCardNumsMatching"])
+
+class CriteriaFreezer(ast.NodeTransformer):
+	"""Rewrites the criteria written out in full in calls to the Logic's criteria methods, such as logic.getCardsMatching({"Location": "onEnemyBoard"}, self.owner), into frozen criteria. They become a constant of the compiled code, the same object on every run, so their compiled query is found by identity rather than by rebuilding its key.
+	"""
+
+	def visit_Call(self, node):
+		"""Freezes the criteria of a call to a criteria method, if they're a literal with hashable values.
 
 		Args:
-				player (Player): the player
-				card (Card): the card
+				node (ast.Call): the call
 
 		Returns:
-				Boolean: whether the player can attack with this card.
+				ast.Call: the call, with its criteria frozen where possible.
 		"""
-		if not isinstance(card, MonsterCard):
-			return False
-		if card.getAttackState() is ATTACK_STATES.sickness or card.getAttackState() is ATTACK_STATES.attacked:
-			if ACTIVE_DEBUG_STATES[DEBUG_STATES.playability]: print("Can't attack with {0}. Attackstate is {1}.".format(card.name, card.getAttackState()))
-			return False
-		if ACTIVE_DEBUG_STATES[DEBUG_STATES.playability]: print("{} can attack!.".format(card.name))
-		return True
+		self.generic_visit(node)
+		if not (isinstance(node.func, ast.Attribute) and node.func.attr in CRITERIA_METHODS and node.args):
+			return node
+		try:
+			criteria = ast.literal_eval(node.args[0])
+		except (ValueError, TypeError, SyntaxError):
+			return node
+		if isinstance(criteria, dict):
+			criteria = [criteria]
+		if not isinstance(criteria, (list, tuple)) or not all(isinstance(spec, dict) for spec in criteria):
+			return node
+		frozenCriteria = freezeCriteria(criteria)
+		try:
+			hash(frozenCriteria)
+		except TypeError:
+			return node
+		node.args[0] = ast.copy_location(ast.Constant(frozenCriteria), node.args[0])
+		return node
+
+"""Compiled code for every effect and test string in the library, shared by every card built from it. Filled in as the library is loaded.
+"""
+effectCompiler = EffectCompiler()
 
+# QUERIES
+"""The card type named by each library "Type".
+"""
+CARD_TYPE_NAMES = {"Monster": CARD_TYPES.monster, "Spell": CARD_TYPES.spell, "Amulet": CARD_TYPES.amulet}
 
-	def getValidTargets(self, owner, targetTypes):
-		"""Get a list of the valid targets for a given player and a list of target types.
+"""The player targets named by a spec "Type", and whether each is the friendly player rather than the enemy.
+"""
+PLAYER_TYPE_NAMES = {"FriendlyPlayer": True, "EnemyPlayer": False}
+
+"""The keys a target or criteria spec can have.
+"""
+QUERY_KEYS = frozenset(["Type", "Location", "Trait", "Craft", "Cost", "MinCost", "MaxCost", "Test"])
+
+def freezeCriteria(specs):
+	"""Freezes target or criteria specs into a tuple holding each spec's fields as a sorted tuple of pairs. Specs already frozen are kept as they are.
+
+	Args:
+			specs (List(Object or Tuple)): the specs
+
+	Returns:
+			Tuple(Tuple): the frozen specs, hashable if the values of their fields are.
+	"""
+	return tuple(spec if isinstance(spec, tuple) else tuple(sorted(spec.items())) for spec in specs)
+
+class CompiledSpec:
+	"""A single target or criteria spec, such as {"Type": "Monster", "Location": "onEnemyBoard"}, compiled into the zones to look in and a predicate over the cards found there.
+	"""
+	__slots__ = ("isPlayer", "isFriendly", "zone", "cardType", "trait", "craft", "minCost", "maxCost", "testCode")
+
+	def __init__(self, spec, path):
+		"""Initializing function. Checks the spec and resolves its names.
 
 		Args:
-				owner (Player): the player checking for targets
-				targetTypes (List(Object)): a list of objects with fields such as "Type", "Location", or an eval, "Test."
+				spec (Object): the spec, with fields such as "Type", "Location", "Trait", "Craft", "Cost", "MinCost", "MaxCost" or an eval string, "Test"
+				path (String): where the spec lives in the library, used in error messages
+		"""
+		unknownKeys = set(spec) - QUERY_KEYS
+		if unknownKeys:
+			raise CardLibraryError("{0} has unknown fields: {1}.".format(path, ", ".join(sorted(unknownKeys))))
+		typeName = spec.get("Type", None)
+		if typeName is not None and typeName not in CARD_TYPE_NAMES and typeName not in PLAYER_TYPE_NAMES:
+			raise CardLibraryError("{0}.Type names an unknown target type: {1!r}.".format(path, typeName))
+		locationName = spec.get("Location", None)
+		if locationName is not None and locationName not in LOCATION_ZONES:
+			raise CardLibraryError("{0}.Location names an unknown location: {1!r}.".format(path, locationName))
+
+		self.isPlayer = typeName in PLAYER_TYPE_NAMES
+		self.isFriendly, self.zone = LOCATION_ZONES[locationName] if locationName is not None else (True, None)
+		if self.isPlayer:
+			self.isFriendly = PLAYER_TYPE_NAMES[typeName]
+		self.cardType = CARD_TYPE_NAMES.get(typeName, None)
+		self.trait = spec.get("Trait", None)
+		self.craft = spec.get("Craft", None)
+		self.minCost = spec.get("MinCost", spec.get("Cost", None))
+		self.maxCost = spec.get("MaxCost", spec.get("Cost", None))
+		self.testCode = effectCompiler.compileTest(spec["Test"], path + ".Test") if spec.get("Test", None) is not None else None
+
+	def getCandidates(self, logic, owner, enemy):
+		"""Gets the objects which can match this spec: the player it names, the cards in the zone its Location names, or by default the cards on both boards and in the friendly hand. Cards in a deck are checked against the spec's definition fields first, so only those which can match are built.
+
+		Args:
+				logic (Logic): the logic of the match
+				owner (Player): the player the spec is friendly to
+				enemy (Player): their opponent
 
 		Returns:
-				List(Object): a list of objects, including "Card" and "Player."
+				List(Player or Card): the candidates.
 		"""
-		if ACTIVE_DEBUG_STATES[DEBUG_STATES.targets]: print("Getting valid targets.")
-		valids = []
-		for targetObj in targetTypes:
-			potentialValids = game.players[0].board.getCards() + game.players[1].board.getCards() + owner.hand.getCards()
-			if "Type" in targetObj:
-				if ACTIVE_DEBUG_STATES[DEBUG_STATES.targets]: print("This target is of type {0}. Valid targets:".format(targetObj["Type"]))
-				if targetObj["Type"] == "EnemyPlayer":
-					potentialValids = [game.getOtherPlayer(owner)]
-				if targetObj["Type"] == "FriendlyPlayer":
-					potentialValids = [owner]
-				if targetObj["Type"] == "Monster":
-					potentialValids = [
-						potential for potential in potentialValids 
-						if potential.isOfType("Monster")
-					]
-				if targetObj["Type"] == "Amulet":
-					potentialValids = [
-						potential for potential in potentialValids 
-						if potential.isOfType("Amulet")
-					]
-				if ACTIVE_DEBUG_STATES[DEBUG_STATES.targets]: print([card.name for card in potentialValids])
-
-			if "Location" in targetObj:
-				if ACTIVE_DEBUG_STATES[DEBUG_STATES.targets]: print("This target is of location {0}.".format(targetObj["Location"]))
-				if targetObj["Location"] == "onFriendlyBoard":
-					potentialValids = [
-						potential for potential in potentialValids 
-						if potential.state == CARD_STATES.played 
-						and potential.cardNum in owner.cardNumbers
-					]
-				if targetObj["Location"] == "onEnemyBoard":
-					potentialValids = [
-						potential for potential in potentialValids 
-						if potential.state == CARD_STATES.played 
-						and potential.cardNum in game.getOtherPlayer(owner).cardNumbers
-					]
-				if targetObj["Location"] == "inFriendlyHand":
-					potentialValids = [
-						potential for potential in potentialValids 
-						if potential.state == CARD_STATES.held
-						and potential.cardNum in owner.cardNumbers
-					]
-				if ACTIVE_DEBUG_STATES[DEBUG_STATES.targets]: print([card.name for card in potentialValids])
-
-			if "Test" in targetObj:
-				if ACTIVE_DEBUG_STATES[DEBUG_STATES.targets]: print("This target has a test: {0}.".format(targetObj["Test"]))
-				failedTest = []
-				for target in potentialValids:
-					if eval(targetObj["Test"]) == False:
-						failedTest.append(target)
-				potentialValids = [
-					target for target in potentialValids
-					if target not in failedTest
-				]
-				if ACTIVE_DEBUG_STATES[DEBUG_STATES.targets]: print([card.name for card in potentialValids])
-
-			for potential in potentialValids:
-				if potential not in valids:
-					valids.append(potential)
-
-		if ACTIVE_DEBUG_STATES[DEBUG_STATES.targets]: print("We've ended up with {0} valid targets.".format(len(valids)))
-		return valids
-
-	def registerCard(self, player, card):
-		"""Gets a new unique index and passes it to the player, then returns the index.
+		if self.isPlayer:
+			return [owner if self.isFriendly else enemy]
+		if self.zone is CARD_ZONES.deck:
+			return [logic.getCard(cardNum) for cardNum in self.getDeckCardNums(logic, owner, enemy)]
+		if self.zone is not None:
+			return logic.getZoneCards(owner if self.isFriendly else enemy, self.zone)
+		players = logic.context.game.players
+		return logic.getZoneCards(players[0], CARD_ZONES.board) + logic.getZoneCards(players[1], CARD_ZONES.board) + logic.getZoneCards(owner, CARD_ZONES.hand)
+
+	def getDeckCardNums(self, logic, owner, enemy):
+		"""Gets the numbers of the cards in the deck the spec's Location names whose definitions match the spec, without building any. The spec's test isn't run.
 
 		Args:
-				player (Player): the player who owns this card
-				card (Card): the card
+				logic (Logic): the logic of the match
+				owner (Player): the player the spec is friendly to
+				enemy (Player): their opponent
 
 		Returns:
-				Integer: the unique index given to this card.
+				List(Integer): the card numbers, in deck order.
 		"""
-		player.addOwnedCard(self.cardNumCounter)
-		self.cards.append(card)
-		self.cardNumCounter += 1
-		return self.cardNumCounter - 1
+		cardNums = logic.getZoneCardNums(owner if self.isFriendly else enemy, CARD_ZONES.deck)
+		return [cardNum for cardNum in cardNums if self.matchesDefinition(logic.getDefinition(cardNum))]
 
-	def getCardsMatching(self, criteria):
-		"""Get cards matching the criteria given.
+	def matches(self, candidate, logic, owner):
+		"""Checks a candidate against the spec's type, trait, craft, cost and test.
 
 		Args:
-				criteria (List(Object)): A list of criteria objects containing fields such as "Type", "Location", and an eval string, "Test".
+				candidate (Player or Card): the candidate
+				logic (Logic): the logic of the match
+				owner (Player): the player the spec is friendly to
 
 		Returns:
-				List(Card): a list of cards matching the given criteria.
+				Boolean: whether the candidate matches.
 		"""
-		# TODO
-		return []
+		if not self.isPlayer and not self.matchesDefinition(candidate.definition):
+			return False
+		if self.testCode is not None:
+			if logic.context.trace.targets: tracer.emit(TRACE_CATEGORIES.targets, "targetTested", logic, card=candidate.name)
+			return eval(self.testCode, globals(), {"self": logic, "owner": owner, "target": candidate, "game": logic.context.game, "logic": logic}) != False
+		return True
 
-	def getEvolvableMonsters(self, player):
-		"""Returns evolvable monsters the player has on board. Monsters can be Evolved from a pool of 2 points, 3 for the second player. Evolving flips their face, granting them extra abilities and improved stats--usually +2/+2. Players can evolve on their 4th turn, but only once per turn.
+	def matchesDefinition(self, definition):
+		"""Checks a card's definition against the spec's type, trait, craft and cost.
 
 		Args:
-				player (Player): the player we're checking
+				definition (CardDefinition): the definition of the card
 
 		Returns:
-				List(MonsterCard): the evolvable monsters the player has.
+				Boolean: whether the definition matches.
 		"""
-		return [card for card in player.board.getCards() if card.isOfType(CARD_TYPES.monster) and not card.isEvolved]
+		if self.cardType is not None and definition.type is not self.cardType:
+			return False
+		if self.trait is not None and definition.trait != self.trait:
+			return False
+		if self.craft is not None and definition.craft != self.craft:
+			return False
+		if self.minCost is not None and definition.cost < self.minCost:
+			return False
+		if self.maxCost is not None and definition.cost > self.maxCost:
+			return False
+		return True
 
-class Gameplay:
-	"""A Gameplay class holding the logic of the game, such as rounds and players.
+class Query:
+	"""A list of target or criteria specs, compiled. An object matches the query if it matches any of its specs.
 	"""
-	def __init__(self, players):
-		"""Initializes the gameplay object with a given list of players.
+	__slots__ = ("specs", "isDefinitionOnly")
+
+	def __init__(self, specs, path):
+		"""Initializing function. Compiles each spec.
 
 		Args:
-				players (List(Player)): a list of players involved in the game. Must be 2.
+				specs (List(Object)): the specs
+				path (String): where the specs live in the library, used in error messages
 		"""
-		if len(players) != 2:
-			if ACTIVE_DEBUG_STATES[DEBUG_STATES.errors]: print("Improper number of players! Must be 2.")
-			return
-		self.players = players
-		self.activePlayer = players[0]
-		self.turnNum = 0
-		self.isPlaying = False
+		self.specs = tuple(CompiledSpec(spec, "{0}[{1}]".format(path, i)) for i, spec in enumerate(specs))
+		self.isDefinitionOnly = all(not spec.isPlayer and spec.zone is CARD_ZONES.deck and spec.testCode is None for spec in self.specs)
 
+	def run(self, logic, owner):
+		"""Finds every object matching the query, each only once, in the order they were first found.
 
-	def getOtherPlayer(self, player):
-		"""Get the opposing player to a given player.
+		Args:
+				logic (Logic): the logic of the match
+				owner (Player): the player the query is friendly to
+
+		Returns:
+				List(Player or Card): the matching objects.
+		"""
+		enemy = logic.context.game.getOtherPlayer(owner)
+		results = {}
+		for spec in self.specs:
+			for candidate in spec.getCandidates(logic, owner, enemy):
+				if id(candidate) not in results and spec.matches(candidate, logic, owner):
+					results[id(candidate)] = candidate
+		return list(results.values())
+
+	def runCardNums(self, logic, owner):
+		"""Finds the numbers of every card matching the query, each only once. A query only looking in decks, with no tests, is matched on definitions alone, so no card is built; any other query is run on built cards.
 
 		Args:
-				player (Player): the player not being searched for
+				logic (Logic): the logic of the match
+				owner (Player): the player the query is friendly to
 
 		Returns:
-				Player: the opposing player.
+				List(Integer): the numbers of the matching cards.
 		"""
-		if player == self.players[0]:
-			return self.players[1]
-		return self.players[0]
+		if not self.isDefinitionOnly:
+			return [card.cardNum for card in self.run(logic, owner)]
+		enemy = logic.context.game.getOtherPlayer(owner)
+		results = {}
+		for spec in self.specs:
+			for cardNum in spec.getDeckCardNums(logic, owner, enemy):
+				results[cardNum] = True
+		return list(results)
+
+class QueryCompiler:
+	"""Compiles target and criteria specs into Queries once, caching them by their contents. Tuples of specs, such as the frozen targets of card definitions and the criteria frozen into compiled effects, are also cached by identity, so the hottest lookups don't rebuild a key.
+	"""
+
+	def __init__(self):
+		"""Initializes the compiler with empty caches.
+		"""
+		self.queries = {}
+		self.frozenQueries = {}
 
+	def compileQuery(self, specs, path="<runtime>"):
+		"""Compiles a list of specs, or returns the cached Query. Specs whose values aren't hashable can't be cached, and are compiled every time.
 
-	def startGame(self):
-		"""Starts the game, beginning with a mulligan and then deciding the first player, whose turn starts.
+		Args:
+				specs (List(Object or Tuple)): the specs, or frozen specs as given by freezeCriteria
+				path (String, optional): where the specs live in the library, used in error messages. Defaults to "<runtime>".
+
+		Returns:
+				Query: the compiled query
 		"""
-		self.players[0].initialize()
-		self.players[0].draw(3)
-		self.players[1].initialize()
-		self.players[1].draw(4)
+		frozen = self.frozenQueries.get(id(specs))
+		if frozen is not None and frozen[0] is specs:
+			return frozen[1]
+		key = freezeCriteria(specs)
+		try:
+			query = self.queries.get(key)
+		except TypeError:
+			return Query([dict(spec) for spec in key], path)
+		if query is None:
+			query = self.queries[key] = Query([dict(spec) for spec in key], path)
+		if isinstance(specs, tuple):
+			self.frozenQueries[id(specs)] = (specs, query)
+		return query
+
+"""Compiled queries for every target and criteria spec used, shared by every match.
+"""
+queryCompiler = QueryCompiler()
 
-		if ACTIVE_DEBUG_STATES[DEBUG_STATES.basics]: print("Game started.")
-		# self.mulligan()
-		# TODO
+# CARD DEFINITIONS
+class Definition:
+	"""Base for the immutable definitions precomputed from the card library. Fields are set while initializing, then frozen.
+	"""
 
-		self.isPlaying = True
-		self.startTurn(self.players[self.coinToss()])
+	def __setattr__(self, name, value):
+		"""Sets a field, unless the definition has been frozen.
 
-	def mulligan(self):
-		"""Mulligans, allowing the first player to redraw up to three cards, then the second player.
+		Args:
+				name (String): the name of the field
+				value (Any): its value
 		"""
-		if ACTIVE_DEBUG_STATES[DEBUG_STATES.basics]: print("Mulliganing:")
-		player1 = self.players[0]
-		player2 = self.players[1]
+		if self.__dict__.get("isFrozen", False):
+			raise AttributeError("{0} is immutable; can't set {1}.".format(type(self).__name__, name))
+		object.__setattr__(self, name, value)
 
-		player1.draw(3)
-		print(str(player1.hand))
+	def freeze(self):
+		"""Stops any further change to this definition.
+		"""
+		self.isFrozen = True
 
-		if ACTIVE_DEBUG_STATES[DEBUG_STATES.playerInput]: print("Type 1-3 to redraw those cards.")
-		if ACTIVE_DEBUG_STATES[DEBUG_STATES.playerInput]: print("When you're done, type q.")
+def freezeTargets(targetList, path):
+	"""Turns a list of target specs from the library into read-only mappings, compiling them to check them.
 
-		redrawing = [False, False, False]
-		while(True): 
-			if ACTIVE_DEBUG_STATES[DEBUG_STATES.basics]: print("Currently redrawing: {0}, {1}, {2}".format(
-				redrawing[0], redrawing[1], redrawing[2])
-			)
-			typed = input("Select a card to redraw:")
-			if typed == "q":
-				break
-			if typed == "1" or typed == "2" or typed == "3":
-				redrawing[int(typed) - 1] = not redrawing[int(typed) - 1]
+	Args:
+			targetList (List(Object)): the target specs, or None
+			path (String): where the specs live in the library, used in error messages
 
-		for i in range(3):
-			if redrawing[i]:
-				card = player1.hand.cards[i]
-				player1.hand.shuffleCard(card)
-				player1.deck.addCard(card)
-				player1.deck.shuffle()
-				player1.draw()
+	Returns:
+			Tuple(MappingProxyType): the read-only specs, or None if there were none.
+	"""
+	if not targetList:
+		return None
+	queryCompiler.compileQuery(targetList, path)
+	return tuple(types.MappingProxyType(dict(target)) for target in targetList)
 
-		if ACTIVE_DEBUG_STATES[DEBUG_STATES.basics]: print(str(player1.hand))
+def getTrigger(name, path):
+	"""Resolves a trigger name from the library.
 
-		player2.draw(3)
-		if ACTIVE_DEBUG_STATES[DEBUG_STATES.basics]: print(str(player2.hand))
+	Args:
+			name (String): the name of the trigger
+			path (String): where the name lives in the library, used in error messages
 
-		if ACTIVE_DEBUG_STATES[DEBUG_STATES.playerInput]: print("Type 1-3 to redraw those cards.")
-		if ACTIVE_DEBUG_STATES[DEBUG_STATES.playerInput]: print("When you're done, type q.")
+	Returns:
+			TRIGGER_TYPES: the trigger
+	"""
+	if name not in TRIGGER_TYPES.__members__:
+		raise CardLibraryError("{0} names an unknown trigger: {1!r}.".format(path, name))
+	return TRIGGER_TYPES[name]
 
-		redrawing = [False, False, False]
-		while(True): 
-			if ACTIVE_DEBUG_STATES[DEBUG_STATES.basics]: print("Currently redrawing: {0}, {1}, {2}".format(
-				redrawing[0], redrawing[1], redrawing[2])
-			)
-			typed = input("Select a card to redraw:")
-			if typed == "q":
-				break
-			if typed == "1" or typed == "2" or typed == "3":
-				redrawing[int(typed) - 1] = not redrawing[int(typed) - 1]
+class EffectDefinition(Definition):
+	"""The compiled form of an effect object from the card library, shared by every Effect built from it.
+	"""
 
-		for i in range(3):
-			if redrawing[i]:
-				card = player2.hand.cards[i]
-				player2.hand.shuffleCard(card)
-				player2.deck.addCard(card)
-				player2.deck.shuffle()
-				player2.draw()
+	def __init__(self, effectObj, path, isUnstackable=False):
+		"""Initializing function. Resolves the effect's triggers and compiles its strings. The effect's path in the library, naming its card and its index among the card's effects, is kept as its signature, so effects built from it can be told apart by a hash lookup.
 
-		if ACTIVE_DEBUG_STATES[DEBUG_STATES.basics]: print(str(player2.hand))
+		Args:
+				effectObj (Object): the effect object from the library
+				path (String): where the effect lives in the library, used in error messages
+				isUnstackable (Boolean, optional): whether the effect is unstackable without saying so itself, as an effect registered by an unstackable effect is. Defaults to False.
+		"""
+		self.signature = path
+		self.trigger = getTrigger(effectObj.get("Trigger"), path + ".Trigger")
+		self.isUnstackable = effectObj.get("Unstackable", isUnstackable)
+		self.test = effectObj.get("Test", None)
+		self.testCode = effectCompiler.compileTest(self.test, path + ".Test") if self.test is not None else None
+		if isinstance(effectObj["Effect"], dict):
+			self.effect = EffectDefinition(effectObj["Effect"], path + ".Effect", self.isUnstackable)
+			self.effectCode = None
+		else :
+			self.effect = effectObj["Effect"]
+			self.effectCode = effectCompiler.compileEffect(self.effect, path + ".Effect")
+		self.amount = effectObj.get("Amount", -1)
+		self.refillTrigger = getTrigger(effectObj["Refill"], path + ".Refill") if effectObj.get("Refill", None) else None
+		self.isInvocation = effectObj.get("Type", None) == "Invocation"
+		self.freeze()
 
-	def coinToss(self):
-		"""Picks a random player.
+	def __repr__(self):
+		"""Representation method, used in debug output.
 
 		Returns:
-				Player: the player chosen randomly.
+				String: the trigger and source of the effect.
 		"""
-		firstPlayer = 0
-		if random.random() > 0.5:
-			firstPlayer = 1
-		firstPlayer = 0 # THIS IS TO ENFORCE P1 start
-		return firstPlayer
+		return "{0}: {1!r}".format(self.trigger.name, self.effect)
 
-	def startTurn(self, player):
-		"""Starts a given player's turn. Increments the current turn number, and if it's the second player's first turn, they get an extra card.
+class FaceDefinition(Definition):
+	"""The definition of a card face: its stats, abilities, targets and effects.
+	"""
+
+	def __init__(self, faceObj, path, attack=None, defense=None):
+		"""Initializing function.
 
 		Args:
-				player (Player): the player whose turn it is
+				faceObj (Object): the face object from the library, such as a card's "Base" or "Evolve"
+				path (String): where the face lives in the library, used in error messages
+				attack (Integer, optional): the attack of the face, or the attack gained by evolving. Defaults to None.
+				defense (Integer, optional): the defense of the face, or the defense gained by evolving. Defaults to None.
 		"""
-		self.turnNum += 1
-		self.activePlayer = player
-		if ACTIVE_DEBUG_STATES[DEBUG_STATES.basics]: print("{0}'s turn.".format(player.name))
-		player.startTurn()
+		self.attack = attack
+		self.defense = defense
+		self.abilities = tuple(faceObj.get("Abilities", []))
+		self.targets = freezeTargets(faceObj.get("Targets", None), path + ".Targets")
+		self.countdown = faceObj.get("Countdown", None)
+		self.effects = tuple(EffectDefinition(effect, "{0}.Effects[{1}]".format(path, i)) for i, effect in enumerate(faceObj.get("Effects", [])))
+		self.invocationEffects = tuple(effect for effect in self.effects if effect.isInvocation)
+		self.drawnEffects = tuple(effect for effect in self.effects if not effect.isInvocation)
+		self.freeze()
+
+class AlternateCostDefinition(Definition):
+	"""The definition of an alternate way to play a card for another cost, such as Accelerate or Enhance.
+	"""
 
-		if self.turnNum == 2:
-			player.draw()
+	def __init__(self, costObj, path):
+		"""Initializing function.
 
-		while self.isPlaying:
-			self.chooseActionLoop(player)
+		Args:
+				costObj (Object or Integer): the object from the library, or just its cost
+				path (String): where the object lives in the library, used in error messages
+		"""
+		if not isinstance(costObj, dict):
+			costObj = {"Cost": costObj}
+		self.cost = costObj["Cost"]
+		self.targets = freezeTargets(costObj.get("Targets", None), path + ".Targets")
+		self.effects = tuple(EffectDefinition(effect, "{0}.Effects[{1}]".format(path, i)) for i, effect in enumerate(costObj.get("Effects", [])))
+		self.freeze()
+
+class CardDefinition(Definition):
+	"""The immutable definition of a card in the library, shared by every copy of the card. Cards only hold their mutable state and a reference to their definition. Also holds what the card listens to: the triggers of its own effects, the triggers of the effects it registers on its owner, and whether any way of playing it needs targets.
+	"""
 
-	def chooseActionLoop(self, player):
-		"""Sticks the player in a looping choice of actions. Players can play cards, attack with them, or evolve MonsterCards.
+	def __init__(self, key, cardObj):
+		"""Initializing function. Builds the faces, abilities and compiled effects of the card. The library entry isn't modified.
 
 		Args:
-				player (Player): the player who's making choices.
+				key (String): the library key of the card
+				cardObj (Object): the library entry
 		"""
-		while self.isPlaying:
-			if ACTIVE_DEBUG_STATES[DEBUG_STATES.basics]: print("--------------LOOP RESET---------------")
-			enemy = game.getOtherPlayer(player)
-			if ACTIVE_DEBUG_STATES[DEBUG_STATES.basics]: print(enemy)
-			if ACTIVE_DEBUG_STATES[DEBUG_STATES.basics]: print(str(enemy.board))
-			if ACTIVE_DEBUG_STATES[DEBUG_STATES.basics]: print(str(player.board))
-			if ACTIVE_DEBUG_STATES[DEBUG_STATES.basics]: print(str(player.hand))
-			if ACTIVE_DEBUG_STATES[DEBUG_STATES.basics]: print(player)
-
-			handCards = player.hand.getCards()
-			boardCards = player.board.getCards()
+		if cardObj.get("Type") not in CARD_TYPE_NAMES:
+			raise CardLibraryError("{0}.Type names an unknown card type: {1!r}.".format(key, cardObj.get("Type")))
+		self.key = key
+		self.name = cardObj["Name"]
+		self.type = CARD_TYPE_NAMES[cardObj["Type"]]
+		self.cost = cardObj["Cost"]
+		self.craft = cardObj.get("Craft", None)
+		self.trait = cardObj.get("Trait", None)
+		self.burialRite = cardObj.get("BurialRite", None)
+		self.abilities = tuple(cardObj.get("Abilities", []))
+
+		baseObj = cardObj["Base"]
+		self.evolve = None
+		if self.type is CARD_TYPES.monster:
+			self.base = FaceDefinition(baseObj, key + ".Base", baseObj["Attack"], baseObj["Defense"])
+			evolveObj = cardObj.get("Evolve", {})
+			self.evolve = FaceDefinition(evolveObj, key + ".Evolve", evolveObj.get("AttackChange", 2), evolveObj.get("DefenseChange", 2))
+		else :
+			self.base = FaceDefinition(baseObj, key + ".Base")
+		self.targets = self.base.targets
+		self.countdown = self.base.countdown
 
-			out = "Type the number of the card you wish to use. {0} cards on board".format(len(boardCards))
-			if len(boardCards) > 0:
-				out += ", starting with 1"
-			out += ". {0} cards in hand".format(len(handCards))
-			if len(handCards) > 0:
-				out += ", starting with {0}.".format(len(boardCards) + 1)
-			if player.canEvolve() and len(logic.getEvolvableMonsters(player)) > 0:
-				out += " Or type 'evo' to evolve a monster."
-			out += " Or type 'end' to end your turn."
-			choice = input(out)
-			
-			if choice == "end":
-				break
-			elif choice == "evo":
-				if len(logic.getEvolvableMonsters(player)) == 0:
-					break
-				evolveTarget = self.chooseTargets(logic.getEvolvableMonsters(player))
-				player.evolveMonster(evolveTarget[0])
-			elif int(choice) <= len(boardCards):
-				card = player.board.cards[int(choice) - 1]
-				if logic.canAttackWithCard(player, card):
-					target = self.chooseTargets(logic.getValidTargets(player, [{"Type": "EnemyPlayer"}, {"Type": "Monster", "Location": "onEnemyBoard"}]))
-					if isinstance(target[0], Player):
-						player.attackEnemy(card)
-					else :
-						player.attackCard(card, target[0])
-				else :
-					if ACTIVE_DEBUG_STATES[DEBUG_STATES.basics]: print("Can't attack with that card.")
-			else :
-				card = player.hand.cards[int(choice) - len(boardCards) - 1]
-				if logic.canPlayCard(player, card):
-					if player.energy < card.cost and card.accelerate:
-						player.playAccelerate(card)
-					else :
-						player.playCard(card)
-				else :
-					if ACTIVE_DEBUG_STATES[DEBUG_STATES.basics]: print("Can't play that card.")
-		if not self.isPlaying:
-			if ACTIVE_DEBUG_STATES[DEBUG_STATES.basics]: print("Game's over.")
-			return
-		player.endTurn()
+		self.accelerate = AlternateCostDefinition(cardObj["Accelerate"], key + ".Accelerate") if "Accelerate" in cardObj else None
+		self.enhance = AlternateCostDefinition(cardObj["Enhance"], key + ".Enhance") if "Enhance" in cardObj else None
+		self.hasInvocation = len(self.base.invocationEffects) > 0
 
-	def chooseTargets(self, targets, numTargets=1):
-		"""Choose a number of targets from a given list of available ones.
+		effects = [effect for part, effect in self.getEffects()]
+		self.triggers = frozenset(effect.trigger for effect in effects)
+		self.registeredTriggers = frozenset(effect.effect.trigger for effect in effects if effect.effectCode is None)
+		self.needsTargets = any(part is not None and part.targets for part in [self.base, self.accelerate, self.enhance])
+		self.freeze()
 
-		Args:
-				targets (List(Player or Card)): a list of targets available to choose from, Card or Player.
-				numTargets (Integer, optional): number of targets to be chosen. Defaults to 1.
+	def getEffects(self):
+		"""Gets every effect the card defines: those on its faces and on its Accelerate and Enhance objects.
 
 		Returns:
-				List(Player or Card): a list of the targets chosen.
+				List(Tuple(String, EffectDefinition)): pairs of the part of the card the effect is on, such as "Base" or "Accelerate", and the effect.
 		"""
-		targetChoices = []
-		while len(targetChoices) < numTargets:
-			if ACTIVE_DEBUG_STATES[DEBUG_STATES.playerInput]: print("Please choose a target. {0} targets remain.".format(numTargets - len(targetChoices)))
-			options = [target for target in targets if target not in targetChoices]
-			output = [str(option) for option in options]
-			choice = input(" ".join(output))
-			targetChosen = options[int(choice) - 1]
-			targetChoices.append(targetChosen)
-		return targetChoices
+		parts = [("Base", self.base), ("Evolve", self.evolve), ("Accelerate", self.accelerate), ("Enhance", self.enhance)]
+		return [(name, effect) for name, part in parts if part is not None for effect in part.effects]
 
-class Player:
-	"""A player object containing fields like a name, a list of cards, and values like health and energy. Also contains a Deck, a Hand and a Board object.
+# CARD LIBRARY
+"""The version of the library cache's layout, bumped whenever what's cached or how it's built changes, so older caches are rebuilt rather than misread.
+"""
+LIBRARY_CACHE_VERSION = 2
+
+def getCardDefinitions(library):
+	"""Builds the definition of every card in a library, which resolves every trigger name and checks every entry.
+
+	Args:
+			library (Object): the card library, keyed by card name
+
+	Returns:
+			Dictionary: the definition of every card, keyed by card name.
 	"""
-	def __init__(self, name, cardList):
-		"""Initializes the player object. Creates an empty effects object and an empty list of card indices.
+	return {cardName: CardDefinition(cardName, library[cardName]) for cardName in library}
 
-		Args:
-				name (String): the name of the player
-				cardList (List(String)): a list of card names in the player's deck
-		"""
-		self.name = name
-		self.cardList = cardList
-		self.cardNumbers = []
-		self.effects = [[] for i in TRIGGER_TYPES]
+def buildLibrary(source):
+	"""Builds the card library from its JSON: parses it, compiles every effect and test string into the effect compiler and builds every card's definition. Raises a CardLibraryError for any entry the engine can't run.
 
-	def __str__(self):
-		"""A Stringing method for the player.
+	Args:
+			source (Bytes or String): the JSON of the card library
+
+	Returns:
+			Tuple(Object, Dictionary): the library, keyed by card name, and the definition of every card.
+	"""
+	try:
+		library = json.loads(source)
+	except ValueError as error:
+		raise CardLibraryError("The card library isn't valid JSON: {0}.".format(error)) from error
+	if not isinstance(library, dict):
+		raise CardLibraryError("The card library should be an object keyed by card name, not {0}.".format(type(library).__name__))
+	effectCompiler.compileLibrary(library)
+	return library, getCardDefinitions(library)
+
+def getLibraryCacheHeader(digest):
+	"""Gets the header a library cache starts with. A cache only matches the JSON whose content hash it holds, written by the same cache version and the same interpreter version, as code objects can't be read by any other.
+
+	Args:
+			digest (Bytes): the SHA-256 hash of the library's JSON
+
+	Returns:
+			Bytes: the header.
+	"""
+	return b"SVLC" + LIBRARY_CACHE_VERSION.to_bytes(4, "little") + importlib.util.MAGIC_NUMBER + digest
+
+def readLibraryCache(cachePath, digest):
+	"""Reads the library cache in a single read, if it's there and matches the library's JSON.
+
+	Args:
+			cachePath (String): the path of the cache
+			digest (Bytes): the SHA-256 hash of the library's JSON
+
+	Returns:
+			Dictionary: the library and its compiled effects and tests, or None if there's no matching cache.
+	"""
+	header = getLibraryCacheHeader(digest)
+	try:
+		with open(cachePath, "rb") as f:
+			data = f.read()
+	except OSError:
+		return None
+	if not data.startswith(header):
+		return None
+	try:
+		return marshal.loads(memoryview(data)[len(header):])
+	except (EOFError, ValueError, TypeError):
+		return None
+
+def writeLibraryCache(cachePath, digest, library):
+	"""Writes the library and the effect compiler's code objects to the cache. The cache is written beside its path and moved into place, so processes loading the library at the same time never read half a cache.
+
+	Args:
+			cachePath (String): the path of the cache
+			digest (Bytes): the SHA-256 hash of the library's JSON
+			library (Object): the card library, keyed by card name
+	"""
+	data = getLibraryCacheHeader(digest) + marshal.dumps({"library": library, "effectCode": effectCompiler.effectCode, "testCode": effectCompiler.testCode})
+	tempPath = "{0}.{1}.tmp".format(cachePath, os.getpid())
+	try:
+		with open(tempPath, "wb") as f:
+			f.write(data)
+		os.replace(tempPath, cachePath)
+	finally:
+		if os.path.exists(tempPath):
+			os.remove(tempPath)
+
+def loadLibrary(path=LIBRARY_PATH, cachePath=LIBRARY_CACHE_PATH):
+	"""Loads the card library: from its cache if the cache matches the JSON, or else by building it from the JSON and writing the cache. Failing to write the cache, such as in a read-only folder, only means the next load builds it again.
+
+	Args:
+			path (String, optional): the path of the library's JSON. Defaults to LIBRARY_PATH.
+			cachePath (String, optional): the path of the cache, or None to always build from the JSON. Defaults to LIBRARY_CACHE_PATH.
+
+	Returns:
+			Tuple(Object, Dictionary): the library, keyed by card name, and the definition of every card.
+	"""
+	with open(path, "rb") as f:
+		source = f.read()
+	digest = hashlib.sha256(source).digest()
+	cache = readLibraryCache(cachePath, digest) if cachePath else None
+	if cache is not None:
+		effectCompiler.load(cache["effectCode"], cache["testCode"])
+		return cache["library"], getCardDefinitions(cache["library"])
+	library, definitions = buildLibrary(source)
+	if cachePath:
+		try:
+			writeLibraryCache(cachePath, digest, library)
+		except OSError:
+			pass
+	return library, definitions
+
+def buildLibraryCache(path=LIBRARY_PATH, cachePath=LIBRARY_CACHE_PATH):
+	"""The library's build step: builds the library from its JSON and writes the cache, whether or not the cache was up to date. Unlike loading, a broken library or a cache that can't be written raises.
+
+	Args:
+			path (String, optional): the path of the library's JSON. Defaults to LIBRARY_PATH.
+			cachePath (String, optional): the path of the cache. Defaults to LIBRARY_CACHE_PATH.
+
+	Returns:
+			Object: the library, keyed by card name.
+	"""
+	with open(path, "rb") as f:
+		source = f.read()
+	library, definitions = buildLibrary(source)
+	writeLibraryCache(cachePath, hashlib.sha256(source).digest(), library)
+	return library
+
+"""The card library, keyed by card name, and the definition of every card in it.
+"""
+library, cardDefinitions = loadLibrary()
+
+ # GAME OBJECTS
+
+"""The target specs a monster can attack: the enemy leader, or a monster on the enemy's board.
+"""
+ATTACK_TARGETS = freezeTargets([{"Type": "EnemyPlayer"}, {"Type": "Monster", "Location": "onEnemyBoard"}], "ATTACK_TARGETS")
+
+def bumpVersion(obj):
+	"""Bumps the state version of the match a game object belongs to, if it belongs to one yet. Every change to the state of a match bumps its version, so anything cached against it, such as legal actions, is recomputed.
+
+	Args:
+			obj (Object): a game object with a context, such as a Player or a Card
+	"""
+	context = getattr(obj, "context", None)
+	if context is not None and context.isTracking:
+		context.version += 1
+
+def setFields(obj, **fields):
+	"""Sets fields on a game object directly, without bumping the state version. Used while cloning, where the version is copied over as a whole.
+
+	Args:
+			obj (Object): the game object
+			**fields (Keyword arguments): the values of the fields, by name
+	"""
+	for name, value in fields.items():
+		object.__setattr__(obj, name, value)
+
+def getClone(obj, memo):
+	"""Gets the clone of a game object, cloning it if it hasn't been yet. Objects referenced from several places, such as a card in both a player's hand and the Logic, are only cloned once.
+
+	Args:
+			obj (Object): the object to clone, or None
+			memo (Dictionary): the clones made so far, keyed by the id of their original
+
+	Returns:
+			Object: the clone, or None.
+	"""
+	if obj is None:
+		return None
+	clone = memo.get(id(obj))
+	if clone is None:
+		clone = obj.clone(memo)
+	return clone
+
+def cloneEffectStore(store, memo):
+	"""Clones a sparse effect store, mapping triggers to lists of effects.
+
+	Args:
+			store (Dictionary(TRIGGER_TYPES, List(Effect))): the store
+			memo (Dictionary): the clones made so far, keyed by the id of their original
+
+	Returns:
+			Dictionary(TRIGGER_TYPES, List(Effect)): the cloned store.
+	"""
+	if not store:
+		return {}
+	return {trigger: [getClone(effect, memo) for effect in effects] for trigger, effects in store.items()}
+
+"""The fields of the game, its players and their cards covered by the state hash. Setting any of them updates the hash of the match. Lists, such as the cards invoked this turn, are replaced rather than changed in place, so they're hashed too.
+"""
+GAME_HASHED_FIELDS = frozenset(["activePlayer", "turnNum", "phase", "isPlaying", "winner"])
+PLAYER_HASHED_FIELDS = frozenset(["maxHealth", "health", "energy", "totalEnergy", "shadows", "turnsPlayed", "invocationsThisTurn", "evolutions", "totalEvolutions", "hasEvolvedThisTurn"])
+CARD_HASHED_FIELDS = frozenset(["state", "attack", "defense", "attackState", "abilities", "isEvolved", "countdown"])
+
+"""The zones whose cards and their slots are covered by the state hash.
+"""
+HASHED_ZONES = ("deck", "hand", "board")
+
+"""The random 64-bit key of every state feature hashed so far, such as (("card", 12), "attack", 3). Keys are drawn the first time a feature is seen, from a generator of their own so the game's random choices are left alone.
+"""
+ZOBRIST_KEYS = {}
+zobristRandom = random.Random(0x5A0B)
+
+"""Stands for a field which hasn't been set yet, and so isn't part of the hash.
+"""
+UNSET = object()
+
+def getZobristKey(feature):
+	"""Gets the random key of a state feature, drawing it if the feature hasn't been seen before.
+
+	Args:
+			feature (Tuple): the feature, such as the value of a field of a card or the card in a slot of a zone
+
+	Returns:
+			Integer: the 64-bit key of the feature.
+	"""
+	key = ZOBRIST_KEYS.get(feature)
+	if key is None:
+		key = ZOBRIST_KEYS[feature] = zobristRandom.getrandbits(64)
+	return key
+
+def getSeat(player):
+	"""Gets the index of a player in their game, which identifies them in the state hash.
+
+	Args:
+			player (Player): the player
+
+	Returns:
+			Integer: the index of the player.
+	"""
+	return player.context.game.players.index(player)
+
+def getFieldFeature(objKey, name, value):
+	"""Gets the state feature of a field holding a value. Players are identified by their seat, so the feature is the same in a clone of the game, and lists by their contents.
+
+	Args:
+			objKey (Tuple): what identifies the object holding the field, such as ("card", 12)
+			name (String): the name of the field
+			value (Any): the value of the field
+
+	Returns:
+			Tuple: the feature.
+	"""
+	if isinstance(value, Player):
+		value = ("player", getSeat(value))
+	elif isinstance(value, list):
+		value = tuple(value)
+	return (objKey, name, value)
+
+def hashField(obj, objKey, name, value):
+	"""Updates the state hash of a match for a field about to be set, swapping the key of its old value for the key of its new one.
+
+	Args:
+			obj (Object): the game object holding the field
+			objKey (Tuple): what identifies the object in the hash, such as ("card", 12)
+			name (String): the name of the field
+			value (Any): the new value of the field
+	"""
+	context = obj.context
+	if not context.isTracking:
+		return
+	stateHash = context.stateHash
+	old = getattr(obj, name, UNSET)
+	if old is not UNSET:
+		stateHash ^= getZobristKey(getFieldFeature(objKey, name, old))
+	context.stateHash = stateHash ^ getZobristKey(getFieldFeature(objKey, name, value))
+
+def hashSlot(owner, zone, slot, cardNum):
+	"""Toggles a card in a slot of a zone in the state hash. Called once as the card enters the slot, and once as it leaves.
+
+	Args:
+			owner (Player): the owner of the zone
+			zone (String): the zone, one of HASHED_ZONES
+			slot (Integer): the slot
+			cardNum (Integer): the number of the card
+	"""
+	context = owner.context
+	if context.isTracking:
+		context.stateHash ^= getZobristKey((zone, getSeat(owner), slot, cardNum))
+
+def hashCardSlots(owner, zone, slots):
+	"""Toggles every card in a zone in the state hash, such as around a shuffle, which moves them all.
+
+	Args:
+			owner (Player): the owner of the zone
+			zone (String): the zone, one of HASHED_ZONES
+			slots (CardSlots): the cards in the zone
+	"""
+	context = owner.context
+	if not context.isTracking:
+		return
+	seat = getSeat(owner)
+	stateHash = context.stateHash
+	for slot, cardNum in slots.items():
+		stateHash ^= getZobristKey((zone, seat, slot, cardNum))
+	context.stateHash = stateHash
+
+def getEffectHash(effect):
+	"""Gets the part of the state hash standing for a registered effect: its presence, and its remaining amount if it can only go off a number of times.
+
+	Args:
+			effect (Effect): the effect, registered under its hash key
+
+	Returns:
+			Integer: the 64-bit hash of the effect.
+	"""
+	effectHash = getZobristKey(effect.hashKey)
+	if effect.definition.amount >= 0:
+		effectHash ^= getZobristKey((effect.hashKey, "amount", effect.amount))
+	return effectHash
+
+def hashEffect(effect):
+	"""Toggles a registered effect in the state hash. Called once as the effect is registered, and once as it's removed.
+
+	Args:
+			effect (Effect): the effect
+	"""
+	context = effect.owner.context
+	if context.isTracking:
+		context.stateHash ^= getEffectHash(effect)
+
+def getCardHash(card):
+	"""Computes the part of the state hash standing for a card from scratch: its hashed fields and the effects registered on it and its faces. A card's hash as it was built is taken off, so building a card which was only reserved leaves the state hash alone.
+
+	Args:
+			card (Card): the card
+
+	Returns:
+			Integer: the 64-bit hash of the card.
+	"""
+	cardHash = 0
+	objKey = ("card", card.cardNum)
+	for name in CARD_HASHED_FIELDS:
+		value = getattr(card, name, UNSET)
+		if value is not UNSET:
+			cardHash ^= getZobristKey(getFieldFeature(objKey, name, value))
+	for effect in card.getAllEffects():
+		cardHash ^= getEffectHash(effect)
+	return cardHash
+
+"""The action types which play a card from the hand.
+"""
+PLAY_ACTIONS = frozenset([ACTION_TYPES.playCard, ACTION_TYPES.playAccelerate, ACTION_TYPES.playEnhance])
+
+class Action:
+	"""An action a player can take during their turn, such as playing a card or attacking with one.
+	"""
+
+	def __init__(self, actionType, card=None, target=None):
+		"""Initializing function.
+
+		Args:
+				actionType (ACTION_TYPES): the kind of action
+				card (Card, optional): the card played, attacking or evolving. Defaults to None.
+				target (Player or Card, optional): the target of an attack, or of the card played. Defaults to None.
+		"""
+		self.actionType = actionType
+		self.card = card
+		self.target = target
+
+	def __str__(self):
+		"""A Stringing method for the action.
+
+		Returns:
+				String: the action described in words.
+		"""
+		if self.actionType is ACTION_TYPES.playCard:
+			out = "play {0}".format(self.card.name)
+		elif self.actionType is ACTION_TYPES.playAccelerate:
+			out = "play {0} accelerated".format(self.card.name)
+		elif self.actionType is ACTION_TYPES.playEnhance:
+			out = "play {0} enhanced".format(self.card.name)
+		if self.actionType in PLAY_ACTIONS:
+			if self.target:
+				out += " targeting {0}".format(self.target.name)
+			return out
+		if self.actionType is ACTION_TYPES.attackLeader or self.actionType is ACTION_TYPES.attackMonster:
+			return "attack {0} with {1}".format(self.target.name, self.card.name)
+		if self.actionType is ACTION_TYPES.evolve:
+			return "evolve {0}".format(self.card.name)
+		return "end the turn"
+
+class MatchLog:
+	"""A compact record of a match, enough to replay it exactly through the engine: its seed, first player, players' names and decks, and every choice made. Choices are kept per player in the format ScriptedAgent reads: an index into the legal actions, an index into the remaining valid targets for each target picked, or a list of indices into the opening hand for a mulligan. The number of steps taken is kept too, so a replay stops where the match did.
+	"""
+
+	def __init__(self, seed, firstPlayer, names, decks):
+		"""Initializing function. Starts with no choices made.
+
+		Args:
+				seed (Integer): the seed of the match
+				firstPlayer (Integer): the index of the player going first, or None for a coin toss
+				names (List(String)): the names of the players
+				decks (List(List(String))): the card names of each player's deck
+		"""
+		self.seed = seed
+		self.firstPlayer = firstPlayer
+		self.names = list(names)
+		self.decks = [list(deck) for deck in decks]
+		self.choices = [[] for deck in decks]
+		self.steps = 0
+
+	def recordAction(self, seat, action, actions):
+		"""Records an action taken, as its index into the legal actions. An action given directly rather than picked from the list is matched by its type, card and target.
+
+		Args:
+				seat (Integer): the index of the player acting
+				action (Action): the action taken
+				actions (List(Action)): the legal actions
+
+		Raises:
+				ValueError: if the action isn't one of the legal actions.
+		"""
+		for i, legalAction in enumerate(actions):
+			if legalAction is action:
+				self.choices[seat].append(i)
+				return
+		for i, legalAction in enumerate(actions):
+			if (legalAction.actionType, legalAction.card, legalAction.target) == (action.actionType, action.card, action.target):
+				self.choices[seat].append(i)
+				return
+		raise ValueError("Can't record an action which isn't legal: {0}.".format(action))
+
+	def recordTargets(self, seat, targets, chosen):
+		"""Records the targets picked, each as its index into the targets not yet picked.
+
+		Args:
+				seat (Integer): the index of the player choosing
+				targets (List(Player or Card)): the valid targets
+				chosen (List(Player or Card)): the targets picked
+		"""
+		options = list(targets)
+		for target in chosen:
+			i = options.index(target)
+			options.pop(i)
+			self.choices[seat].append(i)
+
+	def recordMulligan(self, seat, cards, redrawing):
+		"""Records the cards picked to redraw, as indices into the opening hand.
+
+		Args:
+				seat (Integer): the index of the player mulliganing
+				cards (List(Card)): the opening hand
+				redrawing (List(Card)): the cards picked to redraw
+		"""
+		self.choices[seat].append([cards.index(card) for card in redrawing])
+
+	def toDict(self):
+		"""Gets the log as a dictionary, ready to be written as JSON.
+
+		Returns:
+				Dictionary: the seed, first player, names, decks, choices and steps of the match.
+		"""
+		return {"seed": self.seed, "firstPlayer": self.firstPlayer, "names": self.names, "decks": self.decks, "choices": self.choices, "steps": self.steps}
+
+	def save(self, path):
+		"""Writes the log to a JSON file.
+
+		Args:
+				path (String): the path of the file
+		"""
+		with open(path, "w") as f:
+			json.dump(self.toDict(), f)
+
+def loadMatchLog(data):
+	"""Loads a match log, from a dictionary as given by MatchLog.toDict or from the path of a JSON file written by MatchLog.save.
+
+	Args:
+			data (Dictionary or String): the log's dictionary, or the path of its file
+
+	Returns:
+			MatchLog: the log.
+	"""
+	if isinstance(data, str):
+		with open(data) as f:
+			data = json.load(f)
+	log = MatchLog(data["seed"], data["firstPlayer"], data["names"], data["decks"])
+	log.choices = [list(choices) for choices in data["choices"]]
+	log.steps = data["steps"]
+	return log
+
+def replayGame(log, headless=True):
+	"""Replays a logged match exactly through the engine: the same seed, decks and choices give the same game, stopped after the same number of steps.
+
+	Args:
+			log (MatchLog): the log of the match
+			headless (Boolean, optional): whether to run without any console output. Only the replayed match is silenced. Defaults to True.
+
+	Returns:
+			Gameplay: the replayed game, in the state the logged match ended in.
+	"""
+	players = [Player(name, deck, ScriptedAgent(choices)) for name, deck, choices in zip(log.names, log.decks, log.choices)]
+	game = Gameplay(players, headless=headless, firstPlayer=log.firstPlayer, seed=log.seed)
+	game.setupGame()
+	for i in range(log.steps):
+		game.step()
+	return game
+
+class MatchContext:
+	"""Everything belonging to a single match: its Gameplay, Logic, CardBuilder and random number generator. Players, cards and effects reach the match through this rather than through module globals, so any number of matches can live in one process. Also holds the match's state version, bumped on every change to its state, and its Zobrist hash of that state, updated on every change to it, unless tracking them has been stopped, along with the effects that fizzled in it: the card, effect and error of each.
+	"""
+
+	def __init__(self, game, seed, headless=False, fizzleEffects=False):
+		"""Initializing function. Creates the match's Logic and CardBuilder, and seeds its random number generator. Every random part of the match, such as shuffles, tutors and the coin toss, draws from it.
+
+		Args:
+				game (Gameplay): the game this context belongs to
+				seed (Integer): the seed of the match
+				headless (Boolean, optional): whether the match's events stay off the console. Its trace flags leave the console out, so events only the console takes aren't built. Defaults to False.
+				fizzleEffects (Boolean, optional): whether an effect raising an error fizzles, rather than the error being raised. Defaults to False.
+		"""
+		self.version = 0
+		self.stateHash = 0
+		self.isTracking = True
+		self.headless = headless
+		self.trace = tracer.getFlags(headless)
+		self.fizzleEffects = fizzleEffects
+		self.fizzles = []
+		self.game = game
+		self.rng = random.Random(seed)
+		self.logic = Logic(self)
+		self.cardbuilder = CardBuilder()
+
+	def clone(self, memo):
+		"""Clones this context for a cloned game. The CardBuilder holds no state and is shared. The random number generator is copied in its current state, so the clone draws what the original would have. Clones are always headless, so searching through them doesn't print to the console.
+
+		Args:
+				memo (Dictionary): the clones made so far, keyed by the id of their original
+
+		Returns:
+				MatchContext: the clone
+		"""
+		context = MatchContext.__new__(MatchContext)
+		memo[id(self)] = context
+		context.version = self.version
+		context.stateHash = self.stateHash
+		context.isTracking = self.isTracking
+		context.headless = True
+		context.trace = tracer.getFlags(True)
+		context.fizzleEffects = self.fizzleEffects
+		context.fizzles = []
+		context.rng = random.Random()
+		context.rng.setstate(self.rng.getstate())
+		context.game = getClone(self.game, memo)
+		context.cardbuilder = self.cardbuilder
+		context.logic = getClone(self.logic, memo)
+		return context
+
+	def stopTracking(self):
+		"""Stops keeping the state version and hash of the match up to date, so changes to its state skip that bookkeeping. For clones played out and thrown away, such as search rollouts. The hash is stale from then on, and legal actions are no longer cached.
+		"""
+		self.isTracking = False
+
+class Logic:
+	"""A logic class to ponder game logic and possible moves. Holds card numbers for quick referencing, along with the owner and zone of every card and the cards in every player's zones, so lookups don't scan. Cards in a deck may only have their number reserved, and are built the first time they're needed.
+	"""
+	def __init__(self, context):
+		"""Initialize and set card number to 0.
+
+		Args:
+				context (MatchContext): the match this logic belongs to
+		"""
+		self.context = context
+		self.cardNumCounter = 0
+		self.cards = []
+		self.unbuiltCards = {}
+		self.ownerSeats = []
+		self.cardZones = []
+		self.zones = [{zone: {} for zone in CARD_ZONES} for seat in range(2)]
+		self.legalActions = {}
+
+	def clone(self, memo):
+		"""Clones this logic for a cloned game, along with every card it has registered.
+
+		Args:
+				memo (Dictionary): the clones made so far, keyed by the id of their original
+
+		Returns:
+				Logic: the clone
+		"""
+		logic = Logic.__new__(Logic)
+		memo[id(self)] = logic
+		logic.context = getClone(self.context, memo)
+		logic.cardNumCounter = self.cardNumCounter
+		logic.cards = [getClone(card, memo) for card in self.cards]
+		logic.unbuiltCards = dict(self.unbuiltCards)
+		logic.ownerSeats = list(self.ownerSeats)
+		logic.cardZones = list(self.cardZones)
+		logic.zones = [{zone: dict(cardNums) for zone, cardNums in seatZones.items()} for seatZones in self.zones]
+		logic.legalActions = {}
+		return logic
+
+
+	def getCard(self, cardNum):
+		"""Get a card from a given index number, building it if it's only been reserved.
+
+		Args:
+				cardNum (Integer): index number of the card
+
+		Returns:
+				Card: card at that index
+		"""
+		card = self.cards[cardNum]
+		if card is None:
+			cardName = self.unbuiltCards.pop(cardNum)
+			card = self.context.cardbuilder.buildCard(cardName, self.getOwner(cardNum), CARD_STATES.inDeck, cardNum)
+		return card
+
+	def getDefinition(self, cardNum):
+		"""Gets the definition of a card from its index number, without building it.
+
+		Args:
+				cardNum (Integer): index number of the card
+
+		Returns:
+				CardDefinition: the definition of the card
+		"""
+		card = self.cards[cardNum]
+		if card is None:
+			return cardDefinitions[self.unbuiltCards[cardNum]]
+		return card.definition
+
+	def getOwner(self, cardNum):
+		"""Get the owner of a given card index.
+
+		Args:
+				cardNum (Integer): index number of the card
+
+		Returns:
+				Player: the owner of that card index
+		"""
+		return self.context.game.players[self.ownerSeats[cardNum]]
+
+	def getZone(self, card):
+		"""Gets the zone a card is in.
+
+		Args:
+				card (Card): the card
+
+		Returns:
+				CARD_ZONES: the zone, or None if the card is in none, such as a spell being cast.
+		"""
+		return self.cardZones[card.cardNum]
+
+	def getZoneCards(self, player, zone):
+		"""Gets the cards in one of a player's zones, in the order they entered it.
+
+		Args:
+				player (Player): the player
+				zone (CARD_ZONES): the zone
+
+		Returns:
+				List(Card): the cards in the zone. Cards in the deck are built if they haven't been yet.
+		"""
+		if zone is CARD_ZONES.deck:
+			return [self.getCard(cardNum) for cardNum in self.zones[getSeat(player)][zone]]
+		cards = self.cards
+		return [cards[cardNum] for cardNum in self.zones[getSeat(player)][zone]]
+
+	def getZoneCardNums(self, player, zone):
+		"""Gets the numbers of the cards in one of a player's zones, in the order they entered it, without building any.
+
+		Args:
+				player (Player): the player
+				zone (CARD_ZONES): the zone
+
+		Returns:
+				List(Integer): the numbers of the cards in the zone.
+		"""
+		return list(self.zones[getSeat(player)][zone])
+
+	def moveCard(self, card, zone):
+		"""Moves a card into one of its owner's zones, out of the one it was in. Cards entering or leaving the graveyard are also indexed or unindexed by their owner's Graveyard.
+
+		Args:
+				card (Card): the card
+				zone (CARD_ZONES): the zone it moves to, or None to take it out of every zone
+		"""
+		cardNum = card.cardNum
+		oldZone = self.cardZones[cardNum]
+		if oldZone is zone:
+			return
+		seat = self.ownerSeats[cardNum]
+		seatZones = self.zones[seat]
+		if oldZone is not None:
+			del seatZones[oldZone][cardNum]
+			if oldZone is CARD_ZONES.graveyard:
+				self.context.game.players[seat].graveyard.removeCard(card)
+		if zone is not None:
+			seatZones[zone][cardNum] = True
+			if zone is CARD_ZONES.graveyard:
+				self.context.game.players[seat].graveyard.addCard(card)
+		self.cardZones[cardNum] = zone
+
+	def leaveZone(self, card, zone):
+		"""Takes a card out of a zone, if it's still in it. Cards removed from a container may already have moved on, such as a monster destroyed while on the board.
+
+		Args:
+				card (Card): the card
+				zone (CARD_ZONES): the zone it leaves
+		"""
+		if self.cardZones[card.cardNum] is zone:
+			self.moveCard(card, None)
+
+	def canPlayCard(self, player, card):
+		"""Find whether a given player can play a given card.
+
+		Args:
+				player (Player): the player
+				card (Card): the card
+
+		Returns:
+				Boolean: whether the given player can play the given card.
+		"""
+		if self.context.trace.playability: tracer.emit(TRACE_CATEGORIES.playability, "playCheck", self, player=player.name, card=card.name)
+		if card.cost > player.energy:
+			if card.isOfType("Monster") and card.accelerate:
+				if card.accelerate.cost > player.energy:
+					if self.context.trace.playability: tracer.emit(TRACE_CATEGORIES.playability, "playRefused", self, player=player.name, card=card.name, reason="accelerateCost")
+					return False
+			else :
+				if self.context.trace.playability: tracer.emit(TRACE_CATEGORIES.playability, "playRefused", self, player=player.name, card=card.name, reason="cost")
+				return False
+
+		if card.isOfType("Monster"):
+			if not player.board.hasSpace() and not card.accelerate:
+				if self.context.trace.playability: tracer.emit(TRACE_CATEGORIES.playability, "playRefused", self, player=player.name, card=card.name, reason="boardFull")
+				return False
+			elif card.accelerate:
+				if card.accelerate.targets and len([target for target in self.getValidTargets(player, card.accelerate.targets) if target is not card]) < 1:
+					if self.context.trace.playability: tracer.emit(TRACE_CATEGORIES.playability, "playRefused", self, player=player.name, card=card.name, reason="noTargets")
+					return False
+		elif card.isOfType("Amulet"):
+			if not player.board.hasSpace():
+				if self.context.trace.playability: tracer.emit(TRACE_CATEGORIES.playability, "playRefused", self, player=player.name, card=card.name, reason="boardFull")
+				return False
+		elif card.isOfType("Spell"):
+			if card.targets and len(self.getValidTargets(player, card.targets)) < 1:
+				if self.context.trace.playability: tracer.emit(TRACE_CATEGORIES.playability, "playRefused", self, player=player.name, card=card.name, reason="noTargets")
+				return False
+
+		if self.context.trace.playability: tracer.emit(TRACE_CATEGORIES.playability, "playAllowed", self, player=player.name, card=card.name)
+		return True
+
+	def shouldAccelerate(self, player, card):
+		"""Finds whether a playable card would be played through its Accelerate ability: when it can't be afforded normally, or there's no room on the board for it.
+
+		Args:
+				player (Player): the player
+				card (Card): the card
+
+		Returns:
+				Boolean: whether the card would be accelerated.
+		"""
+		if not card.isOfType("Monster") or not card.accelerate:
+			return False
+		return player.energy < card.cost or not player.board.hasSpace()
+
+	def shouldEnhance(self, player, card):
+		"""Finds whether a playable card would be played through its Enhance ability: when it isn't accelerated and its Enhance cost can be afforded.
+
+		Args:
+				player (Player): the player
+				card (Card): the card
+
+		Returns:
+				Boolean: whether the card would be enhanced.
+		"""
+		if not card.enhance or self.shouldAccelerate(player, card):
+			return False
+		return player.energy >= card.enhance.cost
+
+	def getPlayTargets(self, player, card, actionType):
+		"""Gets the targets a card can be played on, for a given way of playing it.
+
+		Args:
+				player (Player): the player
+				card (Card): the card
+				actionType (ACTION_TYPES): how the card is played: normally, accelerated or enhanced
+
+		Returns:
+				List(Player or Card): the valid targets, or None if the card isn't played on a target.
+		"""
+		targetSpecs = card.targets if card.isOfType("Spell") else None
+		if actionType is ACTION_TYPES.playAccelerate:
+			targetSpecs = card.accelerate.targets
+		elif actionType is ACTION_TYPES.playEnhance and card.enhance.targets:
+			targetSpecs = card.enhance.targets
+		if not targetSpecs:
+			return None
+		return [target for target in self.getValidTargets(player, targetSpecs) if target is not card]
+
+	def canAttackWithCard(self, player, card):
+		"""Find whether a given player can attack with a given card. Automatically returns false if the card is not a MonsterCard.
+
+		Args:
+				player (Player): the player
+				card (Card): the card
+
+		Returns:
+				Boolean: whether the player can attack with this card.
+		"""
+		if not isinstance(card, MonsterCard):
+			return False
+		if card.getAttackState() is ATTACK_STATES.sickness or card.getAttackState() is ATTACK_STATES.attacked:
+			if self.context.trace.playability: tracer.emit(TRACE_CATEGORIES.playability, "attackRefused", self, player=player.name, card=card.name, attackState=card.getAttackState())
+			return False
+		if self.context.trace.playability: tracer.emit(TRACE_CATEGORIES.playability, "attackAllowed", self, player=player.name, card=card.name)
+		return True
+
+
+	def getValidTargets(self, owner, targetTypes):
+		"""Get a list of the valid targets for a given player and a list of target types. The target types are compiled into a Query once and looked up in the zones they name.
+
+		Args:
+				owner (Player): the player checking for targets
+				targetTypes (List(Object)): a list of objects with fields such as "Type", "Location", or an eval, "Test."
+
+		Returns:
+				List(Object): a list of objects, including "Card" and "Player."
+		"""
+		if self.context.trace.targets: tracer.emit(TRACE_CATEGORIES.targets, "targetsQueried", self, player=owner.name, specs=[dict(spec) for spec in targetTypes])
+		valids = queryCompiler.compileQuery(targetTypes).run(self, owner)
+		if self.context.trace.targets: tracer.emit(TRACE_CATEGORIES.targets, "targetsFound", self, player=owner.name, count=len(valids))
+		return valids
+
+	def registerCard(self, player, card, cardNum=None):
+		"""Gets a new unique index and passes it to the player, then returns the index. A card being built for an index reserved earlier takes that index instead.
+
+		Args:
+				player (Player): the player who owns this card
+				card (Card): the card
+				cardNum (Integer, optional): the index reserved for the card. Defaults to None, for a new index.
+
+		Returns:
+				Integer: the unique index given to this card.
+		"""
+		if cardNum is not None:
+			self.cards[cardNum] = card
+			bumpVersion(self)
+			return cardNum
+		player.registerCard(self.cardNumCounter)
+		self.cards.append(card)
+		self.ownerSeats.append(getSeat(player))
+		self.cardZones.append(None)
+		self.cardNumCounter += 1
+		bumpVersion(self)
+		return self.cardNumCounter - 1
+
+	def reserveCard(self, player, cardName, zone):
+		"""Reserves a unique index for a card in one of a player's zones, without building the card. The card is built by getCard the first time it's needed, such as when it's drawn.
+
+		Args:
+				player (Player): the player who owns this card
+				cardName (String): the name of the card
+				zone (CARD_ZONES): the zone the card is in
+
+		Returns:
+				Integer: the unique index reserved for this card.
+		"""
+		cardNum = self.registerCard(player, None)
+		self.unbuiltCards[cardNum] = cardName
+		self.cardZones[cardNum] = zone
+		self.zones[self.ownerSeats[cardNum]][zone][cardNum] = True
+		return cardNum
+
+	def getCardsMatching(self, criteria, owner):
+		"""Get cards matching the criteria given. Criteria are the same as target specs, and are compiled the same way.
+
+		Args:
+				criteria (List(Object) or Object): A list of criteria objects, or a single one, containing fields such as "Type", "Location", "Trait", "Craft", "Cost", and an eval string, "Test".
+				owner (Player): the player friendly locations refer to.
+
+		Returns:
+				List(Card): a list of cards matching the given criteria.
+		"""
+		if not isinstance(criteria, (list, tuple)):
+			criteria = [criteria]
+		return queryCompiler.compileQuery(criteria).run(self, owner)
+
+	def getCardNumsMatching(self, criteria, owner):
+		"""Get the numbers of the cards matching the criteria given. Cards in a deck are only built if a criteria's test needs them.
+
+		Args:
+				criteria (List(Object) or Object): A list of criteria objects, or a single one, as for getCardsMatching.
+				owner (Player): the player friendly locations refer to.
+
+		Returns:
+				List(Integer): the numbers of the cards matching the given criteria.
+		"""
+		if not isinstance(criteria, (list, tuple)):
+			criteria = [criteria]
+		return queryCompiler.compileQuery(criteria).runCardNums(self, owner)
+
+	def getEvolvableMonsters(self, player):
+		"""Returns evolvable monsters the player has on board. Monsters can be Evolved from a pool of 2 points, 3 for the second player. Evolving flips their face, granting them extra abilities and improved stats--usually +2/+2. Players can evolve on their 4th turn, but only once per turn.
+
+		Args:
+				player (Player): the player we're checking
+
+		Returns:
+				List(MonsterCard): the evolvable monsters the player has.
+		"""
+		return [card for card in player.board.getCards() if card.isOfType(CARD_TYPES.monster) and not card.isEvolved]
+
+	def getLegalActions(self, player):
+		"""Gets every action a given player can take right now: playing each playable card in hand (normally, accelerated or enhanced) on each of its valid targets, attacking with each ready monster, evolving each evolvable monster, and ending the turn. The result is cached until the state of the match changes, so asking again costs nothing.
+
+		Args:
+				player (Player): the player acting
+
+		Returns:
+				List(Action): the legal actions. Ending the turn is always last. The list is shared with later calls and shouldn't be modified.
+		"""
+		if not self.context.isTracking:
+			return self.findLegalActions(player)
+		cached = self.legalActions.get(player)
+		if cached is not None and cached[0] == self.context.version:
+			return cached[1]
+		actions = self.findLegalActions(player)
+		self.legalActions[player] = (self.context.version, actions)
+		return actions
+
+	def findLegalActions(self, player):
+		"""Works out every action a given player can take right now, without caching. See getLegalActions.
+
+		Args:
+				player (Player): the player acting
+
+		Returns:
+				List(Action): the legal actions. Ending the turn is always last.
+		"""
+		actions = []
+		for card in player.hand.getCards():
+			if not self.canPlayCard(player, card):
+				continue
+			actionType = ACTION_TYPES.playCard
+			if self.shouldAccelerate(player, card):
+				actionType = ACTION_TYPES.playAccelerate
+			elif self.shouldEnhance(player, card):
+				actionType = ACTION_TYPES.playEnhance
+			targets = self.getPlayTargets(player, card, actionType)
+			if targets is None:
+				actions.append(Action(actionType, card))
+			else :
+				for target in targets:
+					actions.append(Action(actionType, card, target))
+		for card in player.board.getCards():
+			if not self.canAttackWithCard(player, card):
+				continue
+			for target in self.getValidTargets(player, ATTACK_TARGETS):
+				if isinstance(target, Player):
+					actions.append(Action(ACTION_TYPES.attackLeader, card, target))
+				else :
+					actions.append(Action(ACTION_TYPES.attackMonster, card, target))
+		if player.canEvolve():
+			for card in self.getEvolvableMonsters(player):
+				actions.append(Action(ACTION_TYPES.evolve, card))
+		actions.append(Action(ACTION_TYPES.endTurn))
+		return actions
+
+class Gameplay:
+	"""A Gameplay class holding the logic of the game, such as rounds and players.
+	"""
+	def __init__(self, players, headless=False, firstPlayer=None, seed=None, fizzleEffects=False):
+		"""Initializes the gameplay object with a given list of players. The game keeps a log of its seed and every choice made, from which it can be replayed with replayGame.
+
+		Args:
+				players (List(Player)): a list of players involved in the game. Must be 2.
+				headless (Boolean, optional): whether to run without any console output. Only this match is silenced; other sinks, such as a ring buffer, still take its events. Defaults to False.
+				firstPlayer (Integer, optional): the index of the player who goes first. Defaults to a coin toss.
+				seed (Integer, optional): the seed every random part of the game draws from. The same seed, decks and choices always give the same game. Defaults to a seed drawn from the random module.
+				fizzleEffects (Boolean, optional): whether an effect raising an error fizzles, recorded in the context's fizzles, rather than the error being raised. Defaults to False, so broken cards and engine bugs surface.
+		"""
+		if len(players) != 2:
+			if tracer.errors: tracer.emit(TRACE_CATEGORIES.errors, "badPlayerCount", count=len(players))
+			return
+		self.seed = seed if seed is not None else random.getrandbits(64)
+		self.context = MatchContext(self, self.seed, headless, fizzleEffects)
+		for player in players:
+			player.context = self.context
+		self.players = players
+		self.activePlayer = players[0]
+		self.turnNum = 0
+		self.phase = TURN_PHASES.turnStart
+		self.isPlaying = False
+		self.winner = None
+		self.firstPlayer = firstPlayer
+		self.log = MatchLog(self.seed, firstPlayer, [player.name for player in players], [player.cardList for player in players])
+
+
+	def __setattr__(self, name, value):
+		"""Sets a field, bumping the state version of the match and updating its hash.
+
+		Args:
+				name (String): the name of the field
+				value (Any): its value
+		"""
+		context = getattr(self, "context", None)
+		if context is None or not context.isTracking:
+			object.__setattr__(self, name, value)
+			return
+		if name in GAME_HASHED_FIELDS:
+			hashField(self, ("game",), name, value)
+		object.__setattr__(self, name, value)
+		context.version += 1
+
+	def clone(self):
+		"""Takes a snapshot of the game: its players, their decks, hands, boards and registered effects, the Logic's cards and the random number generator's state. Identity is preserved, so a card in a cloned hand is the same object as in the cloned Logic and its effects' card. Card definitions are shared rather than copied. Agents are shared too; give the clone's players their own to play it out separately. The clone keeps no log, so searching through clones costs nothing extra.
+
+		Returns:
+				Gameplay: the clone, independent of this game.
+		"""
+		memo = {}
+		game = Gameplay.__new__(Gameplay)
+		memo[id(self)] = game
+		setFields(game,
+			context=getClone(self.context, memo),
+			players=[getClone(player, memo) for player in self.players],
+			activePlayer=getClone(self.activePlayer, memo),
+			turnNum=self.turnNum,
+			phase=self.phase,
+			isPlaying=self.isPlaying,
+			winner=getClone(self.winner, memo),
+			firstPlayer=self.firstPlayer,
+			seed=self.seed,
+			log=None
+		)
+		return game
+
+	def getStateHash(self):
+		"""Gets the Zobrist hash of the state of the game, kept up to date on every change to it. Games in the same state have the same hash however they got there, so it can key transposition tables and spot duplicate states. It covers the turn, phase and active player; each player's health, energy, shadows, evolutions, turn counters, cards invoked this turn and registered effects; each card's state, position in the deck, hand or board, stats, attack state, evolution, countdown and registered effects; and the remaining amount of every effect which can only go off a number of times. Cards are hashed by how they've changed since they were built, so whether a card in the deck has been built yet doesn't change the hash.
+
+		Returns:
+				Integer: the 64-bit hash.
+		"""
+		return self.context.stateHash
+
+	def computeStateHash(self):
+		"""Computes the hash of the state of the game from scratch, rather than keeping it up to date. Slow; used to check getStateHash.
+
+		Returns:
+				Integer: the 64-bit hash.
+		"""
+		stateHash = 0
+		fields = [(self, ("game",), GAME_HASHED_FIELDS)]
+		fields.extend((player, ("player", seat), PLAYER_HASHED_FIELDS) for seat, player in enumerate(self.players))
+		for obj, objKey, names in fields:
+			for name in names:
+				value = getattr(obj, name, UNSET)
+				if value is not UNSET:
+					stateHash ^= getZobristKey(getFieldFeature(objKey, name, value))
+		for card in self.context.logic.cards:
+			if card is not None:
+				stateHash ^= getCardHash(card) ^ card.builtHash
+		for seat, player in enumerate(self.players):
+			for effects in player.effects.values():
+				for effect in effects:
+					stateHash ^= getEffectHash(effect)
+			for zone in HASHED_ZONES:
+				for slot, cardNum in getattr(player, zone).slots.items():
+					stateHash ^= getZobristKey((zone, seat, slot, cardNum))
+		return stateHash
+
+	def getOtherPlayer(self, player):
+		"""Get the opposing player to a given player.
+
+		Args:
+				player (Player): the player not being searched for
+
+		Returns:
+				Player: the opposing player.
+		"""
+		if player == self.players[0]:
+			return self.players[1]
+		return self.players[0]
+
+
+	def startGame(self):
+		"""Starts the game and plays it until it's over.
+		"""
+		self.setupGame()
+		self.run()
+
+	def setupGame(self):
+		"""Sets the game up, beginning with a mulligan and then deciding the first player. The game is left at the start of their first turn.
+		"""
+		self.players[0].initialize()
+		self.players[1].initialize()
+
+		if self.context.trace.basics: tracer.emit(TRACE_CATEGORIES.basics, "gameStarted", self)
+		self.mulligan()
+
+		self.isPlaying = True
+		if self.firstPlayer is None:
+			self.firstPlayer = self.coinToss()
+		self.activePlayer = self.players[self.firstPlayer]
+		self.phase = TURN_PHASES.turnStart
+
+	def run(self):
+		"""Steps through the game until it's over.
+		"""
+		while self.step():
+			pass
+
+	def stepTurn(self):
+		"""Steps through the game until the current turn is over and the next one is about to start, or the game ends.
+
+		Returns:
+				Boolean: whether the game is still being played.
+		"""
+		while self.step():
+			if self.phase is TURN_PHASES.turnStart:
+				return True
+		return False
+
+	def step(self, action=None):
+		"""Advances the game by a single step: starting a turn, taking one action in the main phase, or ending a turn.
+
+		Args:
+				action (Action, optional): the action to take if the game is in its main phase. Defaults to asking the active player's agent.
+
+		Returns:
+				Boolean: whether the game is still being played.
+		"""
+		if not self.isPlaying:
+			self.phase = TURN_PHASES.gameOver
+			return False
+
+		player = self.activePlayer
+		if self.log is not None:
+			self.log.steps += 1
+		if self.phase is TURN_PHASES.turnStart:
+			self.startTurn(player)
+			self.phase = TURN_PHASES.main
+		elif self.phase is TURN_PHASES.main:
+			actions = None
+			if action is None:
+				actions = self.context.logic.getLegalActions(player)
+				action = player.agent.chooseAction(self, player, actions)
+			if self.log is not None:
+				self.log.recordAction(self.players.index(player), action, actions if actions is not None else self.context.logic.getLegalActions(player))
+			if action.actionType is ACTION_TYPES.endTurn:
+				self.phase = TURN_PHASES.turnEnd
+			else :
+				self.performAction(player, action)
+		elif self.phase is TURN_PHASES.turnEnd:
+			player.endTurn()
+			self.activePlayer = self.getOtherPlayer(player)
+			self.phase = TURN_PHASES.turnStart
+
+		if not self.isPlaying:
+			if self.context.trace.basics: tracer.emit(TRACE_CATEGORIES.basics, "gameOver", self, winner=self.winner.name if self.winner else None)
+			self.phase = TURN_PHASES.gameOver
+		return self.isPlaying
+
+	def mulligan(self):
+		"""Mulligans, allowing the first player to redraw up to three cards, then the second player. Each player's agent picks the cards to redraw.
+		"""
+		if self.context.trace.basics: tracer.emit(TRACE_CATEGORIES.basics, "mulliganing", self)
+		for player in self.players:
+			player.draw(3)
+			if self.context.trace.basics: tracer.emit(TRACE_CATEGORIES.basics, "handShown", self, player=player.name, hand=str(player.hand))
+
+			cards = list(player.hand.getCards())
+			redrawing = player.agent.chooseMulligan(self, player, cards)
+			if self.log is not None:
+				self.log.recordMulligan(self.players.index(player), cards, redrawing)
+			for card in redrawing:
+				player.hand.removeCard(card)
+				player.deck.addCard(card)
+				player.deck.shuffle()
+				player.draw()
+
+			if self.context.trace.basics: tracer.emit(TRACE_CATEGORIES.basics, "handShown", self, player=player.name, hand=str(player.hand))
+
+	def coinToss(self):
+		"""Picks a random player, drawing from the match's random number generator.
+
+		Returns:
+				Player: the player chosen randomly.
+		"""
+		firstPlayer = 0
+		if self.context.rng.random() > 0.5:
+			firstPlayer = 1
+		return firstPlayer
+
+	def startTurn(self, player):
+		"""Starts a given player's turn. Increments the current turn number, and if it's the second player's first turn, they get an extra card.
+
+		Args:
+				player (Player): the player whose turn it is
+		"""
+		self.turnNum += 1
+		self.activePlayer = player
+		if self.context.trace.basics: tracer.emit(TRACE_CATEGORIES.basics, "turnAnnounced", self, player=player.name)
+		player.startTurn()
+
+		if self.turnNum == 2 and self.isPlaying:
+			player.draw()
+
+	def performAction(self, player, action):
+		"""Carries out a given action for a given player.
+
+		Args:
+				player (Player): the player acting
+				action (Action): the action, usually one of those returned by Logic.getLegalActions
+		"""
+		if self.context.trace.playerInput: tracer.emit(TRACE_CATEGORIES.playerInput, "actionChosen", self, player=player.name, action=str(action))
+		targets = [action.target] if action.target else None
+		if action.actionType is ACTION_TYPES.playCard:
+			player.playCard(action.card, targets=targets)
+		elif action.actionType is ACTION_TYPES.playAccelerate:
+			player.playAccelerate(action.card, targets=targets)
+		elif action.actionType is ACTION_TYPES.playEnhance:
+			player.playEnhance(action.card, targets=targets)
+		elif action.actionType is ACTION_TYPES.attackLeader:
+			player.attackEnemy(action.card)
+		elif action.actionType is ACTION_TYPES.attackMonster:
+			player.attackCard(action.card, action.target)
+		elif action.actionType is ACTION_TYPES.evolve:
+			player.evolveMonster(action.card)
+
+	def chooseTargets(self, player, targets, numTargets=1):
+		"""Has a player's agent choose a number of targets from a given list of available ones.
+
+		Args:
+				player (Player): the player choosing
+				targets (List(Player or Card)): a list of targets available to choose from, Card or Player.
+				numTargets (Integer, optional): number of targets to be chosen. Defaults to 1.
+
+		Returns:
+				List(Player or Card): a list of the targets chosen.
+		"""
+		chosen = player.agent.chooseTargets(self, player, targets, min(numTargets, len(targets)))
+		if self.log is not None:
+			self.log.recordTargets(self.players.index(player), targets, chosen)
+		return chosen
+
+class Player:
+	"""A player object containing fields like a name, a list of cards, and values like health and energy. Also contains a Deck, a Hand and a Board object.
+	"""
+	__slots__ = ("name", "cardList", "agent", "context", "cardNumbers", "effects", "effectSignatures", "events", "maxHealth", "health", "deck", "hand", "board", "graveyard", "energy", "totalEnergy", "shadows", "turnsPlayed", "invocationsThisTurn", "evolutions", "totalEvolutions", "hasEvolvedThisTurn")
+
+	def __init__(self, name, cardList, agent=None):
+		"""Initializes the player object. Creates an empty effects object and an empty list of card indices.
+
+		Args:
+				name (String): the name of the player
+				cardList (List(String)): a list of card names in the player's deck
+				agent (Agent, optional): the agent making this player's choices. Defaults to a ConsoleAgent, asking at the terminal.
+		"""
+		self.name = name
+		self.cardList = cardList
+		self.agent = agent if agent else ConsoleAgent()
+		self.context = None
+		self.cardNumbers = []
+		self.effects = {}
+		self.effectSignatures = {}
+		self.events = EventBus()
+
+	def __setattr__(self, name, value):
+		"""Sets a field, bumping the state version of the match and updating its hash.
+
+		Args:
+				name (String): the name of the field
+				value (Any): its value
+		"""
+		context = getattr(self, "context", None)
+		if context is None or not context.isTracking:
+			object.__setattr__(self, name, value)
+			return
+		if name in PLAYER_HASHED_FIELDS:
+			hashField(self, ("player", getSeat(self)), name, value)
+		object.__setattr__(self, name, value)
+		context.version += 1
+
+	def clone(self, memo):
+		"""Clones this player for a cloned game, along with their deck, hand, board and effects. The card list and agent are shared.
+
+		Args:
+				memo (Dictionary): the clones made so far, keyed by the id of their original
+
+		Returns:
+				Player: the clone
+		"""
+		player = Player.__new__(Player)
+		memo[id(self)] = player
+		setFields(player,
+			name=self.name,
+			cardList=self.cardList,
+			agent=self.agent,
+			context=getClone(self.context, memo),
+			cardNumbers=list(self.cardNumbers),
+			effects=cloneEffectStore(self.effects, memo),
+			effectSignatures=dict(self.effectSignatures),
+			events=getClone(self.events, memo)
+		)
+		if not hasattr(self, "deck"):
+			return player
+		setFields(player,
+			maxHealth=self.maxHealth,
+			health=self.health,
+			energy=self.energy,
+			totalEnergy=self.totalEnergy,
+			shadows=self.shadows,
+			turnsPlayed=self.turnsPlayed,
+			invocationsThisTurn=list(self.invocationsThisTurn),
+			evolutions=self.evolutions,
+			totalEvolutions=self.totalEvolutions,
+			hasEvolvedThisTurn=self.hasEvolvedThisTurn,
+			deck=getClone(self.deck, memo),
+			hand=getClone(self.hand, memo),
+			board=getClone(self.board, memo),
+			graveyard=getClone(self.graveyard, memo)
+		)
+		return player
+
+	def __str__(self):
+		"""A Stringing method for the player.
+
+		Returns:
+				String: the player's name and attributes represented in words.
+		"""
+		return "{0}: {1} health, {2}/{3} energy, {4} shadows, {5} evolves, {6} cards in hand, {7} cards in deck.".format(self.name, self.health, self.energy, self.totalEnergy, self.shadows, self.evolutions, len(self.hand), len(self.deck))
+		
+	def initialize(self):
+		"""Initializes the player at game start. Sets all values to their base amounts.
+		"""
+		self.maxHealth = 20
+		self.health = 20
+		self.deck = Deck(self.cardList, self)
+		self.hand = Hand(self)
+		self.board = Board(self)
+		self.graveyard = Graveyard(self)
+		self.energy = 0
+		self.totalEnergy = 0
+		self.shadows = 0
+		self.turnsPlayed = 0
+		self.invocationsThisTurn = []
+		self.evolutions = 3
+		self.totalEvolutions = 3
+		self.hasEvolvedThisTurn = False
+
+		# self.totalEnergy = self.energy = 10
+		# self.maxHealth = self.health = 1
+
+
+	def canEvolve(self):
+		"""Checks whether the player can evolve. Monsters can be Evolved from a pool of 2 points, 3 for the second player. Evolving flips their face, granting them extra abilities and improved stats--usually +2/+2. Players can evolve on their 4th turn, but only once per turn.
 
 		Returns:
-				String: the player's name and attributes represented in words.
+				bool: whether the player can evolve.
+		"""
+		return self.turnsPlayed >= 3 and not self.hasEvolvedThisTurn and self.evolutions > 0
+
+
+	def registerEffect(self, trigger, effect):
+		"""Adds a given effect to the player with a given trigger. Effects are counted by their signature, and hashed by their signature and how many copies were registered before them.
+
+		Args:
+				trigger (TriggerType): the trigger the effect fires on
+				effect (Effect): the effect to be appended to the player
+		"""
+		if self.context.trace.effects: tracer.emit(TRACE_CATEGORIES.effects, "effectRegistered", self, player=self.name, card=effect.card.name, trigger=trigger.name, effect=effect.effect)
+		if effect.isUnstackable and self.effectRegistered(effect):
+			return
+		self.effects.setdefault(trigger, []).append(effect)
+		copies = self.effectSignatures.get(effect.signature, 0)
+		self.effectSignatures[effect.signature] = copies + 1
+		effect.hashKey = ("playerEffect", getSeat(self), effect.signature, copies)
+		hashEffect(effect)
+		self.events.subscribe(trigger, effect, fromPlayer=True)
+		bumpVersion(self)
+
+	def effectRegistered(self, effect):
+		"""Checks whether a given effect is already registered: whether an effect built from the same effect of the same card is, by its signature.
+
+		Args:
+				effect (Effect): the effect to be tested against
+
+		Returns:
+				Boolean: whether the effect is already registered on this player.
+		"""
+		return effect.signature in self.effectSignatures
+
+	def resolveSelf(self, trigger, **kwargs):
+		"""Resolves effects on this player registered on the given trigger.
+
+		Args:
+				trigger (TriggerType): the type of trigger resolving
+				kwargs (kwargs): a list of keyword arguments necessary to pop the effects, such as number of shadows used in Necromancy
+		"""
+		if self.context.trace.triggers: tracer.emit(TRACE_CATEGORIES.triggers, "playerSelfResolving", self, player=self.name, trigger=trigger.name)
+		if self.context.trace.kwargs: tracer.emit(TRACE_CATEGORIES.kwargs, "triggerKwargs", self, player=self.name, trigger=trigger.name, kwargs=dict(kwargs))
+		profiling = profiler.enabled
+		if profiling:
+			start = time.perf_counter()
+		self.events.refill(trigger, fromPlayer=True)
+		self.events.publish(trigger, fromPlayer=True, **kwargs)
+		if profiling:
+			profiler.recordTrigger("Player.resolveSelf", trigger, time.perf_counter() - start)
+
+	def resolveAllCards(self, trigger, **kwargs):
+		"""Resolves effects on all cards in this player's hand, deck and field using a given trigger. Only the effects subscribed to that trigger on the event bus are visited.
+
+		Args:
+				trigger (TriggerType): the type of trigger resolving
+				kwargs (kwargs): a list of keyword arguments necessary to pop the effects, such as number of shadows used in Necromancy
+		"""
+		if self.context.trace.kwargs: tracer.emit(TRACE_CATEGORIES.kwargs, "triggerKwargs", self, player=self.name, trigger=trigger.name, kwargs=dict(kwargs))
+		profiling = profiler.enabled
+		if profiling:
+			start = time.perf_counter()
+		self.events.refill(trigger)
+		self.events.publish(trigger, **kwargs)
+		if profiling:
+			profiler.recordTrigger("Player.resolveAllCards", trigger, time.perf_counter() - start)
+
+	def resolveAll(self, trigger, **kwargs):
+		"""Resolves effects on all cards in this player's hand, deck and field, and themselves using a given trigger.
+
+		Args:
+				trigger (TriggerType): the type of trigger resolving
+				kwargs (kwargs): a list of keyword arguments necessary to pop the effects, such as number of shadows used in Necromancy
+		"""
+		if self.context.trace.triggers: tracer.emit(TRACE_CATEGORIES.triggers, "playerTriggerResolving", self, player=self.name, trigger=trigger.name)
+		self.resolveSelf(trigger, **kwargs)
+		self.resolveAllCards(trigger, **kwargs)
+
+	def resolve(self, cards, trigger, **kwargs):
+		"""Resolves effects on all cards in the given list using a given trigger.
+
+		Args:
+				cards (List(Card)): the cards to be tested for effect resolution
+				trigger (TriggerType): the type of trigger resolving
+				kwargs (kwargs): a list of keyword arguments necessary to pop the effects, such as number of shadows used in Necromancy
+		"""
+		if self.context.trace.kwargs: tracer.emit(TRACE_CATEGORIES.kwargs, "triggerKwargs", self, player=self.name, trigger=trigger.name, kwargs=dict(kwargs))
+		for card in cards:
+			card.triggerPop(trigger, **kwargs)
+
+
+	def startTurn(self):
+		"""Starts this player's turn and prints out their side of the field.
+		"""
+		if self.context.trace.basics: tracer.emit(TRACE_CATEGORIES.basics, "turnStarted", self, player=self.name)
+		self.draw()
+		self.gainTotalEnergy()
+		self.refillEnergy()
+		self.hasEvolvedThisTurn = False
+		for card in self.board.getCards():
+			if isinstance(card, MonsterCard):
+				if self.context.trace.interactions: tracer.emit(TRACE_CATEGORIES.interactions, "cardShown", self, player=self.name, card=str(card))
+				card.attackState = ATTACK_STATES.storm
+		self.resolveAll(TRIGGER_TYPES.onFriendlyTurnStart)
+
+	def attackEnemy(self, card):
+		"""This player attacks the opposing player with a given card.
+
+		Args:
+				card (MonsterCard): the attacking card.
+		"""
+		card.triggerPop(TRIGGER_TYPES.onAttacking)
+		card.triggerPop(TRIGGER_TYPES.onLeaderClashing)
+		enemy = self.context.game.getOtherPlayer(self)
+		enemy.takeDamage(card.attack)
+		card.triggerPop(TRIGGER_TYPES.onDealtDamage)
+		if "Drain" in card.getActiveAbilities():
+			self.gainHealth(card.attack)
+		card.attackState = ATTACK_STATES.attacked
+		if self.context.trace.basics: tracer.emit(TRACE_CATEGORIES.basics, "leaderAttacked", self, card=card.name, player=enemy.name, damage=card.attack, health=enemy.health)
+
+	def attackCard(self, card, target):
+		"""This player attacks the given target card with the given card.
+
+		Args:
+				card (MonsterCard): the attacking card
+				target (MonsterCard): the card being attacked
+		"""
+		card.triggerPop(TRIGGER_TYPES.onAttacking)
+		card.triggerPop(TRIGGER_TYPES.onClashing)
+		target.triggerPop(TRIGGER_TYPES.onClashing)
+		target.takeDamage(card.attack)
+		card.triggerPop(TRIGGER_TYPES.onDealtDamage)
+		if "Drain" in card.getActiveAbilities():
+			self.gainHealth(card.attack)
+		target.triggerPop(TRIGGER_TYPES.onTookDamage)
+		if "Bane" in card.getActiveAbilities() and target.state == CARD_STATES.played:
+			target.destroy()
+		card.takeDamage(target.attack)
+		target.triggerPop(TRIGGER_TYPES.onDealtDamage)
+		card.triggerPop(TRIGGER_TYPES.onTookDamage)
+		if "Bane" in target.getActiveAbilities() and card.state == CARD_STATES.played:
+			card.destroy()
+		card.attackState = ATTACK_STATES.attacked
+
+	def endTurn(self):
+		"""Ends this player's turn.
+		"""
+		self.resolveAll(TRIGGER_TYPES.onFriendlyTurnEnd)
+		self.invocationsThisTurn = []
+		self.turnsPlayed += 1
+		if self.context.trace.basics: tracer.emit(TRACE_CATEGORIES.basics, "turnEnded", self, player=self.name)
+
+	def die(self):
+		"""This player loses the game.
+		"""
+		game = self.context.game
+		if not game.isPlaying:
+			return
+		if self.context.trace.basics: tracer.emit(TRACE_CATEGORIES.basics, "playerLost", self, player=self.name)
+		game.isPlaying = False
+		game.winner = game.getOtherPlayer(self)
+	
+
+	def registerCard(self, num):
+		"""Registers a card's unique index with this player.
+
+		Args:
+				num (Integer): the unique index of the card
+		"""
+		self.cardNumbers.append(num)
+
+	def drawCard(self, card):
+		"""This player draws a given card from their Deck.
+
+		Args:
+				card (Card): the card to be drawn
+		"""
+		self.deck.removeCard(card)
+		self.hand.addCard(card)
+
+	def draw(self, numCards=1):
+		"""This player draws a given number of cards. Usually 1.
+
+		Args:
+				numCards (Integer, optional): the number of cards to draw. Defaults to 1.
+		"""
+		for i in range(numCards):
+			if len(self.deck) <= 0:
+				self.die()
+				return
+			card = self.deck.draw()
+			self.hand.addCard(card)
+
+	def addCards(self, cardNames):
+		"""This player adds cards to their hand without taking them from their deck. In some circumstances, the cards may not even be in their deck.
+
+		Args:
+				cardNames (List(String)): a list of card names to be created and added to the hand
+		"""
+		for name in cardNames:
+			card = self.context.cardbuilder.buildCard(name, self, CARD_STATES.held)
+			card.registerAllEffects()
+			self.hand.addCard(card)
+
+	def playCard(self, card, costless=False, targets=None):
+		"""This player plays a given card.
+
+		Args:
+				card (Card): the card to be played
+				costless (Boolean, optional): whether the card doesn't require energy to play. Defaults to False.
+				targets (List(Player or Card), optional): the targets already chosen for the card. Defaults to asking the player's agent, if the card needs any.
+		"""
+		if not costless: 
+			self.spendEnergy(card.cost)
+		if card in self.hand: 
+			self.hand.removeCard(card)
+		if card.isOfType("Amulet") or card.isOfType("Monster"):
+			self.board.playCard(card)
+		card.onPlay(targets)
+		if self.context.trace.basics: tracer.emit(TRACE_CATEGORIES.basics, "cardPlayed", self, player=self.name, card=card.name)
+
+	def playEnhance(self, card, costless=False, targets=None):
+		"""This player plays a given card Enhanced, paying its Enhance cost for the extra effects. Some cards have Enhance abilities which cost more but add to their effects.
+
+		Args:
+				card (Card): the card to be enhanced
+				costless (Boolean, optional): whether the card doesn't require energy to play. Defaults to False.
+				targets (List(Player or Card), optional): the targets already chosen for the card. Defaults to asking the player's agent, if the card needs any.
+		"""
+		if not costless:
+			self.spendEnergy(card.enhance.cost)
+		if card in self.hand:
+			self.hand.removeCard(card)
+		if card.isOfType("Amulet") or card.isOfType("Monster"):
+			self.board.playCard(card)
+		card.onPlayEnhance(targets)
+		if self.context.trace.basics: tracer.emit(TRACE_CATEGORIES.basics, "cardEnhanced", self, player=self.name, card=card.name)
+
+	def playFromDeck(self, card):
+		"""This player plays a given card straight from their deck. This is always costless.
+
+		Args:
+				card (Card): the card to be played
+		"""
+		self.deck.removeCard(card)
+		card.registerAllEffects()
+		if card.isOfType("Amulet") or card.isOfType("Monster"):
+			self.board.playCard(card)
+		card.onPlay()
+		if self.context.trace.basics: tracer.emit(TRACE_CATEGORIES.basics, "cardPlayedFromDeck", self, player=self.name, card=card.name)
+
+	def playAccelerate(self, card, costless=False, targets=None):
+		"""This player plays a given card's Accelerate ability, playing a MonsterCard as a SpellCard. Some Monsters have Accelerate abilities allowing them to be played as Spells at reduced cost.
+
+		Args:
+				card (Card): the card to be accelerated
+				costless (Boolean, optional): whether the card doesn't require energy to play. Defaults to False.
+				targets (List(Player or Card), optional): the targets already chosen for the card. Defaults to asking the player's agent, if the card needs any.
+		"""
+		if not costless:
+			self.spendEnergy(card.accelerate.cost)
+		self.hand.discard(card)
+		card.onAccelerate(targets)
+		if self.context.trace.basics: tracer.emit(TRACE_CATEGORIES.basics, "cardAccelerated", self, player=self.name, card=card.name)
+
+	def playCardNames(self, cards):
+		"""This player plays a given list of cards, constructing them from their names.
+
+		Args:
+				cards (List(String)): list of card names
+		"""
+		for card in cards:
+			if not self.board.hasSpace():
+				return
+			builtCard = self.context.cardbuilder.buildCard(card, self, CARD_STATES.played)
+			builtCard.registerAllEffects()
+			self.board.playCard(builtCard)
+			builtCard.onSummon()
+
+
+	def burialRite(self, card):
+		"""Burial Rites the given card, stripping its effects and playing it, then destroying it. Some cards allow for Burial Rites, which discards a card but lets it effectlessly hit the board first.
+
+		Args:
+				card (Card): the card to be Burial Rited
+		"""
+		if not self.board.hasSpace(): 
+			return
+		card.clearEffects()
+		card.abilities = ()
+		self.playCard(card, True)
+		card.destroy()
+
+	def tutor(self, **kwargs):
+		"""This player takes a random card from their deck matching the keyword arguments given. Only the card taken is built.
+
+		Args:
+				kwargs (keywords): the criteria from which the available cards are picked, such as type="Monster" or craft="Shadow". Each is a criteria field named in lower camel case.
+		"""
+		if self.context.trace.effects: tracer.emit(TRACE_CATEGORIES.effects, "tutoring", self, player=self.name, criteria=dict(kwargs))
+		criteria = {key[0].upper() + key[1:]: value for key, value in kwargs.items()}
+		criteria["Location"] = "inFriendlyDeck"
+		logic = self.context.logic
+		cardNums = logic.getCardNumsMatching(criteria, self)
+		if self.context.trace.effects: tracer.emit(TRACE_CATEGORIES.effects, "tutorCandidates", self, player=self.name, cards=[logic.getDefinition(cardNum).name for cardNum in cardNums])
+
+		if len(cardNums) == 0:
+			if self.context.trace.effects: tracer.emit(TRACE_CATEGORIES.effects, "tutorFailed", self, player=self.name)
+			return
+		self.drawCard(logic.getCard(self.context.rng.choice(cardNums)))
+
+	def necromancy(self, shadows):
+		"""This player performs Necromancy, spending the given number of shadows. Cards with Necromancy have an extra effect which only goes off if their owner can pay its shadows.
+
+		Args:
+				shadows (Integer): the number of shadows spent
+
+		Returns:
+				Boolean: whether the player had enough shadows, and so performed it.
+		"""
+		if self.shadows < shadows:
+			if self.context.trace.effects: tracer.emit(TRACE_CATEGORIES.effects, "necromancyRefused", self, player=self.name, shadows=shadows, available=self.shadows)
+			return False
+		self.shadows -= shadows
+		if self.context.trace.effects: tracer.emit(TRACE_CATEGORIES.effects, "necromancyPerformed", self, player=self.name, shadows=shadows)
+		self.resolveAll(TRIGGER_TYPES.onFriendlyNecromancy, shadows=shadows)
+		self.context.game.getOtherPlayer(self).resolveAll(TRIGGER_TYPES.onEnemyNecromancy, shadows=shadows)
+		return True
+
+	def reanimate(self, cost):
+		"""This player Reanimates at the given cost, summoning a copy of a random destroyed MonsterCard of theirs with the highest base cost up to the given cost: the given cost if there is one, or else the closest lower cost. The destroyed card stays in the graveyard.
+
+		Args:
+				cost (Integer): the highest base cost reanimated
+
+		Returns:
+				Card: the summoned card, or None if no destroyed MonsterCard costs that little or the board is full.
+		"""
+		foundCost = self.graveyard.getHighestCost(CARD_TYPES.monster, cost)
+		if foundCost is None or not self.board.hasSpace():
+			if self.context.trace.effects: tracer.emit(TRACE_CATEGORIES.effects, "reanimateFailed", self, player=self.name, cost=cost)
+			return None
+		cardNum = self.context.rng.choice(self.graveyard.getCardNumsOfCost(CARD_TYPES.monster, foundCost))
+		card = self.context.cardbuilder.buildCard(self.context.logic.getDefinition(cardNum).key, self, CARD_STATES.played)
+		card.registerAllEffects()
+		self.board.playCard(card)
+		card.onSummon()
+		if self.context.trace.basics: tracer.emit(TRACE_CATEGORIES.basics, "cardReanimated", self, player=self.name, card=card.name, cost=cost)
+		return card
+
+	def invokeCard(self, card):
+		"""Invokes a given card, playing it straight from the deck. Some cards have Invocation, which means when specific requirements are met, they are played from the player's deck.
+
+		Args:
+				card (Card): the card to be invoked
 		"""
-		return "{0}: {1} health, {2}/{3} energy, {4} shadows, {5} evolves, {6} cards in hand, {7} cards in deck.".format(self.name, self.health, self.energy, self.totalEnergy, self.shadows, self.evolutions, len(self.hand.getCards()), len(self.deck.getCards()))
-		
-	def initialize(self):
-		"""Initializes the player at game start. Sets all values to their base amounts.
+		if self.board.hasSpace() and card.name not in self.invocationsThisTurn and self.context.logic.getZone(card) is CARD_ZONES.deck:
+			self.playFromDeck(card)
+			self.invocationsThisTurn = self.invocationsThisTurn + [card.name]
+
+
+	def evolveMonster(self, card):
+		"""Evolves a card. Monsters can be Evolved from a pool of 2 points, 3 for the second player. Evolving flips their face, granting them extra abilities and improved stats--usually +2/+2. Players can evolve on their 4th turn, but only once per turn.
+
+		Args:
+				card (MonsterCard): the card to be evolved
 		"""
-		self.maxHealth = 20
-		self.health = 20
-		self.deck = Deck(self.cardList, self)
-		self.hand = Hand(self)
-		self.board = Board(self)
-		self.energy = 0
-		self.totalEnergy = 0
-		self.shadows = 0
-		self.turnsPlayed = 0
-		self.invocationsThisTurn = []
-		self.evolutions = 3
-		self.totalEvolutions = 3
-		self.hasEvolvedThisTurn = False
+		self.evolutions -= 1
+		self.hasEvolvedThisTurn = True
+		card.onEvolve()
+		if self.context.trace.basics: tracer.emit(TRACE_CATEGORIES.basics, "monsterEvolved", self, player=self.name, card=card.name)
 
-		# self.totalEnergy = self.energy = 10
-		# self.maxHealth = self.health = 1
 
+	def takeDamage(self, amount):
+		"""This player takes a given amount of damage. If they end up below or at 0, they lose.
 
-	def canEvolve(self):
-		"""Checks whether the player can evolve. Monsters can be Evolved from a pool of 2 points, 3 for the second player. Evolving flips their face, granting them extra abilities and improved stats--usually +2/+2. Players can evolve on their 4th turn, but only once per turn.
+		Args:
+				amount (Integer): the amount of health lost
+		"""
+		self.health -= amount
+		if self.health <= 0:
+			self.die()
+
+	def gainHealth(self, amount):
+		"""This player gains a given amount of health. Usually the cap is 20, and the excess is lost.
+
+		Args:
+				amount (Integer): the amount of health gained
+		"""
+		self.health += amount
+		if self.health > self.maxHealth:
+			self.health = self.maxHealth
+
+	def refillEnergy(self):
+		"""This player refills their energy to their current max.
+		"""
+		self.energy = self.totalEnergy
+
+	def gainTotalEnergy(self, amount=1):
+		"""This player increases their total energy by the given amount, usually 1. The cap is 10.
+
+		Args:
+				amount (Integer, optional): the amount of energy the cap is increased by. Defaults to 1.
+		"""
+		self.totalEnergy += amount
+		if self.totalEnergy > 10:
+			self.totalEnergy = 10
+		if self.context.trace.resources: tracer.emit(TRACE_CATEGORIES.resources, "totalEnergyGained", self, player=self.name, amount=amount, totalEnergy=self.totalEnergy)
+
+	def gainEnergy(self, amount=1):
+		"""This player increases their current energy by the given amount, usually 1. The cap is their total energy amount.
+
+		Args:
+				amount (Integer, optional): the amount of energy their current energy is increased by. Defaults to 1.
+		"""
+		self.energy += amount
+		if self.energy > self.totalEnergy:
+			self.energy = self.totalEnergy
+		if self.context.trace.resources: tracer.emit(TRACE_CATEGORIES.resources, "energyGained", self, player=self.name, amount=amount, energy=self.energy)
+
+	def spendEnergy(self, amount):
+		"""This player spends a given amount of energy.
+
+		Args:
+				amount (Integer): the amount of energy spent
+		"""
+		self.energy -= amount
+
+	def gainShadows(self, amount=1):
+		"""This player gains a given number of Shadows. Usually 1. Shadows are a resource loosely tied to graveyard count. Discarded and destroyed cards add 1 to the owner's Shadows.
+
+		Args:
+				amount (Integer, optional): the amount of shadows to add. Defaults to 1.
+		"""
+		if self.context.trace.resources: tracer.emit(TRACE_CATEGORIES.resources, "shadowsGained", self, player=self.name, amount=amount, shadows=self.shadows + amount)
+		self.shadows += amount
+
+class CardSlots:
+	"""An ordered collection of card numbers, first to last, such as a deck from bottom to top. Each card number sits in a numbered slot: cards added at the last end take the slot past it and cards added at the first end the slot below it, so removing a card leaves every other card in its slot. Adding at either end, taking the last card, removing any card and finding a card's slot are all O(1); the slots emptied by removals are skipped as the ends are trimmed, and reset packs the cards back into slots from 0.
+	"""
+	__slots__ = ("slotOf", "cardAt", "first", "end")
+
+	def __init__(self, cardNums=()):
+		"""Initializing function.
+
+		Args:
+				cardNums (List(Integer), optional): the card numbers held, first to last. Defaults to none.
+		"""
+		self.reset(cardNums)
+
+	def clone(self):
+		"""Copies the collection, slots included.
 
 		Returns:
-				bool: whether the player can evolve.
+				CardSlots: the copy
 		"""
-		return self.turnsPlayed >= 3 and not self.hasEvolvedThisTurn
+		slots = CardSlots.__new__(CardSlots)
+		slots.slotOf = dict(self.slotOf)
+		slots.cardAt = dict(self.cardAt)
+		slots.first = self.first
+		slots.end = self.end
+		return slots
 
+	def reset(self, cardNums):
+		"""Replaces the cards held, packing them into slots from 0.
 
-	def registerEffect(self, trigger, effect):
-		"""Adds a given effect to the player with a given trigger.
+		Args:
+				cardNums (List(Integer)): the card numbers, first to last
+		"""
+		self.cardAt = dict(enumerate(cardNums))
+		self.slotOf = {cardNum: slot for slot, cardNum in self.cardAt.items()}
+		self.first = 0
+		self.end = len(self.cardAt)
+
+	def __len__(self):
+		"""Gets the number of cards held.
+
+		Returns:
+				Integer: the number of cards.
+		"""
+		return len(self.slotOf)
+
+	def __contains__(self, cardNum):
+		"""Checks whether a card is held.
 
 		Args:
-				trigger (TriggerType): the trigger the effect fires on
-				effect (Effect): the effect to be appended to the player
+				cardNum (Integer): the number of the card
+
+		Returns:
+				Boolean: whether it's held.
 		"""
-		if ACTIVE_DEBUG_STATES[DEBUG_STATES.effects]: print("Registering an effect on {0}:".format(self.name))
-		if ACTIVE_DEBUG_STATES[DEBUG_STATES.effects]: print(effect.effect)
-		if effect.isUnstackable and self.effectRegistered(effect):
-			return
-		self.effects[trigger].append(effect)
+		return cardNum in self.slotOf
 
-	def effectRegistered(self, effect):
-		"""Checks whether a given effect is already registered.
+	def __iter__(self):
+		"""Iterates over the card numbers held, first to last.
+
+		Returns:
+				Iterator(Integer): the card numbers.
+		"""
+		cardAt = self.cardAt
+		if len(cardAt) == self.end - self.first:
+			return (cardAt[slot] for slot in range(self.first, self.end))
+		return (cardAt[slot] for slot in range(self.first, self.end) if slot in cardAt)
+
+	def items(self):
+		"""Iterates over the cards held along with their slots, first to last.
+
+		Returns:
+				Iterator(Tuple(Integer, Integer)): pairs of slot and card number.
+		"""
+		cardAt = self.cardAt
+		return ((slot, cardAt[slot]) for slot in range(self.first, self.end) if slot in cardAt)
+
+	def getSlot(self, cardNum):
+		"""Gets the slot a card sits in.
 
 		Args:
-				effect (Effect): the effect to be tested against
+				cardNum (Integer): the number of the card
 
 		Returns:
-				Boolean: whether the effect is already registered on this player.
+				Integer: the slot, or None if the card isn't held.
 		"""
-		for triggerType in self.effects:
-			for registeredEffect in self.effects[triggerType]:
-				if effect == registeredEffect:
-					return True
-		return False
+		return self.slotOf.get(cardNum)
 
-	def resolveSelf(self, trigger, **kwargs):
-		"""Resolves effects on this player registered on the given trigger.
+	def getLast(self):
+		"""Gets the last card held, without taking it.
+
+		Returns:
+				Integer: the card number, or None if there are no cards.
+		"""
+		return self.cardAt[self.end - 1] if self.slotOf else None
+
+	def addLast(self, cardNum):
+		"""Adds a card after the last one.
 
 		Args:
-				trigger (TriggerType): the type of trigger resolving
-				kwargs (kwargs): a list of keyword arguments necessary to pop the effects, such as number of shadows used in Necromancy
+				cardNum (Integer): the number of the card
+
+		Returns:
+				Integer: the slot it takes.
 		"""
-		if ACTIVE_DEBUG_STATES[DEBUG_STATES.effects]: print("Self resolving {0}.".format(trigger.name))
-		if ACTIVE_DEBUG_STATES[DEBUG_STATES.kwargs]: print(kwargs)
-		for triggerEffects in self.effects:
-			for effect in triggerEffects:
-				effect.refill(trigger)
-		for effect in self.effects[trigger]:
-			effect.resolve(**kwargs)
+		slot = self.end
+		self.end += 1
+		self.cardAt[slot] = cardNum
+		self.slotOf[cardNum] = slot
+		return slot
 
-	def resolveAllCards(self, trigger, **kwargs):
-		"""Resolves effects on all cards in this player's hand, deck and field using a given trigger.
+	def addFirst(self, cardNum):
+		"""Adds a card before the first one.
 
 		Args:
-				trigger (TriggerType): the type of trigger resolving
-				kwargs (kwargs): a list of keyword arguments necessary to pop the effects, such as number of shadows used in Necromancy
+				cardNum (Integer): the number of the card
+
+		Returns:
+				Integer: the slot it takes.
 		"""
-		if ACTIVE_DEBUG_STATES[DEBUG_STATES.kwargs]: print(kwargs)
-		for card in self.hand.getCards():
-			card.refill(trigger)
-			card.resolve(trigger, **kwargs)
-		for card in self.board.getCards():
-			card.refill(trigger)
-			card.resolve(trigger, **kwargs)
-		for card in self.deck.getCards():
-			card.refill(trigger)
-			card.resolve(trigger, **kwargs)
+		self.first -= 1
+		slot = self.first
+		self.cardAt[slot] = cardNum
+		self.slotOf[cardNum] = slot
+		return slot
 
-	def resolveAll(self, trigger, **kwargs):
-		"""Resolves effects on all cards in this player's hand, deck and field, and themselves using a given trigger.
+	def remove(self, cardNum):
+		"""Removes a card, trimming emptied slots off both ends so the first and last slots always hold a card.
 
 		Args:
-				trigger (TriggerType): the type of trigger resolving
-				kwargs (kwargs): a list of keyword arguments necessary to pop the effects, such as number of shadows used in Necromancy
+				cardNum (Integer): the number of the card
+
+		Returns:
+				Integer: the slot it sat in.
 		"""
-		if ACTIVE_DEBUG_STATES[DEBUG_STATES.effects]: print("Resolving trigger {0}".format(trigger.name))
-		if ACTIVE_DEBUG_STATES[DEBUG_STATES.kwargs]: print(kwargs)
-		self.resolveSelf(trigger, **kwargs)
-		self.resolveAllCards(trigger, **kwargs)
+		slot = self.slotOf.pop(cardNum)
+		cardAt = self.cardAt
+		del cardAt[slot]
+		if not cardAt:
+			self.first = self.end = 0
+			return slot
+		while self.end - 1 not in cardAt:
+			self.end -= 1
+		while self.first not in cardAt:
+			self.first += 1
+		return slot
 
-	def resolve(self, cards, trigger, **kwargs):
-		"""Resolves effects on all cards in the given list using a given trigger.
+class Deck:
+	"""A Deck object storing the cards of a player's deck, bottom to top. The deck holds the numbers of its cards rather than the cards themselves; most cards are only built when they're drawn, tutored, invoked or played from the deck, since a game rarely gets through the whole deck. Cards with Invocation are built right away, so they can watch for their conditions from the deck. Card numbers are kept in CardSlots, so drawing, adding to the bottom, removing and finding a card don't depend on the size of the deck.
+	"""
+
+	def __init__(self, cards, owner):
+		"""The initializing method. Reserves a card number for each card name given, building only the cards with Invocation, and shuffles them.
 
 		Args:
-				cards (List(Card)): the cards to be tested for effect resolution
-				trigger (TriggerType): the type of trigger resolving
-				kwargs (kwargs): a list of keyword arguments necessary to pop the effects, such as number of shadows used in Necromancy
+				cards (List(String)): a list of card names in the deck
+				owner (Player): the owner of this deck
 		"""
-		if ACTIVE_DEBUG_STATES[DEBUG_STATES.kwargs]: print(kwargs)
+		self.owner = owner
+		cardNums = []
+		logic = owner.context.logic
+		if owner.context.trace.expandedInfo: tracer.emit(TRACE_CATEGORIES.expandedInfo, "deckBuilding", owner, player=owner.name, cards=list(cards))
 		for card in cards:
-			card.refill(trigger)
-			card.resolve(trigger, **kwargs)
+			if cardDefinitions[card].hasInvocation:
+				builtCard = owner.context.cardbuilder.buildCard(card, owner, CARD_STATES.inDeck)
+				logic.moveCard(builtCard, CARD_ZONES.deck)
+				cardNums.append(builtCard.cardNum)
+			else :
+				cardNums.append(logic.reserveCard(owner, card, CARD_ZONES.deck))
+		if owner.context.trace.expandedInfo: tracer.emit(TRACE_CATEGORIES.expandedInfo, "deckBuilt", owner, player=owner.name)
+		owner.context.rng.shuffle(cardNums)
+		self.slots = CardSlots(cardNums)
+		hashCardSlots(owner, "deck", self.slots)
 
 
-	def startTurn(self):
-		"""Starts this player's turn and prints out their side of the field.
+	def clone(self, memo):
+		"""Clones this deck for a cloned game. Only the card numbers are copied; the cards already built are cloned with the Logic.
+
+		Args:
+				memo (Dictionary): the clones made so far, keyed by the id of their original
+
+		Returns:
+				Deck: the clone
 		"""
-		if ACTIVE_DEBUG_STATES[DEBUG_STATES.basics]: print("----------------------------NEW TURN---------------------------------")
-		if ACTIVE_DEBUG_STATES[DEBUG_STATES.basics]: print("{0}'s turn has started.".format(self.name))
-		self.draw()
-		self.gainTotalEnergy()
-		self.refillEnergy()
-		for card in self.board.cards:
-			if ACTIVE_DEBUG_STATES[DEBUG_STATES.interactions]: print(card)
-			if isinstance(card, MonsterCard):
-				if ACTIVE_DEBUG_STATES[DEBUG_STATES.interactions]: print(card)
-				card.attackState = ATTACK_STATES.storm
-		self.resolveAll(TRIGGER_TYPES.onFriendlyTurnStart)
-		game.chooseActionLoop(self)
+		deck = Deck.__new__(Deck)
+		memo[id(self)] = deck
+		deck.owner = getClone(self.owner, memo)
+		deck.slots = self.slots.clone()
+		return deck
+
+	def __len__(self):
+		"""Gets the number of cards in the deck, without building any.
+
+		Returns:
+				Integer: the number of cards.
+		"""
+		return len(self.slots)
+
+	def __contains__(self, card):
+		"""Checks whether a card is in the deck.
+
+		Args:
+				card (Card): the card
+
+		Returns:
+				Boolean: whether it's in the deck.
+		"""
+		return card.cardNum in self.slots
+
+	def shuffle(self):
+		"""Shuffles this deck uniformly, drawing from the match's random number generator, so the same seed always gives the same order.
+		"""
+		hashCardSlots(self.owner, "deck", self.slots)
+		cardNums = list(self.slots)
+		self.owner.context.rng.shuffle(cardNums)
+		self.slots.reset(cardNums)
+		hashCardSlots(self.owner, "deck", self.slots)
+		bumpVersion(self.owner)
+
+	def draw(self):
+		"""Takes the top card from the deck, building it if it hasn't been yet.
+
+		Returns:
+				Card: the top card
+		"""
+		cardNum = self.slots.getLast()
+		hashSlot(self.owner, "deck", self.slots.remove(cardNum), cardNum)
+		bumpVersion(self.owner)
+		logic = self.owner.context.logic
+		card = logic.getCard(cardNum)
+		logic.leaveZone(card, CARD_ZONES.deck)
+		return card
+
+	def getCards(self):
+		"""Gets the list of cards in the deck, bottom to top. Builds every card in the deck; use getCardNums or len to look through or count the deck without building.
+
+		Returns:
+				List(Card): a list of cards in the deck
+		"""
+		logic = self.owner.context.logic
+		return [logic.getCard(cardNum) for cardNum in self.slots]
+
+	def getCardNums(self):
+		"""Gets the numbers of the cards in the deck, bottom to top, without building any.
+
+		Returns:
+				List(Integer): the card numbers
+		"""
+		return list(self.slots)
+
+	def addCard(self, card):
+		"""Adds a card to the bottom of the deck.
+
+		Args:
+				card (Card): the card to be inserted
+		"""
+		hashSlot(self.owner, "deck", self.slots.addFirst(card.cardNum), card.cardNum)
+		self.owner.context.logic.moveCard(card, CARD_ZONES.deck)
+		bumpVersion(self.owner)
+		card.setState(CARD_STATES.inDeck)
+
+	def removeCard(self, card):
+		"""Removes the given card from the deck list.
+
+		Args:
+				card (Card): the card to be removed
+		"""
+		hashSlot(self.owner, "deck", self.slots.remove(card.cardNum), card.cardNum)
+		logic = self.owner.context.logic
+		logic.leaveZone(card, CARD_ZONES.deck)
+		bumpVersion(self.owner)
+
+	def removeCardAt(self, index):
+		"""Removes the card from the deck list at the given index, counted from the bottom.
+
+		Args:
+				index (Integer): index location of the card ot be removed
+		"""
+		self.removeCard(self.owner.context.logic.getCard(self.getCardNums()[index]))
+
+class Hand:
+	"""A Hand object holding the cards in a given player's hand, in the order they were added. Cards are kept in CardSlots by number, so adding, removing and finding a card don't depend on the size of the hand.
+	"""
+
+	def __init__(self, owner):
+		"""Initializing method. Creates an empty hand and sets the owner.
+
+		Args:
+				owner (Player): the owner of this hand
+		"""
+		self.slots = CardSlots()
+		self.owner = owner
+
+	def clone(self, memo):
+		"""Clones this hand for a cloned game. Only the card numbers are copied; the cards are cloned with the Logic.
+
+		Args:
+				memo (Dictionary): the clones made so far, keyed by the id of their original
+
+		Returns:
+				Hand: the clone
+		"""
+		hand = Hand.__new__(Hand)
+		memo[id(self)] = hand
+		hand.owner = getClone(self.owner, memo)
+		hand.slots = self.slots.clone()
+		return hand
+
+	def __str__(self):
+		"""A stringing method to output the hand to the console.
+
+		Returns:
+				String: a string of cards in the hand
+		"""
+		return "Hand: " + " | ".join([str(card) for card in self.getCards()])
 
-	def attackEnemy(self, card):
-		"""This player attacks the opposing player with a given card.
+	def __len__(self):
+		"""Gets the number of cards in the hand.
 
-		Args:
-				card (MonsterCard): the attacking card.
+		Returns:
+				Integer: the number of cards.
 		"""
-		card.resolve(TRIGGER_TYPES.onAttacking)
-		card.resolve(TRIGGER_TYPES.onLeaderClashing)
-		enemy = game.getOtherPlayer(self)
-		enemy.takeDamage(card.attack)
-		card.resolve(TRIGGER_TYPES.onDealtDamage)
-		if "Drain" in card.effects:
-			self.gainHealth(card.attack)
-		card.attackState = ATTACK_STATES.attacked
-		if ACTIVE_DEBUG_STATES[DEBUG_STATES.basics]: print("{0} attacks {1} for {2} damage. {3} health remains.".format(card.name, enemy.name, card.attack, enemy.health))
+		return len(self.slots)
 
-	def attackCard(self, card, target):
-		"""This player attacks the given target card with the given card.
+	def __contains__(self, card):
+		"""Checks whether a card is in the hand.
 
 		Args:
-				card (MonsterCard): the attacking card
-				target (MonsterCard): the card being attacked
-		"""
-		card.resolve(TRIGGER_TYPES.onAttacking)
-		card.resolve(TRIGGER_TYPES.onClashing)
-		target.resolve(TRIGGER_TYPES.onClashing)
-		target.takeDamage(card.attack)
-		card.resolve(TRIGGER_TYPES.onDealtDamage)
-		if "Drain" in card.effects:
-			self.gainHealth(card.attack)
-		target.resolve(TRIGGER_TYPES.onTookDamage)
-		if "Bane" in card.effects:
-			target.destroy()
-		card.takeDamage(target.attack)
-		target.resolve(TRIGGER_TYPES.onDealtDamage)
-		card.resolve(TRIGGER_TYPES.onTookDamage)
-		if "Bane" in target.effects:
-			card.destroy()
-		card.attackState = ATTACK_STATES.sickness
+				card (Card): the card
 
-	def endTurn(self):
-		"""Ends this player's turn.
+		Returns:
+				Boolean: whether it's in the hand.
 		"""
-		for card in self.board.getCards():
-			card.triggerPop(TRIGGER_TYPES.onFriendlyTurnEnd)
-		for card in self.hand.getCards():
-			card.triggerPop(TRIGGER_TYPES.onFriendlyTurnEnd)
-		self.invocationsThisTurn = []
-		self.turnsPlayed += 1
-		if ACTIVE_DEBUG_STATES[DEBUG_STATES.basics]: print("{0}'s turn has ended.".format(self.name))
-		game.getOtherPlayer(self).startTurn()
+		return card.cardNum in self.slots
 
-	def die(self):
-		"""This player loses the game.
-		"""
-		print(self.name + " has lost!")
-		game.isPlaying = False
-	
 
-	def registerCard(self, num):
-		"""Registers a card's unique index with this player.
+	def addCard(self, card):
+		"""Try to add a card to this hand. If it puts us over the 9-card hand limit, we discard it instead.
 
 		Args:
-				num (Integer): the unique index of the card
+				card (Card): the card being added
 		"""
-		self.cardNumbers.append(num)
+		if len(self.slots) > 9:
+			if self.owner.context.trace.basics: tracer.emit(TRACE_CATEGORIES.basics, "cardDiscarded", self.owner, player=self.owner.name, card=card.name)
+			card.setState(CARD_STATES.destroyed)
+			self.owner.gainShadows()
+		else :
+			hashSlot(self.owner, "hand", self.slots.addLast(card.cardNum), card.cardNum)
+			self.owner.context.logic.moveCard(card, CARD_ZONES.hand)
+			bumpVersion(self.owner)
+			if self.owner.context.trace.basics: tracer.emit(TRACE_CATEGORIES.basics, "cardDrawn", self.owner, player=self.owner.name, card=card.name)
+			card.onDraw()
 
-	def drawCard(self, card):
-		"""This player draws a given card from their Deck.
+	def removeCard(self, card):
+		"""Remove the given card from the hand without discarding it.
 
 		Args:
-				card (Card): the card to be drawn
+				card (Card): the card to be removed
 		"""
-		self.deck.removeCard(card)
-		self.hand.addCard(card)
+		hashSlot(self.owner, "hand", self.slots.remove(card.cardNum), card.cardNum)
+		self.owner.context.logic.leaveZone(card, CARD_ZONES.hand)
+		bumpVersion(self.owner)
 
-	def draw(self, numCards=1):
-		"""This player draws a given number of cards. Usually 1.
+	def discard(self, card):
+		"""Discards a given card from the hand, gaining a shadow in the process.
 
 		Args:
-				numCards (Integer, optional): the number of cards to draw. Defaults to 1.
+				card (Card): the card to be discarded
 		"""
-		for i in range(numCards):
-			card = self.deck.draw()
-			if (len(self.deck.cards) <= 0):
-				self.die()
-			self.hand.addCard(card)
+		if card in self:
+			if self.owner.context.trace.basics: tracer.emit(TRACE_CATEGORIES.basics, "cardDiscarded", self.owner, player=self.owner.name, card=card.name)
+			self.removeCard(card)
+			card.setState(CARD_STATES.destroyed)
+			self.owner.gainShadows()
+		else :
+			if self.owner.context.trace.errors: tracer.emit(TRACE_CATEGORIES.errors, "cardNotInHand", self.owner, player=self.owner.name, card=card.name)
 
-	def addCards(self, cardNames):
-		"""This player adds cards to their hand without taking them from their deck. In some circumstances, the cards may not even be in their deck.
+	def getCards(self):
+		"""Getter function for the list of cards held in the hand, in the order they were added.
 
-		Args:
-				cardNames (List(String)): a list of card names to be created and added to the hand
+		Returns:
+				List(Card): the list of cards in the hand
 		"""
-		for name in cardNames:
-			card = cardbuilder.buildCard(name, self, CARD_STATES.held)
-			card.registerAllEffects()
-			self.hand.addCard(card)
+		cards = self.owner.context.logic.cards
+		return [cards[cardNum] for cardNum in self.slots]
 
-	def playCard(self, card, costless=False):
-		"""This player plays a given card.
+class Board:
+	"""A Board object holding the cards played by the owner, in the order they were played. Cards are kept in CardSlots by number, so adding, removing and finding a card don't depend on the size of the board.
+	"""
+
+	def __init__(self, owner):
+		"""Initializes the object, creating an empty board for the given owner.
 
 		Args:
-				card (Card): the card to be played
-				costless (Boolean, optional): whether the card doesn't require energy to play. Defaults to False.
+				owner (Player): the owner of the board
 		"""
-		if not costless: 
-			self.spendEnergy(card.cost)
-		if card in self.hand.getCards(): 
-			self.hand.removeCard(card)
-		if card.isOfType("Amulet") or card.isOfType("Monster"):
-			self.board.playCard(card)
-		card.onPlay()
-		if ACTIVE_DEBUG_STATES[DEBUG_STATES.basics]: print("{0} played {1}.".format(self.name, card.name))
+		self.slots = CardSlots()
+		self.owner = owner
 
-	def playFromDeck(self, card):
-		"""This player plays a given card straight from their deck. This is always costless.
+	def clone(self, memo):
+		"""Clones this board for a cloned game. Only the card numbers are copied; the cards are cloned with the Logic.
 
 		Args:
-				card (Card): the card to be played
+				memo (Dictionary): the clones made so far, keyed by the id of their original
+
+		Returns:
+				Board: the clone
 		"""
-		self.deck.removeCard(card)
-		card.registerAllEffects()
-		if card.isOfType("Amulet") or card.isOfType("Monster"):
-			self.board.playCard(card)
-		card.onPlay()
-		if ACTIVE_DEBUG_STATES[DEBUG_STATES.basics]: print("{0} played {1} from deck.".format(self.name, card.name))
+		board = Board.__new__(Board)
+		memo[id(self)] = board
+		board.owner = getClone(self.owner, memo)
+		board.slots = self.slots.clone()
+		return board
 
-	def playAccelerate(self, card, costless=False):
-		"""This player plays a given card's Accelerate ability, playing a MonsterCard as a SpellCard. Some Monsters have Accelerate abilities allowing them to be played as Spells at reduced cost.
+	def __str__(self):
+		"""A stringing method for the board and the cards on it.
 
-		Args:
-				card (Card): the card to be accelerated
-				costless (Boolean, optional): whether the card doesn't require energy to play. Defaults to False.
+		Returns:
+				String: a string of the cards on the board.
 		"""
-		if not costless:
-			self.spendEnergy(card.accelerate["Cost"])
-		self.hand.discard(card)
-		card.onAccelerate()
-		if ACTIVE_DEBUG_STATES[DEBUG_STATES.basics]: print("{0} played {1} accelerated.".format(self.name, card.name))
+		return "Board: " + " | ".join([str(card) for card in self.getCards()])
 
-	def playCardNames(self, cards):
-		"""This player plays a given list of cards, constructing them from their names.
+	def __len__(self):
+		"""Gets the number of cards on the board.
+
+		Returns:
+				Integer: the number of cards.
+		"""
+		return len(self.slots)
+
+	def __contains__(self, card):
+		"""Checks whether a card is on the board.
 
 		Args:
-				cards (List(String)): list of card names
+				card (Card): the card
+
+		Returns:
+				Boolean: whether it's on the board.
 		"""
-		for card in cards:
-			builtCard = cardbuilder.buildCard(card, self, CARD_STATES.played)
-			builtCard.registerAllEffects()
-			self.board.playCard(builtCard)
+		return card.cardNum in self.slots
 
 
-	def burialRite(self, card):
-		"""Burial Rites the given card, stripping its effects and playing it, then destroying it. Some cards allow for Burial Rites, which discards a card but lets it effectlessly hit the board first.
+	def playCard(self, card):
+		"""Plays a given card onto this board.
 
 		Args:
-				card (Card): the card to be Burial Rited
+				card (Card): the card to be played
 		"""
-		if not self.board.hasSpace(): 
+		if len(self.slots) == 5:
+			if self.owner.context.trace.errors: tracer.emit(TRACE_CATEGORIES.errors, "boardFull", self.owner, player=self.owner.name, card=card.name)
 			return
-		card.effects = [[] for i in TRIGGER_TYPES]
-		card.abilities = []
-		self.playCard(card, True)
-		card.destroy()
+		hashSlot(self.owner, "board", self.slots.addLast(card.cardNum), card.cardNum)
+		self.owner.context.logic.moveCard(card, CARD_ZONES.board)
+		bumpVersion(self.owner)
 
-	def tutor(self, **kwargs):
-		"""This player takes a card from their deck matching the keyword arguments given.
+	def getCards(self):
+		"""Getter function for the list of cards on the board, in the order they were played.
 
-		Args:
-				kwargs (keywords): the criteria from which the available cards are picked.
+		Returns:
+				List(Cards): the list of cards on the board
 		"""
-		if ACTIVE_DEBUG_STATES[DEBUG_STATES.effects]: print("Tutoring:")
-		if ACTIVE_DEBUG_STATES[DEBUG_STATES.effects]: print(kwargs)
-		potentials = []
-		for card in self.deck.getCards():
-			if ACTIVE_DEBUG_STATES[DEBUG_STATES.effects]: print(card.name)
-			if "type" in kwargs and not card.isOfType(kwargs["type"]):
-				if ACTIVE_DEBUG_STATES[DEBUG_STATES.effects]: print("Type {0} doesn't fit our type, {1}.".format(card.cardObj["Type"], kwargs["type"]))
-				continue
-			if "craft" in kwargs and card.cardObj["Craft"] != kwargs["craft"]:
-				if ACTIVE_DEBUG_STATES[DEBUG_STATES.effects]: print("Craft {0} doesn't fit our craft, {1}.".format(card.cardObj["Craft"], kwargs["craft"]))
-				continue
-			potentials.append(card)
-		if ACTIVE_DEBUG_STATES[DEBUG_STATES.effects]: print(", ".join([card.name]))
-
-		if len(potentials) == 0:
-			if ACTIVE_DEBUG_STATES[DEBUG_STATES.effects]: print("No cards meeting our criteria.")
-			return
-		random.shuffle(potentials)
-		self.drawCard(potentials[0])
+		cards = self.owner.context.logic.cards
+		return [cards[cardNum] for cardNum in self.slots]
 
-	def necromancy(self, necroCost, shadows):
-		"""This player performs Necromancy at the given cost, spending the given number of shadows. Necromancy resurrects a random destroyed MonsterCard with base cost equal to the given cost. If no destroyed MonsterCards are available at that cost, a MonsterCard of close lower value is resurrected instead.
+	def removeCard(self, card):
+		"""Removes a given card on the board.
 
 		Args:
-				shadows ([type]): [description]
+				card (Card): the card to be removed
 		"""
-		self.shadows -= shadows
-		# TODO
-		self.resolveAll(TRIGGER_TYPES.onFriendlyNecromancy, shadows=shadows)
+		hashSlot(self.owner, "board", self.slots.remove(card.cardNum), card.cardNum)
+		self.owner.context.logic.leaveZone(card, CARD_ZONES.board)
+		bumpVersion(self.owner)
 
-	def invokeCard(self, card):
-		"""Invokes a given card, playing it straight from the deck. Some cards have Invocation, which means when specific requirements are met, they are played from the player's deck.
+	def hasSpace(self):
+		"""Checks whether there's space for another card to be on the board. Cap is 5.
 
-		Args:
-				card (Card): the card to be invoked
+		Returns:
+				Boolean: whether there's space left on the board or not
 		"""
-		if self.board.hasSpace() and card.name not in self.invocationsThisTurn and card in self.deck.getCards():
-			self.playFromDeck(card)
-			self.invocationsThisTurn.append(card.name)
+		return len(self.slots) < 5
 
+class Graveyard:
+	"""A Graveyard object holding a player's destroyed cards, in the order they were destroyed. Cards are also indexed by type and base cost: each type keeps a bucket of cards per cost and a sorted list of the costs with cards, so finding the highest cost up to a limit is a binary search rather than a scan of every card destroyed.
+	"""
 
-	def evolveMonster(self, card):
-		"""Evolves a card. Monsters can be Evolved from a pool of 2 points, 3 for the second player. Evolving flips their face, granting them extra abilities and improved stats--usually +2/+2. Players can evolve on their 4th turn, but only once per turn.
+	def __init__(self, owner):
+		"""Initializes an empty graveyard for the given owner.
 
 		Args:
-				card (MonsterCard): the card to be evolved
+				owner (Player): the owner of the graveyard
 		"""
-		card.onEvolve()
-		if ACTIVE_DEBUG_STATES[DEBUG_STATES.basics]: print("{0} evolves {1}!".format(self.name, card.name))
-
+		self.slots = CardSlots()
+		self.buckets = {cardType: {} for cardType in CARD_TYPES}
+		self.costs = {cardType: [] for cardType in CARD_TYPES}
+		self.owner = owner
 
-	def takeDamage(self, amount):
-		"""This player takes a given amount of damage. If they end up below or at 0, they lose.
+	def clone(self, memo):
+		"""Clones this graveyard for a cloned game. Only the card numbers are copied; the cards are cloned with the Logic.
 
 		Args:
-				amount (Integer): the amount of health lost
+				memo (Dictionary): the clones made so far, keyed by the id of their original
+
+		Returns:
+				Graveyard: the clone
 		"""
-		self.health -= amount
-		if self.health <= 0:
-			self.die()
+		graveyard = Graveyard.__new__(Graveyard)
+		memo[id(self)] = graveyard
+		graveyard.owner = getClone(self.owner, memo)
+		graveyard.slots = self.slots.clone()
+		graveyard.buckets = {cardType: {cost: list(cardNums) for cost, cardNums in buckets.items()} for cardType, buckets in self.buckets.items()}
+		graveyard.costs = {cardType: list(costs) for cardType, costs in self.costs.items()}
+		return graveyard
 
-	def gainHealth(self, amount):
-		"""This player gains a given amount of health. Usually the cap is 20, and the excess is lost.
+	def __len__(self):
+		"""Gets the number of cards in the graveyard.
 
-		Args:
-				amount (Integer): the amount of health gained
+		Returns:
+				Integer: the number of cards.
 		"""
-		self.health += amount
-		if self.health > self.maxHealth:
-			self.health = self.maxHealth
+		return len(self.slots)
 
-	def refillEnergy(self):
-		"""This player refills their energy to their current max.
+	def __contains__(self, card):
+		"""Checks whether a card is in the graveyard.
+
+		Args:
+				card (Card): the card
+
+		Returns:
+				Boolean: whether it's in the graveyard.
 		"""
-		self.energy = self.totalEnergy
+		return card.cardNum in self.slots
 
-	def gainTotalEnergy(self, amount=1):
-		"""This player increases their total energy by the given amount, usually 1. The cap is 10.
+	def addCard(self, card):
+		"""Indexes a card entering the graveyard by its type and base cost. Called by Logic.moveCard, which tracks the zone every card is in, so a card is indexed however it's destroyed.
 
 		Args:
-				amount (Integer, optional): the amount of energy the cap is increased by. Defaults to 1.
+				card (Card): the card
 		"""
-		self.totalEnergy += amount
-		if self.totalEnergy > 10:
-			self.totalEnergy = 10
-		if ACTIVE_DEBUG_STATES[DEBUG_STATES.resources]: print("Gaining {0} total energy. New amount: {1}.".format(amount, self.totalEnergy))
+		self.slots.addLast(card.cardNum)
+		definition = card.definition
+		bucket = self.buckets[definition.type].get(definition.cost)
+		if bucket is None:
+			bucket = self.buckets[definition.type][definition.cost] = []
+			bisect.insort(self.costs[definition.type], definition.cost)
+		bucket.append(card.cardNum)
 
-	def gainEnergy(self, amount=1):
-		"""This player increases their current energy by the given amount, usually 1. The cap is their total energy amount.
+	def removeCard(self, card):
+		"""Unindexes a card leaving the graveyard, such as a destroyed card being banished, dropping its cost from the index once no card of that type and cost is left. Called by Logic.moveCard.
 
 		Args:
-				amount (Integer, optional): the amount of energy their current energy is increased by. Defaults to 1.
+				card (Card): the card
 		"""
-		self.energy += amount
-		if self.energy > self.totalEnergy:
-			self.energy = self.totalEnergy
-		if ACTIVE_DEBUG_STATES[DEBUG_STATES.resources]: print("Gaining {0} energy. New amount: {1}.".format(amount, self.energy))
+		self.slots.remove(card.cardNum)
+		definition = card.definition
+		buckets = self.buckets[definition.type]
+		bucket = buckets[definition.cost]
+		bucket.remove(card.cardNum)
+		if not bucket:
+			del buckets[definition.cost]
+			costs = self.costs[definition.type]
+			del costs[bisect.bisect_left(costs, definition.cost)]
 
-	def spendEnergy(self, amount):
-		"""This player spends a given amount of energy.
+	def getCards(self):
+		"""Getter function for the list of cards in the graveyard, in the order they were destroyed.
+
+		Returns:
+				List(Card): the list of cards in the graveyard
+		"""
+		cards = self.owner.context.logic.cards
+		return [cards[cardNum] for cardNum in self.slots]
+
+	def getHighestCost(self, cardType, maxCost):
+		"""Gets the highest base cost of the cards of a type in the graveyard, up to a limit.
 
 		Args:
-				amount (Integer): the amount of energy spent
+				cardType (CARD_TYPES): the type of card
+				maxCost (Integer): the highest cost allowed
+
+		Returns:
+				Integer: the cost, or None if there's no card of that type at or below it.
 		"""
-		self.energy -= amount
+		costs = self.costs[cardType]
+		index = bisect.bisect_right(costs, maxCost)
+		return costs[index - 1] if index > 0 else None
 
-	def gainShadows(self, amount=1):
-		"""This player gains a given number of Shadows. Usually 1. Shadows are a resource loosely tied to graveyard count. Discarded and destroyed cards add 1 to the owner's Shadows.
+	def getCardNumsOfCost(self, cardType, cost):
+		"""Gets the numbers of the cards of a type and base cost in the graveyard, in the order they were destroyed.
 
 		Args:
-				amount (Integer, optional): the amount of shadows to add. Defaults to 1.
+				cardType (CARD_TYPES): the type of card
+				cost (Integer): the base cost
+
+		Returns:
+				List(Integer): the card numbers.
 		"""
-		if ACTIVE_DEBUG_STATES[DEBUG_STATES.resources]: print("Gained {0} shadows.".format(amount))
-		self.shadows += amount
+		return list(self.buckets[cardType].get(cost, ()))
 
-class Deck:
-	"""A Deck object storing a list of cards, belonging to a player.
+# AGENTS
+class Agent:
+	"""Base class for the policies driving a Player. At each decision point the engine hands the agent the legal options and carries out whatever it picks.
 	"""
 
-	def __init__(self, cards, owner):
-		"""The initializing method. Creates an empty card list and populates it, building Card objects from a list of card name strings.
+	def chooseAction(self, game, player, actions):
+		"""Picks the next action for the player.
 
 		Args:
-				cards (List(String)): a list of card names in the deck
-				owner (Player): the owner of this deck
-		"""
-		self.owner = owner
-		self.cards = []
-		print(cards)
-		for card in cards:
-			self.cards.append(cardbuilder.buildCard(card, owner, CARD_STATES.inDeck))
-		print("Finished populating deck.")
-		random.shuffle(self.cards)
-
+				game (Gameplay): the game being played
+				player (Player): the player acting
+				actions (List(Action)): the legal actions, as given by Logic.getLegalActions
 
-	def shuffle(self):
-		"""Shuffles this deck.
+		Returns:
+				Action: one of the given actions
 		"""
-		random.shuffle(self.cards)
+		raise NotImplementedError
 
-	def draw(self):
-		"""Takes the top card from the card list.
+	def chooseTargets(self, game, player, targets, numTargets):
+		"""Picks a number of targets from the available ones.
+
+		Args:
+				game (Gameplay): the game being played
+				player (Player): the player choosing
+				targets (List(Player or Card)): the valid targets
+				numTargets (Integer): the number of targets to pick
 
 		Returns:
-				Card: the top card
+				List(Player or Card): the targets picked
 		"""
-		return self.cards.pop()
+		raise NotImplementedError
 
-	def getCards(self):
-		"""Gets the list of cards in the deck.
+	def chooseMulligan(self, game, player, cards):
+		"""Picks the cards in the opening hand to redraw. Keeps the whole hand by default.
+
+		Args:
+				game (Gameplay): the game being played
+				player (Player): the player mulliganing
+				cards (List(Card)): the opening hand
 
 		Returns:
-				List(Card): a list of cards in the deck
+				List(Card): the cards to redraw
 		"""
-		return self.cards
+		return []
 
-	def addCard(self, card):
-		"""Adds a card to the bottom of the deck.
+class ConsoleAgent(Agent):
+	"""An agent asking a human at the terminal for every choice.
+	"""
+
+	def chooseAction(self, game, player, actions):
+		"""Prints the board and asks for a card to use, 'evo' or 'end' until a legal action is picked.
 
 		Args:
-				card (Card): the card to be inserted
+				game (Gameplay): the game being played
+				player (Player): the player acting
+				actions (List(Action)): the legal actions
+
+		Returns:
+				Action: the action picked
 		"""
-		self.cards.insert(0, card)
+		while True:
+			enemy = game.getOtherPlayer(player)
+			if player.context.trace.basics: tracer.emit(TRACE_CATEGORIES.basics, "consoleState", player, enemy=str(enemy), enemyBoard=str(enemy.board), board=str(player.board), hand=str(player.hand), player=str(player))
+
+			handCards = player.hand.getCards()
+			boardCards = player.board.getCards()
+			evolves = [action for action in actions if action.actionType is ACTION_TYPES.evolve]
+
+			out = "Type the number of the card you wish to use. {0} cards on board".format(len(boardCards))
+			if len(boardCards) > 0:
+				out += ", starting with 1"
+			out += ". {0} cards in hand".format(len(handCards))
+			if len(handCards) > 0:
+				out += ", starting with {0}.".format(len(boardCards) + 1)
+			if len(evolves) > 0:
+				out += " Or type 'evo' to evolve a monster."
+			out += " Or type 'end' to end your turn."
+			choice = input(out)
 
-	def removeCard(self, card):
-		"""Removes the given card from the deck list.
+			if choice == "end":
+				return actions[-1]
+			elif choice == "evo":
+				if len(evolves) == 0:
+					continue
+				card = self.chooseTargets(game, player, [action.card for action in evolves], 1)[0]
+				return [action for action in evolves if action.card is card][0]
+			elif not choice.isdigit() or not 1 <= int(choice) <= len(boardCards) + len(handCards):
+				continue
+			elif int(choice) <= len(boardCards):
+				card = boardCards[int(choice) - 1]
+				attacks = [action for action in actions if action.card is card and action.target]
+				if len(attacks) == 0:
+					if player.context.trace.basics: tracer.emit(TRACE_CATEGORIES.basics, "consoleRefused", player, card=card.name, reason="attack")
+					continue
+				target = self.chooseTargets(game, player, [action.target for action in attacks], 1)[0]
+				return [action for action in attacks if action.target is target][0]
+			else :
+				card = handCards[int(choice) - len(boardCards) - 1]
+				plays = [action for action in actions if action.card is card]
+				if len(plays) == 0:
+					if player.context.trace.basics: tracer.emit(TRACE_CATEGORIES.basics, "consoleRefused", player, card=card.name, reason="play")
+					continue
+				if not plays[0].target:
+					return plays[0]
+				target = self.chooseTargets(game, player, [action.target for action in plays], 1)[0]
+				return [action for action in plays if action.target is target][0]
+
+	def chooseTargets(self, game, player, targets, numTargets):
+		"""Asks for targets one at a time until enough are picked.
 
 		Args:
-				card (Card): the card to be removed
+				game (Gameplay): the game being played
+				player (Player): the player choosing
+				targets (List(Player or Card)): the valid targets
+				numTargets (Integer): the number of targets to pick
+
+		Returns:
+				List(Player or Card): the targets picked
 		"""
-		self.cards.remove(card)
+		targetChoices = []
+		while len(targetChoices) < numTargets:
+			if player.context.trace.playerInput: tracer.emit(TRACE_CATEGORIES.playerInput, "targetPrompt", player, remaining=numTargets - len(targetChoices))
+			options = [target for target in targets if target not in targetChoices]
+			output = [str(option) for option in options]
+			choice = input(" ".join(output))
+			if not choice.isdigit() or not 1 <= int(choice) <= len(options):
+				continue
+			targetChoices.append(options[int(choice) - 1])
+		return targetChoices
 
-	def removeCardAt(self, index):
-		"""Removes the card from the deck list at the given index.
+	def chooseMulligan(self, game, player, cards):
+		"""Asks which of the opening hand to redraw, toggling cards by number until 'q' is typed.
 
 		Args:
-				index (Integer): index location of the card ot be removed
+				game (Gameplay): the game being played
+				player (Player): the player mulliganing
+				cards (List(Card)): the opening hand
+
+		Returns:
+				List(Card): the cards to redraw
 		"""
-		del self.cards[index]
+		if player.context.trace.playerInput: tracer.emit(TRACE_CATEGORIES.playerInput, "mulliganPrompt", player, count=len(cards))
 
-class Hand:
-	"""A Hand object holding a list of cards in a given player's hand.
+		redrawing = [False for card in cards]
+		while(True): 
+			if player.context.trace.basics: tracer.emit(TRACE_CATEGORIES.basics, "mulliganState", player, redrawing=", ".join([str(redraw) for redraw in redrawing]))
+			typed = input("Select a card to redraw:")
+			if typed == "q":
+				break
+			if typed.isdigit() and 1 <= int(typed) <= len(cards):
+				redrawing[int(typed) - 1] = not redrawing[int(typed) - 1]
+		return [card for card, redraw in zip(cards, redrawing) if redraw]
+
+class RandomAgent(Agent):
+	"""An agent picking uniformly at random among its options. Never prints anything.
 	"""
 
-	def __init__(self, owner):
-		"""Initializing method. Creates an empty list of cards and sets the owner.
+	def __init__(self, rng=None):
+		"""Initializing function.
 
 		Args:
-				owner (Player): the owner of this hand
+				rng (random.Random, optional): the random number generator to draw from. Defaults to a new, unseeded one.
 		"""
-		self.cards = []
-		self.owner = owner
+		self.rng = rng if rng else random.Random()
 
-	def __str__(self):
-		"""A stringing method to output the hand to the console.
+	def chooseAction(self, game, player, actions):
+		"""Picks a random legal action.
+
+		Args:
+				game (Gameplay): the game being played
+				player (Player): the player acting
+				actions (List(Action)): the legal actions
 
 		Returns:
-				String: a string of cards in the hand
+				Action: the action picked
 		"""
-		return "Hand: " + " | ".join([str(card) for card in self.cards])
+		return self.rng.choice(actions)
 
-
-	def addCard(self, card):
-		"""Try to add a card to this hand. If it puts us over the 9-card hand limit, we discard it instead.
+	def chooseTargets(self, game, player, targets, numTargets):
+		"""Picks random targets.
 
 		Args:
-				card (Card): the card being added
-		"""
-		if len(self.cards) > 9:
-			if ACTIVE_DEBUG_STATES[DEBUG_STATES.basics]: print("{0} discarded.".format(card.name))
-			self.owner.gainShadows()
-		else :
-			self.cards.append(card)
-			if ACTIVE_DEBUG_STATES[DEBUG_STATES.basics]: print("Drew {0}.".format(card.name))
-			card.onDraw()
-
-	def removeCard(self, card):
-		"""Remove the given card from the hand without discarding it.
+				game (Gameplay): the game being played
+				player (Player): the player choosing
+				targets (List(Player or Card)): the valid targets
+				numTargets (Integer): the number of targets to pick
 
-		Args:
-				card (Card): the card to be removed
+		Returns:
+				List(Player or Card): the targets picked
 		"""
-		self.cards.remove(card)
+		return self.rng.sample(targets, numTargets)
 
-	def discard(self, card):
-		"""Discards a given card from the hand, gaining a shadow in the process.
+	def chooseMulligan(self, game, player, cards):
+		"""Redraws each card of the opening hand with even odds.
 
 		Args:
-				card (Card): the card to be discarded
-		"""
-		if card in self.cards:
-			if ACTIVE_DEBUG_STATES[DEBUG_STATES.basics]: print("{0} discarded.".format(card.name))
-			self.cards.remove(card)
-			self.owner.gainShadows()
-		else :
-			if ACTIVE_DEBUG_STATES[DEBUG_STATES.errors]: print("{0} isn't in the hand!".format(card.name))
-
-	def getCards(self):
-		"""Getter function for the list of cards held in the hand.
+				game (Gameplay): the game being played
+				player (Player): the player mulliganing
+				cards (List(Card)): the opening hand
 
 		Returns:
-				List(Card): the list of cards in the hand
+				List(Card): the cards to redraw
 		"""
-		return self.cards
+		return [card for card in cards if self.rng.random() < 0.5]
 
-class Board:
-	"""A Board object holding a list of cards played by the owner.
+class ScriptedAgent(Agent):
+	"""An agent following a fixed script of choices. Each decision consumes the next entry: an index into the legal actions, an index into the valid targets for each target picked, or a list of indices into the opening hand for a mulligan. Once the script runs out, it defers to a fallback agent, or ends its turns and picks the first targets if it has none.
 	"""
 
-	def __init__(self, owner):
-		"""Initializes the object, creating an empty list of cards for the given owner.
+	def __init__(self, script, fallback=None):
+		"""Initializing function.
 
 		Args:
-				owner (Player): the owner of the board
+				script (List(Integer or List(Integer))): the choices to make, in order
+				fallback (Agent, optional): the agent making choices once the script runs out. Defaults to None.
 		"""
-		self.cards = []
-		self.owner = owner
+		self.script = list(script)
+		self.position = 0
+		self.fallback = fallback
 
-	def __str__(self):
-		"""A stringing method for the board and the cards on it.
+	def nextChoice(self):
+		"""Takes the next entry from the script.
 
 		Returns:
-				String: a string of the cards on the board.
+				Integer or List(Integer): the entry, or None if the script has run out
 		"""
-		return "Board: " + " | ".join([str(card) for card in self.cards])
+		if self.position >= len(self.script):
+			return None
+		self.position += 1
+		return self.script[self.position - 1]
 
-
-	def playCard(self, card):
-		"""Plays a given card onto this board.
+	def chooseAction(self, game, player, actions):
+		"""Picks the scripted action.
 
 		Args:
-				card (Card): the card to be played
-		"""
-		if len(self.cards) == 5:
-			if ACTIVE_DEBUG_STATES[DEBUG_STATES.errors]: print("{0} can't be played. Too many cards on the field!".format(card.name))
-			return
-		self.cards.append(card)
-
-	def getCards(self):
-		"""Getter function for the list of cards on the board.
+				game (Gameplay): the game being played
+				player (Player): the player acting
+				actions (List(Action)): the legal actions
 
 		Returns:
-				List(Cards): the list of cards on the board
+				Action: the action picked
 		"""
-		return self.cards
+		choice = self.nextChoice()
+		if choice is None:
+			if self.fallback:
+				return self.fallback.chooseAction(game, player, actions)
+			return actions[-1]
+		return actions[choice]
 
-	def removeCard(self, card):
-		"""Removes a given card on the board.
+	def chooseTargets(self, game, player, targets, numTargets):
+		"""Picks the scripted targets.
 
 		Args:
-				card (Card): the card to be removed
+				game (Gameplay): the game being played
+				player (Player): the player choosing
+				targets (List(Player or Card)): the valid targets
+				numTargets (Integer): the number of targets to pick
+
+		Returns:
+				List(Player or Card): the targets picked
 		"""
-		self.cards.remove(card)
+		options = list(targets)
+		targetChoices = []
+		while len(targetChoices) < numTargets:
+			choice = self.nextChoice()
+			if choice is None:
+				if self.fallback:
+					return targetChoices + self.fallback.chooseTargets(game, player, options, numTargets - len(targetChoices))
+				return targetChoices + options[:numTargets - len(targetChoices)]
+			targetChoices.append(options.pop(choice))
+		return targetChoices
 
-	def hasSpace(self):
-		"""Checks whether there's space for another card to be on the board. Cap is 5.
+	def chooseMulligan(self, game, player, cards):
+		"""Picks the scripted cards to redraw.
+
+		Args:
+				game (Gameplay): the game being played
+				player (Player): the player mulliganing
+				cards (List(Card)): the opening hand
 
 		Returns:
-				Boolean: whether there's space left on the board or not
+				List(Card): the cards to redraw
 		"""
-		return len(self.cards) < 5
+		choice = self.nextChoice()
+		if choice is None:
+			if self.fallback:
+				return self.fallback.chooseMulligan(game, player, cards)
+			return []
+		return [cards[i] for i in choice]
 
 # CARD CONSTRUCTOR
 class CardBuilder:
-	"""CardBuilder class to build a Card object from a card name, pulling from a JSON library.
+	"""CardBuilder class to build a Card object from a card name, sharing the card's precomputed definition.
 	"""
 
 	def __init__(self):
 		pass
 
-	def buildCard(self, cardName, owner, state):
-		"""Builds a card object given its name, its owner, and the current state it's in.
+	def buildCard(self, cardName, owner, state, cardNum=None):
+		"""Builds a card object given its name, its owner, and the current state it's in. The card's hash as built is kept, and changes to it are hashed from then on.
 
 		Args:
 				cardName (String): the name of the card
 				owner (Player): the owner of the card
 				state (CARD_STATES): the current state of the card
+				cardNum (Integer, optional): the index reserved for the card by Logic.reserveCard. Defaults to None, for a new index.
 
 		Returns:
 				Card: the Card object--MonsterCard, AmuletCard or SpellCard
 		"""
-		cardObj = library[cardName]
+		definition = cardDefinitions[cardName]
 		card = None
-		if cardObj["Type"] == "Monster":
-			card = MonsterCard(owner, state, cardObj)
-		elif cardObj["Type"] == "Spell":
-			card = SpellCard(owner, state, cardObj)
-		elif cardObj["Type"] == "Amulet":
-			card = AmuletCard(owner, state, cardObj)
+		if definition.type is CARD_TYPES.monster:
+			card = MonsterCard(owner, state, definition, cardNum)
+		elif definition.type is CARD_TYPES.spell:
+			card = SpellCard(owner, state, definition, cardNum)
+		elif definition.type is CARD_TYPES.amulet:
+			card = AmuletCard(owner, state, definition, cardNum)
 
 		card.registerGameStartEffects()
+		setFields(card, builtHash=getCardHash(card))
 
 		return card
 
 # CARD LITERALS
 class Card:
-	"""Card object base for several extensions: Monster, Spell and Amulet
+	"""Card object base for several extensions: Monster, Spell and Amulet. Effects are stored sparsely, keyed by the triggers actually used.
 	"""
+	__slots__ = ("definition", "baseFace", "activeFace", "effects", "refills", "allEffectsRegistered", "owner", "context", "state", "cardNum", "builtHash")
 
-	def __init__(self, name, cost, base, owner, state, cardObj):
+	def __init__(self, definition, base, owner, state, cardNum=None):
 		"""Initializes the Card object, setting its basic values. Registers and generates a unique index for the card.
 
 		Args:
-				name (String): the name of the card
-				cost (Int): the cost of the card
+				definition (CardDefinition): the shared definition of the card
 				base (CardFace): the effect, ability and resource holder for this card
 				owner (Player): the owner of the card
 				state (CARD_STATES): the state of the card
-				cardObj (Object): the unedited object of this card
+				cardNum (Integer, optional): the index reserved for the card. Defaults to None, for a new index.
 		"""
-		self.name = name
-		self.cost = cost
+		self.builtHash = None
+		self.definition = definition
 		self.baseFace = base
 		self.activeFace = self.baseFace
-		self.effects = [[] for i in TRIGGER_TYPES]
+		self.effects = {}
+		self.refills = {}
+		self.allEffectsRegistered = False
 		self.owner = owner
+		self.context = owner.context
+		self.cardNum = self.context.logic.registerCard(owner, self, cardNum)
 		self.state = state
-		self.cardObj = cardObj
-		self.cardNum = logic.registerCard(owner, self)
-		self.trait = cardObj.setdefault("Trait", None)
-		self.type = None
 
 	def __eq__(self, other):
 		"""An comparative function to compare Cards. Compares only the objects they are and the unique card numbers they hold.
@@ -1252,16 +3483,87 @@ class Card:
 			return False
 		return self.cardNum == other.cardNum
 
+	def __setattr__(self, name, value):
+		"""Sets a field, bumping the state version of the match and updating its hash once the card has been built.
+
+		Args:
+				name (String): the name of the field
+				value (Any): its value
+		"""
+		context = getattr(self, "context", None)
+		if context is None or not context.isTracking:
+			object.__setattr__(self, name, value)
+			return
+		if name in CARD_HASHED_FIELDS and getattr(self, "builtHash", None) is not None:
+			hashField(self, ("card", self.cardNum), name, value)
+		object.__setattr__(self, name, value)
+		context.version += 1
+
+	def clone(self, memo):
+		"""Clones this card for a cloned game, along with its faces and effects. The definition is shared.
+
+		Args:
+				memo (Dictionary): the clones made so far, keyed by the id of their original
+
+		Returns:
+				Card: the clone
+		"""
+		card = object.__new__(type(self))
+		memo[id(self)] = card
+		setFields(card,
+			definition=self.definition,
+			owner=getClone(self.owner, memo),
+			context=getClone(self.context, memo),
+			state=self.state,
+			cardNum=self.cardNum,
+			builtHash=self.builtHash,
+			allEffectsRegistered=self.allEffectsRegistered,
+			baseFace=getClone(self.baseFace, memo),
+			activeFace=getClone(self.activeFace, memo),
+			effects=cloneEffectStore(self.effects, memo),
+			refills=cloneEffectStore(self.refills, memo)
+		)
+		return card
+
+	@property
+	def name(self):
+		"""The name of the card, from its definition."""
+		return self.definition.name
+
+	@property
+	def cost(self):
+		"""The cost of the card, from its definition."""
+		return self.definition.cost
+
+	@property
+	def craft(self):
+		"""The craft of the card, such as "Shadow", from its definition."""
+		return self.definition.craft
+
+	@property
+	def trait(self):
+		"""The trait of the card, such as "Machina", from its definition."""
+		return self.definition.trait
+
+	@property
+	def type(self):
+		"""The CARD_TYPES of the card, from its definition."""
+		return self.definition.type
+
+	@property
+	def enhance(self):
+		"""The Enhance definition of the card, or None if it has none."""
+		return self.definition.enhance
 
 	def getActiveEffects(self):
-		"""Gets a list of active effects on the card.
+		"""Gets the active effects on the card: its own, and those on its active face.
 
 		Returns:
-				List(List(Effect)): a list of list of effects, indexed by TRIGGER_TYPES.
+				Dictionary(TRIGGER_TYPES, List(Effect)): the effects, keyed by the triggers they listen for.
 		"""
-		combinedEffects = [[] for i in TRIGGER_TYPES]
-		for i in range(len(TRIGGER_TYPES)):
-			combinedEffects[i] = self.effects[i] + self.activeFace.effects[i]
+		combinedEffects = {trigger: list(effects) for trigger, effects in self.effects.items()}
+		for trigger, effects in self.activeFace.effects.items():
+			combinedEffects[trigger] = combinedEffects.get(trigger, []) + effects
 		return combinedEffects
 
 	def isOfType(self, typename):
@@ -1270,14 +3572,8 @@ class Card:
 		Args:
 				typename (String or CARD_TYPES): a string like "Monster" or a CARD_TYPES enum like .amulet
 		"""
-		if not self.type:
-			return False
-		elif self.type is CARD_TYPES.monster:
-			return typename is self.type or typename is "Monster"
-		elif self.type is CARD_TYPES.spell:
-			return typename is self.type or typename is "Spell"
-		elif self.type is CARD_TYPES.amulet:
-			return typename is self.type or typename is "Amulet"
+		cardType = self.definition.type
+		return typename is cardType or CARD_TYPE_NAMES.get(typename) is cardType
 
 
 	def registerGameStartEffects(self):
@@ -1286,9 +3582,13 @@ class Card:
 		self.baseFace.registerGameStartEffects()
 
 	def registerAllEffects(self):
-		"""Registers all effects on this card.
+		"""Registers all effects on this card's faces. Effects are only registered once, however many times the card is drawn.
 		"""
-		self.baseFace.registerAllEffects()
+		if self.allEffectsRegistered:
+			return
+		self.allEffectsRegistered = True
+		for face in self.getFaces():
+			face.registerAllEffects()
 
 	def registerEffect(self, triggerType, effect):
 		"""Registers a given effect on this card, with a given trigger.
@@ -1297,7 +3597,99 @@ class Card:
 				triggerType (TRIGGER_TYPES): the type of trigger which provokes this effect
 				effect (Effect): the effect triggered
 		"""
-		self.effects[triggerType].append(effect)
+		self.effects.setdefault(triggerType, []).append(effect)
+		if effect.refillTrigger is not None:
+			self.refills.setdefault(effect.refillTrigger, []).append(effect)
+		effect.hashKey = ("effect", self.cardNum, effect.signature)
+		if self.builtHash is not None:
+			hashEffect(effect)
+		if self.isListening():
+			self.owner.events.subscribe(triggerType, effect)
+		bumpVersion(self)
+
+	def isListening(self):
+		"""Checks whether this card's effects should hear triggers broadcast to its owner. Cards listen while they're in the deck, in hand or on the board.
+
+		Returns:
+				Boolean: whether this card is listening for its owner's triggers
+		"""
+		return self.state in LISTENING_STATES
+
+	def getFaces(self):
+		"""Gets every face this card has.
+
+		Returns:
+				List(CardFace): the faces of this card
+		"""
+		return [self.baseFace]
+
+	def getListeningEffects(self):
+		"""Gets the effects on this card which take part in its owner's triggers: its own, and those on its active face.
+
+		Returns:
+				List((TRIGGER_TYPES, Effect)): pairs of trigger and effect
+		"""
+		listening = []
+		for effects in [self.effects, self.activeFace.effects]:
+			for trigger, triggerEffects in effects.items():
+				for effect in triggerEffects:
+					listening.append((trigger, effect))
+		return listening
+
+	def subscribeEffects(self):
+		"""Subscribes this card's listening effects to its owner's event bus.
+		"""
+		for trigger, effect in self.getListeningEffects():
+			self.owner.events.subscribe(trigger, effect)
+
+	def unsubscribeEffects(self):
+		"""Unsubscribes this card's listening effects from its owner's event bus.
+		"""
+		for trigger, effect in self.getListeningEffects():
+			self.owner.events.unsubscribe(trigger, effect)
+
+	def setState(self, state):
+		"""Changes the state of this card, subscribing or unsubscribing its effects if it starts or stops listening for triggers. Destroyed and banished cards move to their owner's graveyard and banished zones.
+
+		Args:
+				state (CARD_STATES): the new state of the card
+		"""
+		wasListening = self.isListening()
+		self.state = state
+		zone = STATE_ZONES.get(state)
+		if zone is not None:
+			self.context.logic.moveCard(self, zone)
+		if wasListening and not self.isListening():
+			self.unsubscribeEffects()
+		elif not wasListening and self.isListening():
+			self.subscribeEffects()
+
+	def getAllEffects(self):
+		"""Gets every effect registered on this card and its faces, listening or not.
+
+		Returns:
+				List(Effect): the effects
+		"""
+		allEffects = []
+		for effects in [self.effects] + [face.effects for face in self.getFaces()]:
+			for triggerEffects in effects.values():
+				allEffects.extend(triggerEffects)
+		return allEffects
+
+	def clearEffects(self):
+		"""Removes every effect registered on this card and its faces.
+		"""
+		if self.isListening():
+			self.unsubscribeEffects()
+		for effect in self.getAllEffects():
+			if self.builtHash is not None:
+				hashEffect(effect)
+			effect.hashKey = None
+		self.effects = {}
+		self.refills = {}
+		for face in self.getFaces():
+			face.effects = {}
+			face.refills = {}
 
 	def triggerPop(self, triggerType, **kwargs):
 		"""Refills and then triggers all effects on this card which match the given trigger.
@@ -1306,12 +3698,17 @@ class Card:
 				triggerType (TRIGGER_TYPES): the trigger popped
 				**kwargs (Keyword arguments): a list of keyword arguments carrying information for the effects, such as Shadows used in a Necromancy effect.
 		"""
-		if ACTIVE_DEBUG_STATES[DEBUG_STATES.effects]: print("{0} popped.".format(triggerType.name))
-		if ACTIVE_DEBUG_STATES[DEBUG_STATES.kwargs]: print(kwargs)
+		if self.context.trace.triggers: tracer.emit(TRACE_CATEGORIES.triggers, "triggerPopped", self, player=self.owner.name, card=self.name, trigger=triggerType.name)
+		if self.context.trace.kwargs: tracer.emit(TRACE_CATEGORIES.kwargs, "triggerKwargs", self, card=self.name, trigger=triggerType.name, kwargs=dict(kwargs))
+		profiling = profiler.enabled
+		if profiling:
+			start = time.perf_counter()
 		self.activeFace.refillEffects(triggerType)
 		self.refillEffects(triggerType)
-		self.activeFace.resolveEffects(triggerType)
+		self.activeFace.resolveEffects(triggerType, **kwargs)
 		self.resolveEffects(triggerType, **kwargs)
+		if profiling:
+			profiler.recordTrigger("Card.triggerPop", triggerType, time.perf_counter() - start)
 
 	def resolveEffects(self, triggerType, **kwargs):
 		"""Activates all triggers on this card which match the given trigger.
@@ -1320,47 +3717,62 @@ class Card:
 				triggerType (TRIGGER_TYPES): the trigger popped
 				**kwargs (Keyword arguments): a list of keyword arguments carrying information for the effects, such as Shadows used in a Necromancy effect.
 		"""
-		if ACTIVE_DEBUG_STATES[DEBUG_STATES.effects]: print("Resolving " + triggerType.name)
-		if ACTIVE_DEBUG_STATES[DEBUG_STATES.kwargs]: print(kwargs)
-		for effect in self.effects[triggerType]:
+		if self.context.trace.triggers: tracer.emit(TRACE_CATEGORIES.triggers, "triggerResolving", self, player=self.owner.name, card=self.name, trigger=triggerType.name)
+		for effect in self.effects.get(triggerType, ()):
 			effect.resolve(**kwargs)
 
 	def refillEffects(self, triggerType):
-		"""Refills all effects in this card which match the given trigger. Some Effects have a number of times they can go off, but can be refilled for more activations.
+		"""Refills all effects in this card which match the given trigger. Some Effects have a number of times they can go off, but can be refilled for more activations. Only effects waiting on this trigger are visited.
 
 		Args:
 				triggerType (TRIGGER_TYPES): the trigger popped
 		"""
-		for triggerEffects in self.effects:
-			for effect in triggerEffects:
+		if triggerType in self.refills:
+			for effect in self.refills[triggerType]:
 				effect.refill(triggerType)
 
 
 	def onDraw(self):
 		"""Method called when card is drawn, changing its state and registering all its effects.
 		"""
-		self.state = CARD_STATES.held
+		self.setState(CARD_STATES.held)
 		self.registerAllEffects()
 
+	def onPlayEnhance(self, targets=None):
+		"""Triggered when this card is played, Enhanced. Some cards have an Enhance ability which costs more and adds effects to playing them. The Enhance effects are registered and onEnhanced pops, then the card is played as usual.
+
+		Args:
+				targets (List(Player or Card), optional): the targets already chosen for the card. Defaults to asking the owner's agent, if the card needs any.
+		"""
+		for effectDefinition in self.enhance.effects:
+			self.registerEffect(effectDefinition.trigger, Effect(self, self.owner, effectDefinition))
+		self.triggerPop(TRIGGER_TYPES.onEnhanced)
+		self.onPlay(targets)
+
 class SpellCard(Card):
 	"""A SpellCard object extending the Card framework. For cards which are played once, then destroyed.
 
 	Args:
 			Card (Card): base object extended
 	"""
+	__slots__ = ()
 
-	def __init__(self, owner, state, cardObj):
+	def __init__(self, owner, state, definition, cardNum=None):
 		"""Initializes the card, setting its base values.
 
 		Args:
 				owner (Player): the owner of this card
 				state (CARD_STATES): the current state of this card
-				cardObj (Object): the unmodified object of this card
+				definition (CardDefinition): the shared definition of this card
+				cardNum (Integer, optional): the index reserved for this card. Defaults to None, for a new index.
 		"""
-		base = CardFace(self, cardObj["base"])
-		Card.__init__(self, cardObj["Name"], cardObj["Cost"], base, owner, state, cardObj)
-		self.targets = cardObj["Base"].setdefault("Targets", None)
-		self.type = CARD_TYPES.spell
+		base = CardFace(self, definition.base)
+		Card.__init__(self, definition, base, owner, state, cardNum)
+
+	@property
+	def targets(self):
+		"""The target specs of the spell, or None if it has none."""
+		return self.definition.targets
 
 	def __str__(self):
 		"""Stringing method for SpellCards.
@@ -1368,27 +3780,31 @@ class SpellCard(Card):
 		Returns:
 				String: a console-ready output depicting this card
 		"""
-		if logic.canPlayCard(self.owner, self):
+		if self.context.logic.canPlayCard(self.owner, self):
 			return "({0}: {1}.) ".format(self.cost, self.name)
 		return "{0}: {1}.".format(self.cost, self.name)
 
 
-	def onPlay(self):
+	def onPlay(self, targets=None):
 		"""Triggered on play. Gathers targets if applicable, then runs its effects.
+
+		Args:
+				targets (List(Player or Card), optional): the targets already chosen for the card. Defaults to asking the owner's agent, if the card needs any.
 		"""
 		if self.targets:
-			targets = game.chooseTargets(logic.getValidTargets(self.owner, self.targets))
+			if targets is None:
+				targets = self.context.game.chooseTargets(self.owner, self.context.logic.getValidTargets(self.owner, self.targets))
 			self.triggerPop(TRIGGER_TYPES.onPlayed)
 			self.triggerPop(TRIGGER_TYPES.onTargetsChosen, targets=targets)
-			self.state = CARD_STATES.destroyed
 		else :
-			self.state = CARD_STATES.played
+			self.setState(CARD_STATES.played)
 			self.triggerPop(TRIGGER_TYPES.onPlayed)
 		self.onDestroy()
 
 	def onDestroy(self):
 		"""Triggered when this card is destroyed. Gains the owner a shadow.
 		"""
+		self.setState(CARD_STATES.destroyed)
 		self.owner.gainShadows()
 
 	def onFriendlyTurnStart(self):
@@ -1402,35 +3818,53 @@ class MonsterCard(Card):
 	Args:
 			Card (Card): base object extended
 	"""
+	__slots__ = ("evolveFace", "attack", "defense", "attackState", "abilities", "isEvolved")
 
-	def __init__(self, owner, state, cardObj):
+	def __init__(self, owner, state, definition, cardNum=None):
 		"""Initializes the card, setting its base values.
 
 		Args:
-				base (MonsterFace): the basic face on this card, storing effects and abilities
-				evolve (MonsterFace): the evolved face on this card, storing effects and abilities
 				owner (Player): the owner of this card
 				state (CARD_STATES): the current state of this card
-				cardObj (Object): the unmodified object of this card
+				definition (CardDefinition): the shared definition of this card
+				cardNum (Integer, optional): the index reserved for this card. Defaults to None, for a new index.
 		"""
 
-		base = MonsterCard(cardObj["Base"]["Attack"], cardObj["Base"]["Defense"], cardObj["Base"])
-		self.evolveFace = None
-		if "Evolve" in cardObj:
-			self.evolveFace = MonsterCard(cardObj["Evolve"].setdefault("AttackChange", 2), cardObj["Evolve"].setdefault("DefenseChange", 2), cardObj["Evolve"])
-		else :
-			self.evolveFace = MonsterCard(2, 2, {})
-		Card.__init__(self, cardObj["Name"], cardObj["Cost"], base, owner, state, cardObj)
-		self.state = state
+		base = MonsterFace(self, definition.base)
+		self.evolveFace = MonsterFace(self, definition.evolve)
+		Card.__init__(self, definition, base, owner, state, cardNum)
 		self.attack = self.baseFace.attack
 		self.defense = self.baseFace.defense
 		self.attackState = None
-		self.abilities = cardObj.setdefault("Abilities", [])
-		self.accelerate = cardObj.setdefault("Accelerate", None)
-		self.enhance = cardObj.setdefault("Enhance", None)
-		self.type = CARD_TYPES.monster
+		self.abilities = definition.abilities
 		self.isEvolved = False
 
+	def clone(self, memo):
+		"""Clones this monster for a cloned game, along with its stats.
+
+		Args:
+				memo (Dictionary): the clones made so far, keyed by the id of their original
+
+		Returns:
+				MonsterCard: the clone
+		"""
+		card = Card.clone(self, memo)
+		setFields(card,
+			evolveFace=getClone(self.evolveFace, memo),
+			attack=self.attack,
+			defense=self.defense,
+			attackState=self.attackState,
+			abilities=self.abilities,
+			isEvolved=self.isEvolved
+		)
+		return card
+
+	@property
+	def accelerate(self):
+		"""The Accelerate definition of the monster, or None if it has none."""
+		return self.definition.accelerate
+
+
 	def __str__(self):
 		"""Stringing method for MonsterCards.
 
@@ -1439,39 +3873,49 @@ class MonsterCard(Card):
 		"""
 		if self.state == CARD_STATES.held:
 			if self.accelerate and self.owner.energy < self.cost:
-				if logic.canPlayCard(self.owner, self):
-					return "({0}: {1}. {2}/{3}.)".format(self.accelerate["Cost"], self.name, self.attack, self.defense)
-				return "{0}: {1}. {2}/{3}.".format(self.accelerate["Cost"], self.name, self.attack, self.defense)
+				if self.context.logic.canPlayCard(self.owner, self):
+					return "({0}: {1}. {2}/{3}.)".format(self.accelerate.cost, self.name, self.attack, self.defense)
+				return "{0}: {1}. {2}/{3}.".format(self.accelerate.cost, self.name, self.attack, self.defense)
 			else :
-				if logic.canPlayCard(self.owner, self):
+				if self.context.logic.canPlayCard(self.owner, self):
 					return "({0}: {1}. {2}/{3}.)".format(self.cost, self.name, self.attack, self.defense)
 				return "{0}: {1}. {2}/{3}.".format(self.cost, self.name, self.attack, self.defense)
 		else :
-			if logic.canAttackWithCard(self.owner, self):
+			if self.context.logic.canAttackWithCard(self.owner, self):
 				return "({0}: {1}. {2}/{3}. {4}.)".format(self.cost, self.name, self.attack, self.defense, self.attackState)
 			return "{0}: {1}. {2}/{3}. {4}.".format(self.cost, self.name, self.attack, self.defense, self.attackState)
 
 
+	def getAttackState(self):
+		"""Getter function for this monster's attack state.
+
+		Returns:
+				ATTACK_STATES: whether the monster is sick, ready to attack, or has already attacked
+		"""
+		return self.attackState
+
 	def getActiveAbilities(self):
 		"""Gets a list of active abilities on the card.
 
 		Returns:
-				List(List(Effect)): a list of list of effects, indexed by TRIGGER_TYPES.
+				Tuple(String): the abilities of the card and its active face.
 		"""
 		return self.abilities + self.activeFace.abilities
 
 
-	def registerAllEffects(self):
-		"""Registers all effects on this card. This overloads the base method, since we have an evolve face too!
+	def getFaces(self):
+		"""Gets every face this card has: its base and evolved faces.
+
+		Returns:
+				List(CardFace): the faces of this card
 		"""
-		self.baseFace.registerAllEffects()
-		self.evolveFace.registerAllEffects()
+		return [self.baseFace, self.evolveFace]
 
 	def removeEffects(self):
 		"""Removes all effects and abilities on the monster.
 		"""
-		self.effects = [[] for i in TRIGGER_TYPES]
-		self.abilities = []
+		self.clearEffects()
+		self.abilities = ()
 
 
 	def buff(self, buff):
@@ -1489,7 +3933,7 @@ class MonsterCard(Card):
 		Args:
 				amount (Integer): the amount of damage
 		"""
-		if ACTIVE_DEBUG_STATES[DEBUG_STATES.basics]: print("{0} damage dealt to {1}. New health: {2}.".format(amount, self.name, self.defense - amount))
+		if self.context.trace.basics: tracer.emit(TRACE_CATEGORIES.basics, "damageDealt", self, player=self.owner.name, card=self.name, amount=amount, defense=self.defense - amount)
 		self.defense -= amount
 		if self.defense <= 0:
 			self.destroy()
@@ -1498,24 +3942,27 @@ class MonsterCard(Card):
 		"""This monster dies.
 		"""
 		self.triggerPop(TRIGGER_TYPES.onDestroying)
-		owner = logic.getOwner(self.cardNum)
+		owner = self.context.logic.getOwner(self.cardNum)
 		owner.board.removeCard(self)
+		self.setState(CARD_STATES.destroyed)
 		owner.gainShadows()
 		self.triggerPop(TRIGGER_TYPES.onDestroyed)
 		self.triggerPop(TRIGGER_TYPES.onLeavesBoard)
 		self.owner.resolveAll(TRIGGER_TYPES.onFriendlyCardDestroyed)
-		game.getOtherPlayer(self.owner).resolveAll(TRIGGER_TYPES.onEnemyCardDestroyed)
-		if ACTIVE_DEBUG_STATES[DEBUG_STATES.basics]: print("{0} has been destroyed!".format(self.name))
+		self.context.game.getOtherPlayer(self.owner).resolveAll(TRIGGER_TYPES.onEnemyCardDestroyed)
+		if self.context.trace.basics: tracer.emit(TRACE_CATEGORIES.basics, "cardDestroyed", self, player=self.owner.name, card=self.name)
 
 	def banish(self):
 		"""This monster's banished. It doesn't increase the owner's shadows and doesn't trigger on death effects.
 		"""
 		self.triggerPop(TRIGGER_TYPES.onBanishing)
-		owner = logic.getOwner(self.cardNum)
-		owner.board.removeCard(self)
+		owner = self.context.logic.getOwner(self.cardNum)
+		if self in owner.board:
+			owner.board.removeCard(self)
+		self.setState(CARD_STATES.banished)
 		self.triggerPop(TRIGGER_TYPES.onBanished)
 		self.triggerPop(TRIGGER_TYPES.onLeavesBoard)
-		if ACTIVE_DEBUG_STATES[DEBUG_STATES.basics]: print("{0} has been banished!".format(self.name))
+		if self.context.trace.basics: tracer.emit(TRACE_CATEGORIES.basics, "cardBanished", self, player=self.owner.name, card=self.name)
 
 
 	def onFriendlyTurnStart(self):
@@ -1524,44 +3971,59 @@ class MonsterCard(Card):
 		self.triggerPop(TRIGGER_TYPES.onFriendlyTurnStart)
 		self.attackState = ATTACK_STATES.storm
 
-	def onPlay(self):
+	def onPlay(self, targets=None):
 		"""Triggered on play. Manages card states.
+
+		Args:
+				targets (List(Player or Card), optional): the targets already chosen for the card. Unused, as monsters and amulets aren't played on targets.
 		"""
-		self.state = CARD_STATES.played
+		self.setState(CARD_STATES.played)
 		self.attack = self.baseFace.attack
 		self.defense = self.baseFace.defense
 		self.attackState = ATTACK_STATES.sickness
 		self.triggerPop(TRIGGER_TYPES.onPlayed)
 		self.triggerPop(TRIGGER_TYPES.onEntersBoard)
 
-	def onPlayEnhance(self):
-		"""Triggered when this card is played, Enhanced. Some cards have an Enhance ability which costs more but improves their stats and abilities.
+	def onSummon(self):
+		"""Triggered when this card is put onto the board by an effect rather than played. Manages card states, but doesn't count as playing it.
 		"""
-		self.attack = self.enhance.attack
-		self.defense = self.enhance.defense
+		self.setState(CARD_STATES.played)
+		self.attack = self.baseFace.attack
+		self.defense = self.baseFace.defense
+		self.attackState = ATTACK_STATES.sickness
+		self.triggerPop(TRIGGER_TYPES.onSummoned)
+		self.triggerPop(TRIGGER_TYPES.onEntersBoard)
 
-	def onAccelerate(self):
+	def onAccelerate(self, targets=None):
 		"""Triggered when this card is played, Accelerated. Some cards have an Accelerate ability which costs less and makes the Monster be played like a Spell.
+
+		Args:
+				targets (List(Player or Card), optional): the targets already chosen for the card. Defaults to asking the owner's agent, if the card needs any.
 		"""
-		for effect in self.accelerate["Effects"]:
-			self.registerEffect(TRIGGER_TYPES[effect["Trigger"]], Effect(self, self.owner, effect))
-		if "Targets" in self.accelerate:
-			targets = game.chooseTargets(logic.getValidTargets(self.owner, self.accelerate["Targets"]))
+		for effectDefinition in self.accelerate.effects:
+			self.registerEffect(effectDefinition.trigger, Effect(self, self.owner, effectDefinition))
+		if self.accelerate.targets:
+			if targets is None:
+				targets = self.context.game.chooseTargets(self.owner, self.context.logic.getValidTargets(self.owner, self.accelerate.targets))
 			self.triggerPop(TRIGGER_TYPES.onPlayed)
 			self.triggerPop(TRIGGER_TYPES.onTargetsChosen, targets=targets)
 			self.triggerPop(TRIGGER_TYPES.onAccelerated)
-			self.state = CARD_STATES.destroyed
 		else :
-			self.state = CARD_STATES.played
 			self.triggerPop(TRIGGER_TYPES.onAccelerated)
 			self.triggerPop(TRIGGER_TYPES.onPlayed)
+		self.setState(CARD_STATES.destroyed)
 
 	def onEvolve(self):
 		"""Triggered on evolve. Switches face and activates its Evolve abilities. Monsters can be Evolved from a player's resource pool, usually giving them +2/+2, Rush, and special abilities.
 		"""
+		if self.isListening():
+			self.unsubscribeEffects()
 		self.activeFace = self.evolveFace
-		self.buff([self.attack.attack, self.attack.defense])
+		if self.isListening():
+			self.subscribeEffects()
+		self.buff([self.evolveFace.attack, self.evolveFace.defense])
 		self.isEvolved = True
+		self.triggerPop(TRIGGER_TYPES.onEvolved)
 
 class AmuletCard(Card):
 	"""An AmuletCard object extending the Card framework. For cards which have no attack or defense, and sometimes a set lifetime. Some Amulets have a Countdown, which reduces by 1 at the beginning of its owner's turn and sometimes at other times as well. At 0 Countdown the Amulet is destroyed. 
@@ -1569,21 +4031,35 @@ class AmuletCard(Card):
 	Args:
 			Card (Card): base object extended
 	"""
+	__slots__ = ("countdown",)
 
-	def __init__(self, owner, state, cardObj):
+	def __init__(self, owner, state, definition, cardNum=None):
 		"""Initializes the card, setting its base values.
 
 		Args:
-				base (Object): the basic keywords and effects on this card
 				owner (Player): the owner of this card
 				state (CARD_STATES): the current state of this card
-				cardObj (Object): the unmodified object of this card
+				definition (CardDefinition): the shared definition of this card
+				cardNum (Integer, optional): the index reserved for this card. Defaults to None, for a new index.
 		"""
-		base = CardFace(self, cardObj["base"])
-		Card.__init__(self, cardObj["Name"], cardObj["Cost"], base, owner, state, cardObj)
-		self.countdown = cardObj["Base"].setdefault("Countdown", None)
-		self.state = state
-		self.type = CARD_TYPES.amulet
+		base = CardFace(self, definition.base)
+		Card.__init__(self, definition, base, owner, state, cardNum)
+		self.countdown = definition.countdown
+
+	def clone(self, memo):
+		"""Clones this amulet for a cloned game, along with its countdown.
+
+		Args:
+				memo (Dictionary): the clones made so far, keyed by the id of their original
+
+		Returns:
+				AmuletCard: the clone
+		"""
+		card = Card.clone(self, memo)
+		setFields(card,
+			countdown=self.countdown
+		)
+		return card
 
 	def __str__(self):
 		"""Stringing method for MonsterCards.
@@ -1591,7 +4067,7 @@ class AmuletCard(Card):
 		Returns:
 				String: a console-ready output depicting this card
 		"""
-		if self.state != CARD_STATES.played and logic.canPlayCard(self.owner, self):
+		if self.state != CARD_STATES.played and self.context.logic.canPlayCard(self.owner, self):
 			if self.countdown == None:
 				return "({0}: {1}).".format(self.cost, self.name)
 			return "({0}: {1}). Countdown {2}.".format(self.cost, self.name, self.countdown)
@@ -1607,18 +4083,21 @@ class AmuletCard(Card):
 		self.triggerPop(TRIGGER_TYPES.onDestroying)
 		owner = self.owner
 		owner.board.removeCard(self)
+		self.setState(CARD_STATES.destroyed)
 		owner.gainShadows()
 		self.triggerPop(TRIGGER_TYPES.onDestroyed)
-		if ACTIVE_DEBUG_STATES[DEBUG_STATES.basics]: print("{0} has been destroyed!".format(self.name))
+		if self.context.trace.basics: tracer.emit(TRACE_CATEGORIES.basics, "cardDestroyed", self, player=self.owner.name, card=self.name)
 
 	def banish(self):
 		"""This card is banished, not adding to the owner's shadows nor triggering destroy effects.
 		"""
 		self.triggerPop(TRIGGER_TYPES.onBanishing)
 		owner = self.owner
-		owner.board.destroyCard(self)
+		if self in owner.board:
+			owner.board.removeCard(self)
+		self.setState(CARD_STATES.banished)
 		self.triggerPop(TRIGGER_TYPES.onBanished)
-		if ACTIVE_DEBUG_STATES[DEBUG_STATES.basics]: print("{0} has been banished!".format(self.name))
+		if self.context.trace.basics: tracer.emit(TRACE_CATEGORIES.basics, "cardBanished", self, player=self.owner.name, card=self.name)
 
 	def reduceCountdown(self, amount=1):
 		"""Reduces the countdown on the card. If it lowers below 1, the card destroys itself.
@@ -1639,46 +4118,68 @@ class AmuletCard(Card):
 		self.reduceCountdown()
 		self.triggerPop(TRIGGER_TYPES.onFriendlyTurnStart)
 
-	def onPlay(self):
+	def onPlay(self, targets=None):
 		"""Triggered on play. Manages card states.
+
+		Args:
+				targets (List(Player or Card), optional): the targets already chosen for the card. Unused, as monsters and amulets aren't played on targets.
 		"""
-		self.state = CARD_STATES.played
+		self.setState(CARD_STATES.played)
 		self.triggerPop(TRIGGER_TYPES.onPlayed)
 
+	def onSummon(self):
+		"""Triggered when this card is put onto the board by an effect rather than played. Manages card states, but doesn't count as playing it.
+		"""
+		self.setState(CARD_STATES.played)
+		self.triggerPop(TRIGGER_TYPES.onSummoned)
+		self.triggerPop(TRIGGER_TYPES.onEntersBoard)
+
 class CardFace:
 	"""Card faces store effects, allowing us to play nice with effects on cards. Though we only really need it for MonsterCards, it's implemented universally for ease of use.
 	"""
+	__slots__ = ("card", "definition", "effects", "refills")
 
-	def __init__(self, card, jsonObject):
+	def __init__(self, card, definition):
 		"""Initializing function.
 
 		Args:
 				card (Card): this face's card
-				jsonObject (Object): the base object storing all the JSON info for this face
+				definition (FaceDefinition): the shared definition of this face
 		"""
 		self.card = card
-		self.jsonObject = jsonObject
-		self.effects = [[] for i in TRIGGER_TYPES]
-		self.effectList = jsonObject.setDefault("Effects", [])
+		self.definition = definition
+		self.effects = {}
+		self.refills = {}
+
+	def clone(self, memo):
+		"""Clones this face for a cloned game, along with its effects.
+
+		Args:
+				memo (Dictionary): the clones made so far, keyed by the id of their original
+
+		Returns:
+				CardFace: the clone
+		"""
+		face = object.__new__(type(self))
+		memo[id(self)] = face
+		face.card = getClone(self.card, memo)
+		face.definition = self.definition
+		face.effects = cloneEffectStore(self.effects, memo)
+		face.refills = cloneEffectStore(self.refills, memo)
+		return face
 
 
 	def registerGameStartEffects(self):
 		"""Registers effects on this face before it's drawn--only Invocation.
 		"""
-		if len(self.effectList) > 0:
-			for effect in self.effectList:
-				if "Type" in effect and effect["Type"] is "Invocation":
-					self.registerEffect(TRIGGER_TYPES[effect["Trigger"]], Effect(self.card, self.card.owner, effect))
+		for effectDefinition in self.definition.invocationEffects:
+			self.registerEffect(effectDefinition.trigger, Effect(self.card, self.card.owner, effectDefinition))
 
 	def registerAllEffects(self):
-		"""Registers all effects on this face.
+		"""Registers all effects on this face, except Invocation ones, which are registered at the start of the game.
 		"""
-		if len(self.effectList) > 0:
-			for effect in self.effectList:
-				if "Type" in effect and "Type" is "Invocation":
-					break
-				else :
-					self.registerEffect(TRIGGER_TYPES[effect["Trigger"]], Effect(self.card, self.card.owner, effect))
+		for effectDefinition in self.definition.drawnEffects:
+			self.registerEffect(effectDefinition.trigger, Effect(self.card, self.card.owner, effectDefinition))
 
 	def registerEffect(self, triggerType, effect):
 		"""Registers a given effect on this face, with a given trigger.
@@ -1687,7 +4188,15 @@ class CardFace:
 				triggerType (TRIGGER_TYPES): the type of trigger which provokes this effect
 				effect (Effect): the effect triggered
 		"""
-		self.effects[triggerType].append(effect)
+		self.effects.setdefault(triggerType, []).append(effect)
+		if effect.refillTrigger is not None:
+			self.refills.setdefault(effect.refillTrigger, []).append(effect)
+		effect.hashKey = ("effect", self.card.cardNum, effect.signature)
+		if self.card.builtHash is not None:
+			hashEffect(effect)
+		if self.card.activeFace is self and self.card.isListening():
+			self.card.owner.events.subscribe(triggerType, effect)
+		bumpVersion(self.card)
 
 	def triggerPop(self, triggerType, **kwargs):
 		"""Refills and then triggers all effects on this face which match the given trigger.
@@ -1696,19 +4205,19 @@ class CardFace:
 				triggerType (TRIGGER_TYPES): the trigger popped
 				**kwargs (Keyword arguments): a list of keyword arguments carrying information for the effects, such as Shadows used in a Necromancy effect.
 		"""
-		if ACTIVE_DEBUG_STATES[DEBUG_STATES.effects]: print("{0} popped.".format(triggerType.name))
-		if ACTIVE_DEBUG_STATES[DEBUG_STATES.kwargs]: print(kwargs)
+		if self.card.context.trace.triggers: tracer.emit(TRACE_CATEGORIES.triggers, "triggerPopped", self.card, player=self.card.owner.name, card=self.card.name, trigger=triggerType.name)
+		if self.card.context.trace.kwargs: tracer.emit(TRACE_CATEGORIES.kwargs, "triggerKwargs", self.card, card=self.card.name, trigger=triggerType.name, kwargs=dict(kwargs))
 		self.refillEffects(triggerType)
 		self.resolveEffects(triggerType, **kwargs)
 
 	def refillEffects(self, trigger):
-		"""Refills all effects in this card which match the given trigger. Some Effects have a number of times they can go off, but can be refilled for more activations.
+		"""Refills all effects in this card which match the given trigger. Some Effects have a number of times they can go off, but can be refilled for more activations. Only effects waiting on this trigger are visited.
 
 		Args:
 				trigger (TRIGGER_TYPES): the trigger popped
 		"""
-		for effects in self.effects:
-			for effect in effects:
+		if trigger in self.refills:
+			for effect in self.refills[trigger]:
 				effect.refill(trigger)
 	
 	def resolveEffects(self, trigger, **kwargs):
@@ -1718,10 +4227,14 @@ class CardFace:
 				trigger (TRIGGER_TYPES): the trigger popped
 				**kwargs (Keyword arguments): a list of keyword arguments carrying information for the effects, such as Shadows used in a Necromancy effect.
 		"""
-		if ACTIVE_DEBUG_STATES[DEBUG_STATES.effects]: print("Resolving " + trigger.name)
-		if ACTIVE_DEBUG_STATES[DEBUG_STATES.kwargs]: print(kwargs)
-		for effect in self.effects[trigger]:
+		if self.card.context.trace.triggers: tracer.emit(TRACE_CATEGORIES.triggers, "triggerResolving", self.card, player=self.card.owner.name, card=self.card.name, trigger=trigger.name)
+		profiling = profiler.enabled
+		if profiling:
+			start = time.perf_counter()
+		for effect in self.effects.get(trigger, ()):
 			effect.resolve(**kwargs)
+		if profiling:
+			profiler.recordTrigger("CardFace.resolveEffects", trigger, time.perf_counter() - start)
 
 class MonsterFace(CardFace):
 	"""Monster extension to Face object.
@@ -1729,49 +4242,188 @@ class MonsterFace(CardFace):
 	Args:
 			CardFace (Card): base card extended
 	"""
+	__slots__ = ()
+
+	@property
+	def attack(self):
+		"""The attack stat of the face; for an evolved face, the attack gained by evolving."""
+		return self.definition.attack
+
+	@property
+	def defense(self):
+		"""The defense stat of the face; for an evolved face, the defense gained by evolving."""
+		return self.definition.defense
+
+	@property
+	def abilities(self):
+		"""The abilities of the face."""
+		return self.definition.abilities
+
+# EVENT BUS
+class EventBus:
+	"""An event bus belonging to a player, mapping each trigger to the exact effects listening for it: those registered on the player, and those on the player's listening cards and their active faces.
+	"""
 
-	def __init__(self, attack, defense, card, jsonObject):
-		"""Initializing function, setting values to their bases.
+	def __init__(self):
+		"""Initializing function. Creates empty subscriptions.
+		"""
+		self.playerListeners = {}
+		self.cardListeners = {}
+		self.playerRefills = {}
+		self.cardRefills = {}
+
+	def clone(self, memo):
+		"""Clones this event bus for a cloned game, subscribing the clones of its effects in the same order.
 
 		Args:
-				attack (Integer): attack stat
-				defense (Integer): defense stat
-				card (Card): this face's card
-				jsonObject (Object): the base object storing all the JSON info for this face
+				memo (Dictionary): the clones made so far, keyed by the id of their original
+
+		Returns:
+				EventBus: the clone
 		"""
-		CardFace.__init__(self, card, jsonObject)
-		self.attack = attack
-		self.defense = defense
-		self.jsonObject = jsonObject
-		self.abilities = jsonObject.setdefault("Abilities", [])
+		events = EventBus.__new__(EventBus)
+		memo[id(self)] = events
+		for name in ["playerListeners", "cardListeners", "playerRefills", "cardRefills"]:
+			subscriptions = {}
+			for trigger, effects in getattr(self, name).items():
+				clones = [getClone(effect, memo) for effect in effects.values()]
+				subscriptions[trigger] = {id(effect): effect for effect in clones}
+			setattr(events, name, subscriptions)
+		return events
+
+	def subscribe(self, trigger, effect, fromPlayer=False):
+		"""Subscribes an effect to a trigger.
+
+		Args:
+				trigger (TRIGGER_TYPES): the trigger the effect listens for
+				effect (Effect): the effect
+				fromPlayer (Boolean, optional): whether the effect is registered on the player rather than a card. Defaults to False.
+		"""
+		listeners = self.playerListeners if fromPlayer else self.cardListeners
+		listeners.setdefault(trigger, {})[id(effect)] = effect
+		if effect.refillTrigger is not None:
+			refills = self.playerRefills if fromPlayer else self.cardRefills
+			refills.setdefault(effect.refillTrigger, {})[id(effect)] = effect
+
+	def unsubscribe(self, trigger, effect, fromPlayer=False):
+		"""Unsubscribes an effect from a trigger. Does nothing if it wasn't subscribed.
+
+		Args:
+				trigger (TRIGGER_TYPES): the trigger the effect listened for
+				effect (Effect): the effect
+				fromPlayer (Boolean, optional): whether the effect is registered on the player rather than a card. Defaults to False.
+		"""
+		listeners = self.playerListeners if fromPlayer else self.cardListeners
+		if trigger in listeners:
+			listeners[trigger].pop(id(effect), None)
+		if effect.refillTrigger is not None:
+			refills = self.playerRefills if fromPlayer else self.cardRefills
+			if effect.refillTrigger in refills:
+				refills[effect.refillTrigger].pop(id(effect), None)
+
+	def getListeners(self, trigger, fromPlayer=False):
+		"""Gets the effects subscribed to a trigger.
+
+		Args:
+				trigger (TRIGGER_TYPES): the trigger
+				fromPlayer (Boolean, optional): whether to get the player's effects rather than its cards'. Defaults to False.
+
+		Returns:
+				List(Effect): the subscribed effects, in the order they subscribed
+		"""
+		listeners = self.playerListeners if fromPlayer else self.cardListeners
+		if trigger not in listeners:
+			return []
+		return list(listeners[trigger].values())
+
+	def refill(self, trigger, fromPlayer=False):
+		"""Refills every subscribed effect whose refill trigger is the given one. Effects with no refill trigger, or a different one, aren't visited.
+
+		Args:
+				trigger (TRIGGER_TYPES): the trigger being published
+				fromPlayer (Boolean, optional): whether to refill the player's effects rather than its cards'. Defaults to False.
+		"""
+		refills = self.playerRefills if fromPlayer else self.cardRefills
+		if trigger not in refills:
+			return
+		for effect in list(refills[trigger].values()):
+			effect.refill(trigger)
+
+	def publish(self, trigger, fromPlayer=False, **kwargs):
+		"""Resolves every effect subscribed to a trigger. Effects unsubscribed by an earlier effect in the same publish, such as a card destroyed mid-chain, are skipped.
+
+		Args:
+				trigger (TRIGGER_TYPES): the trigger being published
+				fromPlayer (Boolean, optional): whether to resolve the player's effects rather than its cards'. Defaults to False.
+				**kwargs (Keyword arguments): arguments passed on to each effect
+		"""
+		listeners = self.playerListeners if fromPlayer else self.cardListeners
+		if trigger not in listeners:
+			return
+		subscribed = listeners[trigger]
+		for effect in list(subscribed.values()):
+			if id(effect) in subscribed:
+				effect.resolve(**kwargs)
 
 # EFFECT SYSTEM
 class Effect:
 	"""Effect object, game effects triggered by events.
 	"""
+	__slots__ = ("card", "owner", "definition", "amount", "hashKey")
 
-	def __init__(self, card, owner, effectObj):
+	def __init__(self, card, owner, definition):
 		"""Initializing function. Sets values to their bases.
 
 		Args:
 				card (Card): the card this effect is registered from
 				owner (Player): the owner of this effect
-				effectObj (Object): the unmodified object of this effect
+				definition (EffectDefinition): the shared, compiled definition of this effect
 		"""
+		self.hashKey = None
 		self.card = card
 		self.owner = owner
-		self.effectObj = effectObj
+		self.definition = definition
+		self.amount = definition.amount
+
+	def __setattr__(self, name, value):
+		"""Sets a field, bumping the state version of the match and, for the remaining amount of a registered effect which can only go off a number of times, updating its hash.
 
-		self.trigger = effectObj["Trigger"]
-		self.effect = effectObj["Effect"]
-		self.test = effectObj.setdefault("Test", None)
-		self.maxAmount = effectObj.setdefault("Amount", -1)
-		self.amount = effectObj.setdefault("Amount", -1)
-		self.refillTrigger = effectObj.setdefault("Refill", None)
-		self.isUnstackable = effectObj.setdefault("Unstackable", False)
+		Args:
+				name (String): the name of the field
+				value (Any): its value
+		"""
+		owner = getattr(self, "owner", None)
+		context = owner.context if owner is not None else None
+		if context is None or not context.isTracking or name == "owner":
+			object.__setattr__(self, name, value)
+			return
+		if name == "amount" and self.definition.amount >= 0 and self.hashKey is not None:
+			context.stateHash ^= getZobristKey((self.hashKey, "amount", self.amount)) ^ getZobristKey((self.hashKey, "amount", value))
+		object.__setattr__(self, name, value)
+		context.version += 1
+
+	def clone(self, memo):
+		"""Clones this effect for a cloned game, keeping its remaining amount. The definition is shared.
+
+		Args:
+				memo (Dictionary): the clones made so far, keyed by the id of their original
+
+		Returns:
+				Effect: the clone
+		"""
+		effect = Effect.__new__(Effect)
+		memo[id(self)] = effect
+		setFields(effect,
+			card=getClone(self.card, memo),
+			owner=getClone(self.owner, memo),
+			definition=self.definition,
+			amount=self.amount,
+			hashKey=self.hashKey
+		)
+		return effect
 
 	def __eq__(self, other):
-		"""Comparitive method. Tests whether a given Effect is equal to this one. Loops over keys.
+		"""Comparitive method. Tests whether a given Effect is equal to this one: whether both were built from the same effect of the same card in the library.
 
 		Args:
 				other (Effect): the comparing Effect object
@@ -1781,40 +4433,90 @@ class Effect:
 		"""
 		if not isinstance(other, Effect):
 			return False
-		if self.card.name != other.card.name:
-			return False
-		for key in self.effectObj:
-			if key not in other.effectObj:
-				return False
-			if self.effectObj[key] != other.effectObj[key]:
-				return False
-		for key in other.effectObj:
-			if key not in self.effectObj:
-				return False
-		return True
+		return self.definition.signature == other.definition.signature
+
+	def __hash__(self):
+		"""Hashing method, consistent with equality: effects built from the same effect of the same card hash alike.
+
+		Returns:
+				Integer: the hash of the effect's signature.
+		"""
+		return hash(self.definition.signature)
+
+	@property
+	def trigger(self):
+		"""The trigger provoking the effect."""
+		return self.definition.trigger
+
+	@property
+	def effect(self):
+		"""The effect string, or the definition of the effect it registers on its owner."""
+		return self.definition.effect
+
+	@property
+	def test(self):
+		"""The test string deciding whether the effect goes off, or None."""
+		return self.definition.test
+
+	@property
+	def maxAmount(self):
+		"""The number of times the effect can go off before being refilled; -1 for no limit."""
+		return self.definition.amount
+
+	@property
+	def refillTrigger(self):
+		"""The trigger refilling the effect, or None."""
+		return self.definition.refillTrigger
+
+	@property
+	def signature(self):
+		"""The signature of the effect: its card and its index among the card's effects, shared by every Effect built from the same definition."""
+		return self.definition.signature
+
+	@property
+	def isUnstackable(self):
+		"""Whether only one copy of the effect can be registered on a player."""
+		return self.definition.isUnstackable
 
 
 	def resolve(self, **kwargs):
-		"""Triggers the effect, supplying optional kwargs.
+		"""Triggers the effect, supplying optional kwargs. The effect fires unless it's spent or fails its test. An error raised by its test or effect is raised on, unless the match lets effects fizzle, in which case the effect fizzles and the error is recorded in the match's fizzles.
 
 		Args:
 				**kwargs (Keyword arguments): arguments passing necessary values to the effect, such as number of shadows used in a Necromancy effect.
 		"""
-		if ACTIVE_DEBUG_STATES[DEBUG_STATES.effects]: print("Resolving {0}'s effect:".format(self.card.name))
-		if ACTIVE_DEBUG_STATES[DEBUG_STATES.effects]: print(self.effect)
-		if ACTIVE_DEBUG_STATES[DEBUG_STATES.kwargs]: print(kwargs)
-		if self.amount == 0:
-			return
-		if self.test and eval(self.test) == False:
-			return
-
-		if type(self.effect) is str:
-			exec(self.effect)
-		else :
-			self.owner.registerEffect(TRIGGER_TYPES[self.effect["Trigger"]], Effect(self.card, self.owner, self.effect))
-
-		self.amount -= 1
-		if ACTIVE_DEBUG_STATES[DEBUG_STATES.effects]: print("The new amount of this effect on {0} is {1}.".format(self.card.name, self.amount))
+		if self.card.context.trace.effects: tracer.emit(TRACE_CATEGORIES.effects, "effectResolving", self.card, player=self.owner.name, card=self.card.name, trigger=self.trigger.name, effect=self.effect)
+		if self.card.context.trace.kwargs: tracer.emit(TRACE_CATEGORIES.kwargs, "triggerKwargs", self.card, card=self.card.name, trigger=self.trigger.name, kwargs=dict(kwargs))
+		profiling = profiler.enabled
+		if profiling:
+			start = time.perf_counter()
+			amount = self.amount
+		try:
+			if self.amount == 0:
+				return
+			definition = self.definition
+			context = self.owner.context
+			namespace = {"self": self, "kwargs": kwargs, "game": context.game, "logic": context.logic}
+			try:
+				if definition.testCode and eval(definition.testCode, globals(), namespace) == False:
+					return
+
+				if definition.effectCode:
+					exec(definition.effectCode, globals(), namespace)
+				else :
+					self.owner.registerEffect(definition.effect.trigger, Effect(self.card, self.owner, definition.effect))
+			except Exception as error:
+				if not context.fizzleEffects:
+					raise
+				context.fizzles.append((self.card.name, str(self.effect), repr(error)))
+				if self.card.context.trace.errors: tracer.emit(TRACE_CATEGORIES.errors, "effectFizzled", self.card, player=self.owner.name, card=self.card.name, effect=self.effect, error=repr(error))
+				return
+
+			self.amount -= 1
+			if self.card.context.trace.effects: tracer.emit(TRACE_CATEGORIES.effects, "effectAmount", self.card, player=self.owner.name, card=self.card.name, amount=self.amount)
+		finally:
+			if profiling:
+				profiler.recordEffect(self, time.perf_counter() - start, self.amount != amount)
 
 	def refill(self, trigger):
 		"""Refills this effect. Some Effects can only be triggered a number of times, but can be refilled by certain events.
@@ -1822,17 +4524,15 @@ class Effect:
 		Args:
 				trigger (TRIGGER_TYPES): the trigger we're attempting to use to refill this effect.
 		"""
-		if self.refillTrigger == None:
+		if self.refillTrigger is None:
 			return
-		if ACTIVE_DEBUG_STATES[DEBUG_STATES.effects]: print("Attempting to refill {0}'s effect:".format(self.card.name))
-		if ACTIVE_DEBUG_STATES[DEBUG_STATES.effects]: print(self.effect)
-		if ACTIVE_DEBUG_STATES[DEBUG_STATES.effects]: print("Our refill trigger is {0}.".format(self.refillTrigger))
-		if trigger != TRIGGER_TYPES[self.refillTrigger]:
+		if self.card.context.trace.effects: tracer.emit(TRACE_CATEGORIES.effects, "effectRefilling", self.card, player=self.owner.name, card=self.card.name, trigger=trigger.name, refillTrigger=self.refillTrigger.name, effect=self.effect)
+		if trigger != self.refillTrigger:
 			return
 		self.amount += 1
 		if self.amount > self.maxAmount:
 			self.amount = self.maxAmount
-		if ACTIVE_DEBUG_STATES[DEBUG_STATES.effects]: print("Our new amount for this effect on {0} is {1}.".format(self.card.name, self.amount))
+		if self.card.context.trace.effects: tracer.emit(TRACE_CATEGORIES.effects, "effectAmount", self.card, player=self.owner.name, card=self.card.name, amount=self.amount)
 
 player1CardList = [
 	"SkullBeast",
@@ -1877,12 +4577,10 @@ player1CardList = [
 	"Guilt"
 ]
 
-player1 = Player("Jasper", player1CardList)
 player2CardList = player1CardList
-player2 = Player("Devin", player2CardList)
-
-cardbuilder = CardBuilder()
-game = Gameplay([player1, player2])
-logic = Logic()
 
-game.startGame()
\ No newline at end of file
+if __name__ == "__main__":
+	player1 = Player("Jasper", player1CardList)
+	player2 = Player("Devin", player2CardList)
+	game = Gameplay([player1, player2], firstPlayer=0)
+	game.startGame()
\ No newline at end of file
@@ -0,0 +1,263 @@
+"""Monte Carlo matchup simulator.
+
+Plays many headless games between two deck lists across a pool of worker processes and aggregates the results.
+Every game is seeded from the base seed and its own index, so the same seed always gives the same numbers no matter how many workers are used.
+
+Usage:
+		python simulate.py --games 100000 --workers 8 --seed 1 --deck-a shadow.json --deck-b shadow.json
+"""
+import argparse, json, os, random, sys
+from concurrent.futures import ProcessPoolExecutor
+
+import shadowverse
+from shadowverse import Gameplay, Player, RandomAgent
+from mcts import MCTSAgent
+from profiling import profiler
+
+AGENTS = {
+	"random": RandomAgent,
+	"mcts": MCTSAgent
+}
+
+DEFAULT_MAX_TURNS = 100
+
+
+def buildAgent(agentName, rng):
+	"""Builds an agent by name.
+
+	Args:
+			agentName (String): the key of the agent in AGENTS
+			rng (random.Random): the random number generator the agent draws from
+
+	Returns:
+			Agent: the built agent.
+	"""
+	return AGENTS[agentName](rng)
+
+def gameSeeds(seed, numGames):
+	"""Derives the seed of every game from a base seed.
+
+	Args:
+			seed (Integer): the base seed of the run
+			numGames (Integer): the number of games being played
+
+	Returns:
+			List(Integer): one 64-bit seed per game, in game order.
+	"""
+	rng = random.Random(seed)
+	return [rng.getrandbits(64) for i in range(numGames)]
+
+def playGame(deckA, deckB, gameSeed, agentA="random", agentB="random", maxTurns=DEFAULT_MAX_TURNS, fizzleEffects=False):
+	"""Plays a single headless game between two decks.
+
+	Args:
+			deckA (List(String)): the card names of the first deck
+			deckB (List(String)): the card names of the second deck
+			gameSeed (Integer): the seed every random choice of the game is drawn from
+			agentA (String, optional): the agent playing the first deck. Defaults to "random".
+			agentB (String, optional): the agent playing the second deck. Defaults to "random".
+			maxTurns (Integer, optional): the turn after which the game is called a draw. Defaults to DEFAULT_MAX_TURNS.
+			fizzleEffects (Boolean, optional): whether effects raising an error fizzle, rather than the error stopping the run. Defaults to False.
+
+	Returns:
+			Tuple(Integer or None, Integer, Integer, List(Tuple)): the index of the winning deck (None on a draw), the index of the deck that went first, the number of turns played and the card, effect and error of every effect that fizzled.
+	"""
+	playerA = Player("A", deckA, buildAgent(agentA, random.Random(gameSeed ^ 1)))
+	playerB = Player("B", deckB, buildAgent(agentB, random.Random(gameSeed ^ 2)))
+	game = Gameplay([playerA, playerB], headless=True, seed=gameSeed, fizzleEffects=fizzleEffects)
+	game.setupGame()
+	while game.turnNum < maxTurns and game.stepTurn():
+		pass
+
+	winner = None
+	if not game.isPlaying and game.winner is not None:
+		winner = game.players.index(game.winner)
+	return (winner, game.firstPlayer, game.turnNum, game.context.fizzles)
+
+def playGames(deckA, deckB, seeds, agentA, agentB, maxTurns, profile=False, fizzleEffects=False):
+	"""Plays a batch of games inside a worker process.
+
+	Args:
+			deckA (List(String)): the card names of the first deck
+			deckB (List(String)): the card names of the second deck
+			seeds (List(Integer)): the seed of each game in the batch
+			agentA (String): the agent playing the first deck
+			agentB (String): the agent playing the second deck
+			maxTurns (Integer): the turn after which a game is called a draw
+			profile (Boolean, optional): whether to count the triggers and effects resolved in the batch. Defaults to False.
+			fizzleEffects (Boolean, optional): whether effects raising an error fizzle, rather than the error stopping the run. Defaults to False.
+
+	Returns:
+			Tuple(List(Tuple), Dictionary or None): the result of each game, in the order of its seed, and the batch's profiler counts if profiling.
+	"""
+	shadowverse.setDebugStates(False)
+	if profile:
+		profiler.reset()
+		profiler.enable()
+	try:
+		results = [playGame(deckA, deckB, gameSeed, agentA, agentB, maxTurns, fizzleEffects) for gameSeed in seeds]
+	finally:
+		profiler.enable(False)
+	return (results, profiler.toDict() if profile else None)
+
+def aggregate(results):
+	"""Aggregates the results of many games.
+
+	Args:
+			results (List(Tuple)): the result of each game, as returned by playGame
+
+	Returns:
+			Dictionary: win rates, average game length, first-player advantage, per-turn-number stats and the effects that fizzled, counted per card, effect and error.
+	"""
+	numGames = len(results)
+	wins = [0, 0]
+	draws = 0
+	firstPlayerWins = 0
+	totalTurns = 0
+	turns = {}
+	fizzles = {}
+	for winner, firstPlayer, turnNum, gameFizzles in results:
+		totalTurns += turnNum
+		for fizzle in gameFizzles:
+			fizzles[fizzle] = fizzles.get(fizzle, 0) + 1
+		turnStats = turns.setdefault(turnNum, {"games": 0, "winsA": 0, "winsB": 0, "draws": 0, "firstPlayerWins": 0})
+		turnStats["games"] += 1
+		if winner is None:
+			draws += 1
+			turnStats["draws"] += 1
+			continue
+		wins[winner] += 1
+		turnStats["winsA" if winner == 0 else "winsB"] += 1
+		if winner == firstPlayer:
+			firstPlayerWins += 1
+			turnStats["firstPlayerWins"] += 1
+
+	decided = numGames - draws
+	return {
+		"games": numGames,
+		"winsA": wins[0],
+		"winsB": wins[1],
+		"draws": draws,
+		"winRateA": wins[0] / numGames if numGames else 0.0,
+		"winRateB": wins[1] / numGames if numGames else 0.0,
+		"averageTurns": totalTurns / numGames if numGames else 0.0,
+		"firstPlayerWins": firstPlayerWins,
+		"firstPlayerWinRate": firstPlayerWins / decided if decided else 0.0,
+		"turns": {turnNum: turns[turnNum] for turnNum in sorted(turns)},
+		"fizzles": sum(fizzles.values()),
+		"fizzledEffects": [{"card": card, "effect": effect, "error": error, "count": count} for (card, effect, error), count in sorted(fizzles.items(), key=lambda item: item[1], reverse=True)]
+	}
+
+def simulateMatchup(deckA, deckB, numGames, numWorkers=None, seed=0, agentA="random", agentB="random", maxTurns=DEFAULT_MAX_TURNS, batchSize=None, profile=False, fizzleEffects=False):
+	"""Plays a matchup between two decks many times over a pool of worker processes.
+
+	Args:
+			deckA (List(String)): the card names of the first deck
+			deckB (List(String)): the card names of the second deck
+			numGames (Integer): the number of games to play
+			numWorkers (Integer, optional): the number of worker processes. Defaults to every core; 1 plays in this process.
+			seed (Integer, optional): the base seed of the run. Defaults to 0.
+			agentA (String, optional): the agent playing the first deck. Defaults to "random".
+			agentB (String, optional): the agent playing the second deck. Defaults to "random".
+			maxTurns (Integer, optional): the turn after which a game is called a draw. Defaults to DEFAULT_MAX_TURNS.
+			batchSize (Integer, optional): the number of games sent to a worker at once. Defaults to spreading the games over four batches per worker.
+			profile (Boolean, optional): whether to count the triggers and effects resolved. The counts of every worker are merged into the profiler of this process. Defaults to False.
+			fizzleEffects (Boolean, optional): whether effects raising an error fizzle, being counted in the results, rather than the error stopping the run. Defaults to False.
+
+	Returns:
+			Dictionary: the aggregated results, as returned by aggregate.
+	"""
+	numWorkers = numWorkers or os.cpu_count() or 1
+	seeds = gameSeeds(seed, numGames)
+	if profile:
+		profiler.reset()
+	if numWorkers == 1:
+		batchResults = [playGames(deckA, deckB, seeds, agentA, agentB, maxTurns, profile, fizzleEffects)]
+	else :
+		batchSize = batchSize or max(1, -(-numGames // (numWorkers * 4)))
+		batches = [seeds[i:i + batchSize] for i in range(0, numGames, batchSize)]
+		with ProcessPoolExecutor(max_workers=numWorkers) as executor:
+			futures = [executor.submit(playGames, deckA, deckB, batch, agentA, agentB, maxTurns, profile, fizzleEffects) for batch in batches]
+			batchResults = [future.result() for future in futures]
+
+	results = []
+	merged = {"triggers": [], "effects": []}
+	for batch, counts in batchResults:
+		results.extend(batch)
+		if counts is not None:
+			merged["triggers"].extend(counts["triggers"])
+			merged["effects"].extend(counts["effects"])
+	if profile:
+		profiler.reset()
+		profiler.merge(merged)
+
+	stats = aggregate(results)
+	stats["seed"] = seed
+	return stats
+
+def loadDeck(path):
+	"""Loads a deck list from a file: either a JSON list of card names or one card name per line.
+
+	Args:
+			path (String): the path of the deck file. If None, the default deck is used.
+
+	Returns:
+			List(String): the card names of the deck.
+	"""
+	if path is None:
+		return list(shadowverse.player1CardList)
+	with open(path) as f:
+		text = f.read()
+	if text.lstrip().startswith("["):
+		return json.loads(text)
+	return [line.strip() for line in text.splitlines() if line.strip()]
+
+def printStats(stats):
+	"""Prints aggregated results as a short report.
+
+	Args:
+			stats (Dictionary): the aggregated results
+	"""
+	print("Games: " + str(stats["games"]) + " (seed " + str(stats["seed"]) + ")")
+	print("Deck A win rate: {:.2%}".format(stats["winRateA"]))
+	print("Deck B win rate: {:.2%}".format(stats["winRateB"]))
+	print("Draws: " + str(stats["draws"]))
+	print("Average game length: {:.2f} turns".format(stats["averageTurns"]))
+	print("First player win rate: {:.2%}".format(stats["firstPlayerWinRate"]))
+	print("Fizzled effects: " + str(stats["fizzles"]))
+	for fizzle in stats["fizzledEffects"]:
+		print("{:>8}  {}: {}  {}".format(fizzle["count"], fizzle["card"], fizzle["error"], fizzle["effect"][:80]))
+	print("{:>6} {:>8} {:>8} {:>8} {:>8} {:>10}".format("turn", "games", "winsA", "winsB", "draws", "firstWins"))
+	for turnNum, turnStats in stats["turns"].items():
+		print("{:>6} {:>8} {:>8} {:>8} {:>8} {:>10}".format(turnNum, turnStats["games"], turnStats["winsA"], turnStats["winsB"], turnStats["draws"], turnStats["firstPlayerWins"]))
+
+def main(argv=None):
+	parser = argparse.ArgumentParser(description="Simulates a matchup between two decks.")
+	parser.add_argument("--deck-a", help="deck file of the first deck (JSON list or one card per line). Defaults to the built-in deck.")
+	parser.add_argument("--deck-b", help="deck file of the second deck (JSON list or one card per line). Defaults to the built-in deck.")
+	parser.add_argument("--games", type=int, default=1000, help="number of games to play")
+	parser.add_argument("--workers", type=int, default=None, help="number of worker processes. Defaults to every core.")
+	parser.add_argument("--seed", type=int, default=0, help="base seed of the run")
+	parser.add_argument("--agent-a", choices=sorted(AGENTS), default="random", help="agent playing the first deck")
+	parser.add_argument("--agent-b", choices=sorted(AGENTS), default="random", help="agent playing the second deck")
+	parser.add_argument("--max-turns", type=int, default=DEFAULT_MAX_TURNS, help="turn after which a game is called a draw")
+	parser.add_argument("--fizzle", action="store_true", help="let effects raising an error fizzle and count them, rather than stopping the run")
+	parser.add_argument("--json", help="also write the results to this JSON file")
+	parser.add_argument("--profile", action="store_true", help="count the triggers and effects resolved, and print the slowest")
+	parser.add_argument("--profile-json", help="also write the trigger and effect counts to this JSON file")
+	args = parser.parse_args(argv)
+
+	profile = args.profile or args.profile_json is not None
+	stats = simulateMatchup(loadDeck(args.deck_a), loadDeck(args.deck_b), args.games, args.workers, args.seed, args.agent_a, args.agent_b, args.max_turns, profile=profile, fizzleEffects=args.fizzle)
+	printStats(stats)
+	if args.json:
+		with open(args.json, "w") as f:
+			json.dump(stats, f, indent="\t")
+	if args.profile:
+		print()
+		print(profiler.format())
+	if args.profile_json:
+		profiler.save(args.profile_json)
+
+if __name__ == "__main__":
+	sys.exit(main())
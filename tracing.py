@@ -0,0 +1,352 @@
+"""Structured tracing for the game engine.
+
+Engine code reports what happens as events: a category, an event name and a few fields, such as the turn, player, card and trigger. Each category has a flag, and each match checks the flags for its kind: headless matches skip the console, so a category only the console takes is off for them. A disabled category costs an attribute check at the call site, before any field is built:
+
+		if card.context.trace.effects: tracer.emit(TRACE_CATEGORIES.effects, "effectResolving", card, card=card.name, effect=effect.effect)
+
+Events go to sinks: the console, an in-memory ring buffer or a file of JSON lines. Only the console formats events as they happen; the other sinks keep the fields and format them when they're read or written out.
+
+Usage:
+		buffer = RingBufferSink([TRACE_CATEGORIES.triggers, TRACE_CATEGORIES.effects])
+		tracer.addSink(buffer)
+		...
+		for line in buffer.format():
+			print(line)
+"""
+import collections, enum, json
+
+
+class TRACE_CATEGORIES(enum.IntEnum):
+	"""Categories of trace events, each enabled separately.
+	"""
+	basics = 0
+	triggers = 1
+	playability = 2
+	effects = 3
+	targets = 4
+	resources = 5
+	expandedInfo = 6
+	kwargs = 7
+	playerInput = 8
+	errors = 9
+	interactions = 10
+
+"""The message each event is formatted into for people to read. Events missing here are formatted as their name and fields.
+"""
+EVENT_MESSAGES = {
+	"badPlayerCount": "Improper number of players! Must be 2, not {count}.",
+	"gameStarted": "Game started.",
+	"gameOver": "Game's over.",
+	"mulliganing": "Mulliganing:",
+	"handShown": "{hand}",
+	"turnAnnounced": "{player}'s turn.",
+	"actionChosen": "{player} chose to {action}.",
+	"turnStarted": "----------------------------NEW TURN---------------------------------\n{player}'s turn has started.",
+	"turnEnded": "{player}'s turn has ended.",
+	"cardShown": "{card}",
+	"leaderAttacked": "{card} attacks {player} for {damage} damage. {health} health remains.",
+	"playerLost": "{player} has lost!",
+	"cardPlayed": "{player} played {card}.",
+	"cardEnhanced": "{player} played {card} enhanced.",
+	"cardPlayedFromDeck": "{player} played {card} from deck.",
+	"cardAccelerated": "{player} played {card} accelerated.",
+	"monsterEvolved": "{player} evolves {card}!",
+	"cardDrawn": "Drew {card}.",
+	"cardDiscarded": "{card} discarded.",
+	"cardNotInHand": "{card} isn't in the hand!",
+	"boardFull": "{card} can't be played. Too many cards on the field!",
+	"damageDealt": "{amount} damage dealt to {card}. New health: {defense}.",
+	"cardDestroyed": "{card} has been destroyed!",
+	"cardBanished": "{card} has been banished!",
+	"playCheck": "Can we play {card}?",
+	"playRefused": "No: {reason}.",
+	"playAllowed": "Yes!",
+	"attackRefused": "Can't attack with {card}. Attackstate is {attackState}.",
+	"attackAllowed": "{card} can attack!",
+	"targetsQueried": "Getting valid targets for {specs}.",
+	"targetsFound": "We've ended up with {count} valid targets.",
+	"targetTested": "Testing {card}.",
+	"totalEnergyGained": "Gaining {amount} total energy. New amount: {totalEnergy}.",
+	"energyGained": "Gaining {amount} energy. New amount: {energy}.",
+	"shadowsGained": "Gained {amount} shadows.",
+	"deckBuilding": "{cards}",
+	"deckBuilt": "Finished populating deck.",
+	"tutoring": "Tutoring: {criteria}",
+	"tutorCandidates": "{cards}",
+	"tutorFailed": "No cards meeting our criteria.",
+	"necromancyPerformed": "{player} performs Necromancy, spending {shadows} shadows.",
+	"necromancyRefused": "{player} can't perform Necromancy for {shadows} shadows with only {available}.",
+	"cardReanimated": "{player} reanimated {card} at cost {cost}.",
+	"reanimateFailed": "{player} has no destroyed monster to reanimate at cost {cost}.",
+	"effectRegistered": "Registering an effect on {player}: {effect}",
+	"playerTriggerResolving": "Resolving trigger {trigger} on {player}.",
+	"playerSelfResolving": "Self resolving {trigger} on {player}.",
+	"triggerPopped": "{trigger} popped on {card}.",
+	"triggerResolving": "Resolving {trigger} on {card}.",
+	"triggerKwargs": "{kwargs}",
+	"effectResolving": "Resolving {card}'s effect: {effect}",
+	"effectFizzled": "{card}'s effect failed and fizzles: {error}",
+	"effectAmount": "The new amount of this effect on {card} is {amount}.",
+	"effectRefilling": "Attempting to refill {card}'s effect on {trigger}: {effect}. Our refill trigger is {refillTrigger}.",
+	"consoleState": "--------------LOOP RESET---------------\n{enemy}\n{enemyBoard}\n{board}\n{hand}\n{player}",
+	"consoleRefused": "Can't {reason} with that card.",
+	"targetPrompt": "Please choose a target. {remaining} targets remain.",
+	"mulliganPrompt": "Type 1-{count} to redraw those cards.\nWhen you're done, type q.",
+	"mulliganState": "Currently redrawing: {redrawing}"
+}
+
+class TraceEvent:
+	"""A single trace event. Its fields are kept as given and only turned into text when it's formatted.
+	"""
+	__slots__ = ("category", "event", "turn", "fields")
+
+	def __init__(self, category, event, turn, fields):
+		"""Initializing function.
+
+		Args:
+				category (TRACE_CATEGORIES): the category of the event
+				event (String): the name of the event, such as "cardPlayed"
+				turn (Integer): the turn it happened on, or None outside of a game
+				fields (Dictionary): its fields, such as the player and card involved
+		"""
+		self.category = category
+		self.event = event
+		self.turn = turn
+		self.fields = fields
+
+	def format(self):
+		"""Formats the event for people to read, from its message in EVENT_MESSAGES.
+
+		Returns:
+				String: the formatted event.
+		"""
+		message = EVENT_MESSAGES.get(self.event)
+		if message is None:
+			return "{0} {1}".format(self.event, self.fields)
+		return message.format(**self.fields)
+
+	def toDict(self):
+		"""Gets the event as a dictionary, ready to be written as JSON.
+
+		Returns:
+				Dictionary: the category, event, turn and fields of the event.
+		"""
+		return {"category": self.category.name, "event": self.event, "turn": self.turn, "fields": self.fields}
+
+class Sink:
+	"""Base for the places trace events go. Each sink only takes the categories it was given.
+	"""
+	isConsole = False
+
+	def __init__(self, categories=()):
+		"""Initializing function.
+
+		Args:
+				categories (List(TRACE_CATEGORIES), optional): the categories this sink takes. Defaults to none.
+		"""
+		self.categories = set(categories)
+
+	def write(self, event):
+		"""Takes an event.
+
+		Args:
+				event (TraceEvent): the event
+		"""
+		raise NotImplementedError
+
+	def close(self):
+		"""Finishes writing, once the sink is removed from its tracer.
+		"""
+		pass
+
+class ConsoleSink(Sink):
+	"""A sink printing each event to the console as it happens. Events of headless matches are kept off it.
+	"""
+	isConsole = True
+
+	def write(self, event):
+		"""Prints an event.
+
+		Args:
+				event (TraceEvent): the event
+		"""
+		print(event.format())
+
+class RingBufferSink(Sink):
+	"""A sink keeping the last events in memory, dropping the oldest ones once it's full.
+	"""
+
+	def __init__(self, categories=(), size=10000):
+		"""Initializing function.
+
+		Args:
+				categories (List(TRACE_CATEGORIES), optional): the categories this sink takes. Defaults to none.
+				size (Integer, optional): the number of events kept. Defaults to 10000.
+		"""
+		Sink.__init__(self, categories)
+		self.events = collections.deque(maxlen=size)
+
+	def write(self, event):
+		"""Keeps an event.
+
+		Args:
+				event (TraceEvent): the event
+		"""
+		self.events.append(event)
+
+	def getEvents(self):
+		"""Gets the events kept, oldest first.
+
+		Returns:
+				List(TraceEvent): the events.
+		"""
+		return list(self.events)
+
+	def format(self):
+		"""Formats the events kept for people to read, oldest first.
+
+		Returns:
+				List(String): one line per event, prefixed with its turn.
+		"""
+		return ["[{0}] {1}".format(event.turn, event.format()) for event in self.events]
+
+	def clear(self):
+		"""Drops every event kept.
+		"""
+		self.events.clear()
+
+class FileSink(Sink):
+	"""A sink writing events to a file as JSON lines. Events are held and serialized in batches, so a busy simulation isn't slowed by a write per event.
+	"""
+
+	def __init__(self, path, categories=(), batchSize=1000):
+		"""Initializing function. Opens the file, replacing it if it exists.
+
+		Args:
+				path (String): the path of the file
+				categories (List(TRACE_CATEGORIES), optional): the categories this sink takes. Defaults to none.
+				batchSize (Integer, optional): the number of events held before they're written. Defaults to 1000.
+		"""
+		Sink.__init__(self, categories)
+		self.file = open(path, "w")
+		self.batchSize = batchSize
+		self.pending = []
+
+	def write(self, event):
+		"""Holds an event, writing the held events out once there are enough.
+
+		Args:
+				event (TraceEvent): the event
+		"""
+		self.pending.append(event)
+		if len(self.pending) >= self.batchSize:
+			self.flush()
+
+	def flush(self):
+		"""Writes every held event out. Fields which aren't JSON, such as cards' effects, are written as text.
+		"""
+		for event in self.pending:
+			self.file.write(json.dumps(event.toDict(), default=str))
+			self.file.write("\n")
+		self.pending = []
+		self.file.flush()
+
+	def close(self):
+		"""Writes every held event out and closes the file.
+		"""
+		self.flush()
+		self.file.close()
+
+class TraceFlags:
+	"""A flag per trace category, named after it, on while any sink taking a kind of match's events takes that category.
+	"""
+
+class Tracer(TraceFlags):
+	"""Sends trace events to its sinks. Holds a flag per category, named after it, which is on while any sink takes that category, and the flags of headless matches, which leave out the console sinks. Call sites check their match's flag before building an event, so disabled categories cost next to nothing.
+	"""
+
+	def __init__(self):
+		"""Initializes the tracer with no sinks and every category off.
+		"""
+		self.sinks = []
+		self.headlessFlags = TraceFlags()
+		self.refresh()
+
+	def refresh(self):
+		"""Recomputes the flag of every category from the sinks. Called whenever sinks or their categories change. The flags are changed in place, so matches holding them see the change.
+		"""
+		for category in TRACE_CATEGORIES:
+			setattr(self, category.name, any(category in sink.categories for sink in self.sinks))
+			setattr(self.headlessFlags, category.name, any(category in sink.categories and not sink.isConsole for sink in self.sinks))
+
+	def getFlags(self, headless):
+		"""Gets the flags a kind of match checks before building an event.
+
+		Args:
+				headless (Boolean): whether the match is headless
+
+		Returns:
+				TraceFlags: the flags of headless matches, or the tracer itself, whose flags count every sink.
+		"""
+		return self.headlessFlags if headless else self
+
+	def addSink(self, sink):
+		"""Starts sending events to a sink.
+
+		Args:
+				sink (Sink): the sink
+		"""
+		self.sinks.append(sink)
+		self.refresh()
+
+	def removeSink(self, sink):
+		"""Stops sending events to a sink, and closes it.
+
+		Args:
+				sink (Sink): the sink
+		"""
+		self.sinks.remove(sink)
+		sink.close()
+		self.refresh()
+
+	def setCategories(self, sink, enabled, categories=TRACE_CATEGORIES):
+		"""Turns categories on or off for one of the sinks.
+
+		Args:
+				sink (Sink): the sink
+				enabled (Boolean): whether the sink should take the categories
+				categories (List(TRACE_CATEGORIES), optional): the categories to change. Defaults to every category.
+		"""
+		if enabled:
+			sink.categories.update(categories)
+		else :
+			sink.categories.difference_update(categories)
+		self.refresh()
+
+	def emit(self, category, event, source=None, **fields):
+		"""Sends an event to every sink taking its category. Only call this once the category's flag has been checked, on the flags of the event's match. Events of a headless match skip the console sinks.
+
+		Args:
+				category (TRACE_CATEGORIES): the category of the event
+				event (String): the name of the event, such as "cardPlayed"
+				source (Object, optional): the game object the event happened to, such as a Player or a Card, whose match gives the event its turn. Defaults to None.
+				**fields (Keyword arguments): the fields of the event, such as player=player.name
+		"""
+		context = getattr(source, "context", None)
+		headless = context is not None and context.headless
+		sinks = [sink for sink in self.sinks if category in sink.categories and not (headless and sink.isConsole)]
+		if not sinks:
+			return
+		turn = context.game.turnNum if context is not None and hasattr(context.game, "turnNum") else None
+		traceEvent = TraceEvent(category, event, turn, fields)
+		for sink in sinks:
+			sink.write(traceEvent)
+
+"""The console sink, taking the basics, errors and interactions by default, as the engine has always printed them.
+"""
+console = ConsoleSink([TRACE_CATEGORIES.basics, TRACE_CATEGORIES.errors, TRACE_CATEGORIES.interactions])
+
+"""The tracer every match reports to.
+"""
+tracer = Tracer()
+tracer.addSink(console)
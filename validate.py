@@ -0,0 +1,595 @@
+"""Card library validator and static analyzer.
+
+Checks every entry of the card library before a game ever runs it. Each entry is built the way the engine builds it, which checks its fields, compiles its strings and resolves its trigger names to TRIGGER_TYPES. The effect and test strings are then walked as syntax trees, following names such as self.owner, kwargs['targets'][0] or game.getOtherPlayer(...) to the engine objects they stand for, so that names and methods which don't exist, calls with the wrong number of arguments, assignments inside tests, unknown card names and statements which do nothing are found up front rather than mid-game.
+
+It also reports what each card listens to: the triggers of its own effects, those of the effects it registers on its owner, and whether it needs targets.
+
+Usage:
+		python validate.py
+		python validate.py --cards --json report.json
+"""
+import argparse, ast, builtins, inspect, json, os, sys
+
+import shadowverse
+from shadowverse import CARD_STATES, CARD_TYPE_NAMES, CARD_TYPES, PLAYER_TYPE_NAMES, QUERY_KEYS, CardDefinition, CardLibraryError, Effect, Gameplay, Player, Query, RandomAgent
+
+
+"""The card class built for each card type.
+"""
+CARD_CLASSES = {CARD_TYPES.monster: "MonsterCard", CARD_TYPES.spell: "SpellCard", CARD_TYPES.amulet: "AmuletCard"}
+
+"""Any card at all, such as a target whose spec doesn't name a type.
+"""
+ANY_CARD = frozenset(CARD_CLASSES.values())
+
+"""The kinds returned by the methods effects chain calls on. Calls to any other method aren't followed.
+"""
+METHOD_KINDS = {"getOtherPlayer": frozenset(["Player"]), "getOwner": frozenset(["Player"]), "getCard": ANY_CARD}
+
+"""The library fields each part of an entry can have.
+"""
+ENTRY_KEYS = frozenset(["Name", "Type", "Craft", "Trait", "Cost", "BurialRite", "Abilities", "Base", "Evolve", "Accelerate", "Enhance"])
+FACE_KEYS = frozenset(["Attack", "Defense", "AttackChange", "DefenseChange", "Abilities", "Effects", "Targets", "Countdown"])
+ALTERNATE_COST_KEYS = frozenset(["Cost", "Effects", "Targets"])
+EFFECT_KEYS = frozenset(["Trigger", "Effect", "Test", "Amount", "Refill", "Unstackable", "Type"])
+
+"""The methods taking a list of card names to build.
+"""
+CARD_NAME_METHODS = frozenset(["playCardNames", "addCards"])
+
+class Finding:
+	"""A problem found in the library: an error the engine can't run, or a warning about something which runs but likely isn't what was meant.
+	"""
+	__slots__ = ("severity", "path", "message")
+
+	def __init__(self, severity, path, message):
+		"""Initializing function.
+
+		Args:
+				severity (String): "error" or "warning"
+				path (String): where the problem lives in the library, such as "Ghost.Base.Effects[0].Effect"
+				message (String): what's wrong
+		"""
+		self.severity = severity
+		self.path = path
+		self.message = message
+
+	def format(self):
+		"""Formats the finding for people to read.
+
+		Returns:
+				String: the severity, path and message.
+		"""
+		return "{0}: {1}: {2}".format(self.severity, self.path, self.message)
+
+	def toDict(self):
+		"""Gets the finding as a dictionary, ready to be written as JSON.
+
+		Returns:
+				Dictionary: the severity, path and message.
+		"""
+		return {"severity": self.severity, "path": self.path, "message": self.message}
+
+def getSampleObjects():
+	"""Builds a game with every engine object effect strings can reach, and one card of each type, to read their attributes from. Attributes set while initializing only exist on instances, so classes alone aren't enough.
+
+	Returns:
+			Dictionary(String, Object): a sample of each kind, keyed by class name.
+	"""
+	deckList = shadowverse.player1CardList
+	game = Gameplay([Player("A", deckList, RandomAgent()), Player("B", deckList, RandomAgent())], headless=True, seed=0)
+	game.setupGame()
+	player = game.players[0]
+	samples = {"Gameplay": game, "Player": player, "Logic": player.context.logic, "MatchContext": player.context, "EventBus": player.events, "Deck": player.deck, "Hand": player.hand, "Board": player.board, "Graveyard": player.graveyard}
+	for cardName, definition in shadowverse.cardDefinitions.items():
+		kind = CARD_CLASSES[definition.type]
+		if kind not in samples:
+			samples[kind] = player.context.cardbuilder.buildCard(cardName, player, CARD_STATES.held)
+		if "Effect" not in samples and definition.getEffects():
+			samples["Effect"] = Effect(samples[kind], player, definition.getEffects()[0][1])
+	return samples
+
+class EngineModel:
+	"""What effect strings can reach: the attributes of each kind of engine object, and the kinds of those attributes which are themselves engine objects.
+	"""
+
+	def __init__(self, samples):
+		"""Initializing function. Reads the attributes of each sample.
+
+		Args:
+				samples (Dictionary(String, Object)): a sample of each kind, keyed by class name
+		"""
+		self.samples = samples
+		self.attributes = {}
+		self.attributeKinds = {}
+		for kind, sample in samples.items():
+			self.attributes[kind] = frozenset(dir(sample))
+			for name in self.attributes[kind]:
+				if name.startswith("_"):
+					continue
+				try:
+					value = getattr(sample, name)
+				except Exception:
+					continue
+				valueKind = type(value).__name__
+				if valueKind in samples:
+					self.attributeKinds[(kind, name)] = ANY_CARD if valueKind in ANY_CARD else frozenset([valueKind])
+
+	def hasAttribute(self, kind, name):
+		"""Checks whether a kind of object has an attribute.
+
+		Args:
+				kind (String): the kind, such as "Player"
+				name (String): the name of the attribute
+
+		Returns:
+				Boolean: whether it has it.
+		"""
+		return name in self.attributes[kind]
+
+	def getAttributeKinds(self, kinds, name):
+		"""Gets the kinds an attribute can be, over several kinds of object it's read from.
+
+		Args:
+				kinds (Frozenset(String)): the kinds of the object
+				name (String): the name of the attribute
+
+		Returns:
+				Frozenset(String): the kinds of the attribute, or None if it isn't an engine object.
+		"""
+		found = [self.attributeKinds[(kind, name)] for kind in kinds if (kind, name) in self.attributeKinds]
+		return frozenset().union(*found) if found else None
+
+	def checkCall(self, kind, name, numArgs, keywords):
+		"""Checks that a method accepts the arguments it's called with.
+
+		Args:
+				kind (String): the kind of object the method is called on
+				name (String): the name of the method
+				numArgs (Integer): the number of positional arguments
+				keywords (List(String)): the names of the keyword arguments
+
+		Returns:
+				String: why the call fails, or None if it's fine or the attribute isn't a method.
+		"""
+		method = getattr(self.samples[kind], name, None)
+		if not inspect.ismethod(method):
+			return None
+		try:
+			inspect.signature(method).bind(*([None] * numArgs), **{keyword: None for keyword in keywords})
+		except TypeError as error:
+			return str(error)
+		return None
+
+class StringAnalyzer(ast.NodeVisitor):
+	"""Walks the syntax tree of a single effect or test string, following each name to the kinds of engine object it can be and reporting what doesn't exist on them.
+	"""
+
+	def __init__(self, library, path, namespace):
+		"""Initializing function.
+
+		Args:
+				library (LibraryAnalyzer): the analysis of the library the string is in, collecting findings
+				path (String): where the string lives in the library
+				namespace (Dictionary(String, Frozenset(String) or String)): the kinds of the names the string is run with. "kwargs" and "targets" stand for the keyword arguments and the list of targets, and "<target>" for the kinds of a single target.
+		"""
+		self.library = library
+		self.model = library.model
+		self.path = path
+		self.namespace = namespace
+		self.localNames = set()
+
+	def report(self, severity, message):
+		"""Adds a finding about the string.
+
+		Args:
+				severity (String): "error" or "warning"
+				message (String): what's wrong
+		"""
+		self.library.findings.append(Finding(severity, self.path, message))
+
+	def analyze(self, tree):
+		"""Analyzes a parsed string.
+
+		Args:
+				tree (ast.AST): the syntax tree of the string
+		"""
+		for node in ast.walk(tree):
+			if isinstance(node, ast.Name) and not isinstance(node.ctx, ast.Load):
+				self.localNames.add(node.id)
+		self.visit(tree)
+
+	def getKinds(self, node):
+		"""Gets the kinds of engine object an expression can be.
+
+		Args:
+				node (ast.AST): the expression
+
+		Returns:
+				Frozenset(String) or String: the kinds, "kwargs" or "targets", or None if the expression isn't followed.
+		"""
+		if isinstance(node, ast.Name):
+			return self.namespace.get(node.id)
+		if isinstance(node, ast.Attribute):
+			kinds = self.getKinds(node.value)
+			if isinstance(kinds, frozenset):
+				return self.model.getAttributeKinds(kinds, node.attr)
+			return None
+		if isinstance(node, ast.Subscript):
+			container = self.getKinds(node.value)
+			if container == "kwargs" and isinstance(node.slice, ast.Constant) and node.slice.value == "targets":
+				return "targets"
+			if container == "targets":
+				return self.namespace.get("<target>")
+			return None
+		if isinstance(node, ast.Call) and isinstance(node.func, ast.Attribute):
+			return METHOD_KINDS.get(node.func.attr)
+		return None
+
+	def visit_Name(self, node):
+		"""Checks that a name read exists where the string is run.
+
+		Args:
+				node (ast.Name): the name
+		"""
+		if isinstance(node.ctx, ast.Load) and node.id not in self.namespace and node.id not in self.localNames and node.id not in self.library.knownNames:
+			self.report("error", "{0!r} isn't defined.".format(node.id))
+
+	def visit_Attribute(self, node):
+		"""Checks that an attribute exists on every kind of object it's read from or set on.
+
+		Args:
+				node (ast.Attribute): the attribute
+		"""
+		kinds = self.getKinds(node.value)
+		if isinstance(kinds, frozenset):
+			missing = sorted(kind for kind in kinds if not self.model.hasAttribute(kind, node.attr))
+			if len(missing) == len(kinds):
+				self.report("error", "{0} has no attribute {1!r}.".format(" or ".join(missing), node.attr))
+			elif missing:
+				self.report("warning", "{0!r} is missing on {1}, which this can also be.".format(node.attr, " and ".join(missing)))
+		self.generic_visit(node)
+
+	def visit_Subscript(self, node):
+		"""Checks that targets are only read by effects of cards which have them.
+
+		Args:
+				node (ast.Subscript): the subscript
+		"""
+		if self.getKinds(node) == "targets" and self.namespace.get("<target>") is None:
+			self.report("error", "kwargs['targets'] is read, but the card has no targets.")
+		self.generic_visit(node)
+
+	def visit_Call(self, node):
+		"""Checks a method call's arguments, and the card names and criteria given to methods taking them.
+
+		Args:
+				node (ast.Call): the call
+		"""
+		if isinstance(node.func, ast.Attribute):
+			name = node.func.attr
+			kinds = self.getKinds(node.func.value)
+			simple = not any(isinstance(arg, ast.Starred) for arg in node.args) and all(keyword.arg is not None for keyword in node.keywords)
+			if isinstance(kinds, frozenset) and simple:
+				for kind in sorted(kinds):
+					if self.model.hasAttribute(kind, name):
+						error = self.model.checkCall(kind, name, len(node.args), [keyword.arg for keyword in node.keywords])
+						if error is not None:
+							self.report("error", "{0}.{1} can't be called this way: {2}.".format(kind, name, error))
+			if name in CARD_NAME_METHODS and node.args:
+				self.checkCardNames(node.args[0])
+			if name == "getCardsMatching" and node.args:
+				self.checkCriteria(node.args[0])
+			if name == "tutor":
+				for keyword in node.keywords:
+					if keyword.arg is not None and keyword.arg[0].upper() + keyword.arg[1:] not in QUERY_KEYS:
+						self.report("error", "tutor is given an unknown criteria field: {0!r}.".format(keyword.arg))
+		self.generic_visit(node)
+
+	def visit_NamedExpr(self, node):
+		"""Reports assignments inside expressions: a test should only check the game, never change it.
+
+		Args:
+				node (ast.NamedExpr): the assignment
+		"""
+		self.report("error", "assigns {0!r} inside an expression.".format(ast.unparse(node.target)))
+		self.generic_visit(node)
+
+	def visit_Expr(self, node):
+		"""Reports statements which only read a value and so do nothing, such as a bare ability name.
+
+		Args:
+				node (ast.Expr): the statement
+		"""
+		if not isinstance(node.value, (ast.Call, ast.Await, ast.Yield, ast.YieldFrom)):
+			self.report("warning", "{0!r} does nothing.".format(ast.unparse(node.value)))
+		self.generic_visit(node)
+
+	def visit_For(self, node):
+		"""Reports statements in a loop which don't use the loop's variables. A loop written on one line takes every statement after its colon, so a statement meant to run once runs for each item.
+
+		Args:
+				node (ast.For): the loop
+		"""
+		loopNames = set(target.id for target in ast.walk(node.target) if isinstance(target, ast.Name))
+		for statement in node.body:
+			used = set(name.id for name in ast.walk(statement) if isinstance(name, ast.Name))
+			if not used & loopNames:
+				self.report("warning", "{0!r} is in the loop over {1} but doesn't use it, so it runs once per item.".format(ast.unparse(statement), ", ".join(sorted(loopNames))))
+		self.generic_visit(node)
+
+	def checkCardNames(self, node):
+		"""Checks that a literal list of card names only names cards in the library.
+
+		Args:
+				node (ast.AST): the list
+		"""
+		if not isinstance(node, (ast.List, ast.Tuple)):
+			return
+		for element in node.elts:
+			if isinstance(element, ast.Constant) and element.value not in self.library.cardNames:
+				self.report("error", "{0!r} isn't a card in the library.".format(element.value))
+
+	def checkCriteria(self, node):
+		"""Checks that literal criteria compile the way target specs do.
+
+		Args:
+				node (ast.AST): the criteria, a single spec or a list of them
+		"""
+		try:
+			criteria = ast.literal_eval(node)
+		except ValueError:
+			return
+		if not isinstance(criteria, (list, tuple)):
+			criteria = [criteria]
+		try:
+			Query(criteria, "getCardsMatching")
+		except CardLibraryError as error:
+			self.report("error", str(error))
+		except (AttributeError, TypeError):
+			self.report("error", "the criteria given to getCardsMatching aren't specs: {0}.".format(ast.unparse(node)))
+
+def getTargetKinds(targets):
+	"""Gets the kinds of object a list of target specs can pick.
+
+	Args:
+			targets (Tuple(Object)): the target specs, or None
+
+	Returns:
+			Frozenset(String): the kinds, or None if there are no targets.
+	"""
+	if not targets:
+		return None
+	kinds = set()
+	for spec in targets:
+		typeName = spec.get("Type", None)
+		if typeName in PLAYER_TYPE_NAMES:
+			kinds.add("Player")
+		elif typeName in CARD_TYPE_NAMES:
+			kinds.add(CARD_CLASSES[CARD_TYPE_NAMES[typeName]])
+		else :
+			kinds.update(ANY_CARD)
+	return frozenset(kinds)
+
+def checkKeys(obj, allowed, path, findings):
+	"""Reports fields the engine doesn't read, which are usually misspelled.
+
+	Args:
+			obj (Object): a part of a library entry
+			allowed (Frozenset(String)): the fields it can have
+			path (String): where it lives in the library
+			findings (List(Finding)): where problems found are added
+	"""
+	if not isinstance(obj, dict):
+		return
+	for key in sorted(set(obj) - allowed):
+		findings.append(Finding("warning", path, "{0!r} isn't a field the engine reads.".format(key)))
+
+def checkTestAssignment(test, path, findings):
+	"""Reports a test written as an assignment, such as "self.state = CARD_STATES.played". Tests are evaluated as expressions, so it doesn't compile; it was likely meant as a comparison.
+
+	Args:
+			test (String): the test string
+			path (String): where it lives in the library
+			findings (List(Finding)): where problems found are added
+	"""
+	if not isinstance(test, str):
+		return
+	try:
+		ast.parse(test, path, "eval")
+		return
+	except SyntaxError:
+		pass
+	try:
+		statements = ast.parse(test, path, "exec").body
+	except SyntaxError:
+		return
+	if any(isinstance(statement, (ast.Assign, ast.AugAssign, ast.AnnAssign)) for statement in statements):
+		findings.append(Finding("error", path, "assigns inside a test: {0!r}. Tests should only check the game; use == to compare.".format(test)))
+
+def checkEntryFields(cardName, cardObj, findings):
+	"""Reports unknown fields anywhere in a library entry, and tests written as assignments.
+
+	Args:
+			cardName (String): the library key of the entry
+			cardObj (Object): the library entry
+			findings (List(Finding)): where problems found are added
+	"""
+	checkKeys(cardObj, ENTRY_KEYS, cardName, findings)
+	for section in ["Base", "Evolve", "Accelerate", "Enhance"]:
+		sectionObj = cardObj.get(section)
+		if not isinstance(sectionObj, dict):
+			continue
+		checkKeys(sectionObj, FACE_KEYS if section in ["Base", "Evolve"] else ALTERNATE_COST_KEYS, "{0}.{1}".format(cardName, section), findings)
+		for i, target in enumerate(sectionObj.get("Targets", [])):
+			if isinstance(target, dict):
+				checkTestAssignment(target.get("Test"), "{0}.{1}.Targets[{2}].Test".format(cardName, section, i), findings)
+		for i, effect in enumerate(sectionObj.get("Effects", [])):
+			path = "{0}.{1}.Effects[{2}]".format(cardName, section, i)
+			while isinstance(effect, dict):
+				checkKeys(effect, EFFECT_KEYS, path, findings)
+				checkTestAssignment(effect.get("Test"), path + ".Test", findings)
+				effect = effect.get("Effect")
+				path += ".Effect"
+
+class LibraryAnalyzer:
+	"""Analyzes the strings of every card in a library against the engine, collecting what it finds.
+	"""
+
+	def __init__(self, model, cardNames):
+		"""Initializing function.
+
+		Args:
+				model (EngineModel): the engine objects strings can reach
+				cardNames (Set(String)): the names of the cards in the library
+		"""
+		self.model = model
+		self.cardNames = cardNames
+		self.knownNames = set(vars(shadowverse)) | set(vars(builtins))
+		self.findings = []
+
+	def analyzeString(self, source, mode, path, namespace):
+		"""Parses and analyzes a single effect or test string.
+
+		Args:
+				source (String): the string
+				mode (String): "exec" for effects, "eval" for tests
+				path (String): where the string lives in the library
+				namespace (Dictionary): the kinds of the names the string is run with
+		"""
+		StringAnalyzer(self, path, namespace).analyze(ast.parse(source, path, mode))
+
+	def analyzeEffect(self, effect, path, namespace):
+		"""Analyzes an effect's test and effect strings, recursing into effects it registers on its owner.
+
+		Args:
+				effect (EffectDefinition): the effect
+				path (String): where the effect lives in the library
+				namespace (Dictionary): the kinds of the names its strings are run with
+		"""
+		if effect.test is not None:
+			self.analyzeString(effect.test, "eval", path + ".Test", namespace)
+		if effect.effectCode is None:
+			self.analyzeEffect(effect.effect, path + ".Effect", namespace)
+		else :
+			self.analyzeString(effect.effect, "exec", path + ".Effect", namespace)
+
+	def analyzeCard(self, definition):
+		"""Analyzes every string of a card: the tests of its target specs and the strings of its effects. Effects are run with self as the Effect, whose card is this card, and kwargs['targets'] as the targets of the part of the card they're on.
+
+		Args:
+				definition (CardDefinition): the definition of the card
+		"""
+		self.model.attributeKinds[("Effect", "card")] = frozenset([CARD_CLASSES[definition.type]])
+		parts = {"Base": definition.base, "Evolve": definition.evolve, "Accelerate": definition.accelerate, "Enhance": definition.enhance}
+		for section, part in parts.items():
+			if part is None:
+				continue
+			for i, spec in enumerate(part.targets or ()):
+				if spec.get("Test", None) is not None:
+					namespace = {"self": frozenset(["Logic"]), "logic": frozenset(["Logic"]), "game": frozenset(["Gameplay"]), "owner": frozenset(["Player"]), "target": getTargetKinds([spec])}
+					self.analyzeString(spec["Test"], "eval", "{0}.{1}.Targets[{2}].Test".format(definition.key, section, i), namespace)
+			namespace = {"self": frozenset(["Effect"]), "logic": frozenset(["Logic"]), "game": frozenset(["Gameplay"]), "kwargs": "kwargs", "<target>": getTargetKinds(part.targets or definition.targets)}
+			for i, effect in enumerate(part.effects):
+				self.analyzeEffect(effect, "{0}.{1}.Effects[{2}]".format(definition.key, section, i), namespace)
+
+def getCardMetadata(definition):
+	"""Gets what a card listens to, for reports.
+
+	Args:
+			definition (CardDefinition): the definition of the card
+
+	Returns:
+			Dictionary: the card's key, type, the triggers of its own effects, the triggers of the effects it registers on its owner, and whether it needs targets or has Invocation.
+	"""
+	return {
+		"card": definition.key,
+		"type": definition.type.name,
+		"triggers": sorted(trigger.name for trigger in definition.triggers),
+		"registeredTriggers": sorted(trigger.name for trigger in definition.registeredTriggers),
+		"needsTargets": definition.needsTargets,
+		"hasInvocation": definition.hasInvocation
+	}
+
+def validateLibrary(library):
+	"""Validates every entry of a card library.
+
+	Args:
+			library (Object): the card library, keyed by card name
+
+	Returns:
+			Tuple(List(Finding), List(Dictionary)): the problems found, and the metadata of every card which could be built.
+	"""
+	analyzer = LibraryAnalyzer(EngineModel(getSampleObjects()), set(library))
+	findings = analyzer.findings
+	metadata = []
+	for cardName, cardObj in library.items():
+		if not isinstance(cardObj, dict):
+			findings.append(Finding("error", cardName, "should be an object, not {0}.".format(type(cardObj).__name__)))
+			continue
+		checkEntryFields(cardName, cardObj, findings)
+		try:
+			definition = CardDefinition(cardName, cardObj)
+		except CardLibraryError as error:
+			findings.append(Finding("error", cardName, str(error)))
+			continue
+		except (KeyError, TypeError, AttributeError) as error:
+			findings.append(Finding("error", cardName, "is missing or has a malformed field: {0!r}.".format(error)))
+			continue
+		analyzer.analyzeCard(definition)
+		metadata.append(getCardMetadata(definition))
+	return findings, metadata
+
+def formatMetadata(metadata):
+	"""Formats card metadata as a table for people to read.
+
+	Args:
+			metadata (List(Dictionary)): the metadata of each card
+
+	Returns:
+			String: the table.
+	"""
+	lines = ["{:<20} {:<8} {:>8}  {}".format("card", "type", "targets", "triggers")]
+	for entry in metadata:
+		triggers = ", ".join(entry["triggers"] + ["registers " + trigger for trigger in entry["registeredTriggers"]])
+		lines.append("{:<20} {:<8} {:>8}  {}".format(entry["card"], entry["type"], "yes" if entry["needsTargets"] else "no", triggers))
+	return "\n".join(lines)
+
+def main(argv=None):
+	"""Validates the card library from the command line, exiting with 1 if any errors were found.
+
+	Args:
+			argv (List(String), optional): the command line arguments. Defaults to sys.argv.
+	"""
+	parser = argparse.ArgumentParser(description="Validates the card library and reports what each card listens to.")
+	parser.add_argument("--library", default=shadowverse.LIBRARY_PATH, help="the card library to validate")
+	parser.add_argument("--cards", action="store_true", help="print the triggers and targets of every card")
+	parser.add_argument("--json", help="write the findings and card metadata to this JSON file")
+	parser.add_argument("--build", action="store_true", help="rebuild the library cache if no errors were found")
+	args = parser.parse_args(argv)
+
+	with open(args.library, "rb") as f:
+		try:
+			library = json.load(f)
+		except ValueError as error:
+			print("error: {0}: isn't valid JSON: {1}".format(args.library, error))
+			sys.exit(1)
+	findings, metadata = validateLibrary(library)
+	errors = [finding for finding in findings if finding.severity == "error"]
+
+	for finding in findings:
+		print(finding.format())
+	print("{0} cards, {1} errors, {2} warnings.".format(len(library), len(errors), len(findings) - len(errors)))
+	if args.cards:
+		print()
+		print(formatMetadata(metadata))
+	if args.json:
+		with open(args.json, "w") as f:
+			json.dump({"findings": [finding.toDict() for finding in findings], "cards": metadata}, f, indent="\t")
+	if args.build and not errors:
+		shadowverse.buildLibraryCache(args.library, os.path.splitext(args.library)[0] + ".cache")
+	if errors:
+		sys.exit(1)
+
+if __name__ == "__main__":
+	main()